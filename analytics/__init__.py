@@ -0,0 +1,25 @@
+"""
+岗位数据分析核心（不依赖 Streamlit）
+
+overview 对应 app.py 的综合看板，jobs 对应 shixiseng.py 的岗位分析平台。
+两个数据集都提供 load / clean / filter / aggregate，jobs 另提供 recommend：
+
+    from analytics import jobs
+    df = jobs.load()
+    indexes = jobs.build_indexes(df)
+    positions = jobs.filter(df, indexes, cities=['北京'], salary_range=(150, 300))
+    top = jobs.recommend(df.take(positions))
+
+常驻进程用 LiveDataset 持有整表与索引，源文件有新导出时增量刷新：
+
+    dataset = LiveDataset(jobs, jobs.DATA_PATH)
+    df, indexes = dataset.current()
+
+页面脚本只负责控件、缓存和图表，可离线生成报表或在工作进程中复用同一套逻辑。
+"""
+
+from . import jobs, overview
+from .loader import LiveDataset
+from .selection import Indexes, Selection
+
+__all__ = ['jobs', 'overview', 'Indexes', 'LiveDataset', 'Selection']
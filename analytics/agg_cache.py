@@ -0,0 +1,99 @@
+"""
+按筛选状态缓存聚合结果
+
+筛选条件规范化后做哈希得到 state key，同一组条件下的筛选结果、KPI 和各图表
+的聚合数据只计算一次。缓存按 LRU 淘汰并限制总内存，翻页、切换每页行数等
+与筛选无关的交互直接复用已有结果。
+"""
+
+import hashlib
+import json
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+def _canonical(value):
+    """集合语义的多选列表排序，区间等元组保持原顺序"""
+    if isinstance(value, (list, set, frozenset)):
+        return sorted((_canonical(v) for v in value), key=str)
+    if isinstance(value, tuple):
+        return [_canonical(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def state_key(**state):
+    """筛选状态的规范化哈希"""
+    payload = json.dumps(_canonical(state), sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def estimate_size(value):
+    """粗略估算缓存值占用的字节数"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(value, pd.DataFrame) else usage)
+    if isinstance(value, pd.Index):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class AggregationCache:
+    """线程安全的 LRU 缓存，总大小不超过 max_bytes
+
+    缓存值会被多个会话共享，调用方不能原地修改取回的对象。
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_or_compute(self, key, name, compute):
+        """取 (key, name) 对应的缓存值，未命中时调用 compute() 计算并写入"""
+        entry_key = (key, name)
+        with self._lock:
+            if entry_key in self._entries:
+                self._entries.move_to_end(entry_key)
+                self.hits += 1
+                return self._entries[entry_key][0]
+            self.misses += 1
+
+        value = compute()
+        size = estimate_size(value)
+        with self._lock:
+            # 单个结果超过预算时不缓存
+            if size > self.max_bytes:
+                return value
+            if entry_key in self._entries:
+                self.total_bytes -= self._entries.pop(entry_key)[1]
+            self._entries[entry_key] = (value, size)
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
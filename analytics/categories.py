@@ -0,0 +1,60 @@
+"""
+低基数列的分类编码
+
+城市、学历、时长、行业、公司等列转为 pandas Categorical，类别顺序固定
+（学历按 不限→博士，时长/天数按数字大小，其余按字典序）。筛选和计数直接
+作用在整数编码上，不再反复哈希字符串。
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+EDUCATION_ORDER = ['不限', '大专', '本科', '硕士', '博士']
+
+
+def leading_number(value):
+    """取文本中的第一个数字作为排序键，如 "12个月" -> 12；没有数字的排在最后"""
+    match = re.search(r'\d+', str(value))
+    return (0, int(match.group())) if match else (1, str(value))
+
+
+def as_category(series, order=None, key=None):
+    """转为 Categorical：先按 order 给定的顺序，其余取值按 key 排序追加在后"""
+    order = list(order or [])
+    rest = sorted(set(series.dropna().unique()) - set(order), key=key)
+    ordered = bool(order) or key is not None
+    return series.astype(pd.CategoricalDtype(order + rest, ordered=ordered))
+
+
+def encode_categoricals(df, columns):
+    """按 {列名: (order, key)} 把存在的列批量转为 Categorical"""
+    for col, (order, key) in columns.items():
+        if col in df.columns:
+            df[col] = as_category(df[col], order=order, key=key)
+    return df
+
+
+def category_lookup(series, values):
+    """按类别编码查表的布尔数组：lookup[code] 表示该类别是否属于 values"""
+    categories = series.cat.categories
+    # 多留一个位置给缺失值的编码 -1
+    lookup = np.zeros(len(categories) + 1, dtype=bool)
+    codes = categories.get_indexer(list(values))
+    lookup[codes[codes >= 0]] = True
+    return lookup
+
+
+def isin_codes(series, values):
+    """在类别编码上判断取值是否属于 values，返回布尔数组"""
+    return category_lookup(series, values)[series.cat.codes.to_numpy()]
+
+
+def category_counts(series):
+    """按编码计数（bincount），只保留出现过的类别，按次数降序"""
+    codes = series.cat.codes.to_numpy()
+    counts = np.bincount(codes[codes >= 0], minlength=len(series.cat.categories))
+    result = pd.Series(counts, index=pd.Index(series.cat.categories.astype(object), name=series.name),
+                       name='count')
+    return result[result > 0].sort_values(ascending=False, kind='stable')
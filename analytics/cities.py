@@ -0,0 +1,125 @@
+"""
+工作地点 -> 城市
+
+两个数据集共用的城市归一化。内置全国地级行政区（含直辖市、港澳）地名表，
+简称、“X市”与自治州/地区/盟的全称都映射到简称；全部别名编译成一个前缀树
+正则，在原始地点中取最靠左、最长的地名（“北京市-海淀区”、“徐州市,连云港市”
+都能识别）。后面紧跟“区/县”的视为区县名（如“朝阳区”），紧跟“省”的视为省名
+（“吉林省长春市”取长春），都不当作城市。
+地名表中找不到时取第一个分隔符前的部分。
+
+原始地点重复度很高：整列先去重再逐个解析，解析结果另有记忆表跨批次复用，
+每行的开销接近一次字典查找。
+"""
+
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from .skills import _trie_regex
+
+# 省级区划 -> 地级行政区：普通地级市只写简称（另加“X市”别名），
+# 自治州、地区、盟写作 简称=全称
+GAZETTEER = {
+    '直辖市': '北京 上海 天津 重庆',
+    '特别行政区': '香港 澳门',
+    '河北': '石家庄 唐山 秦皇岛 邯郸 邢台 保定 张家口 承德 沧州 廊坊 衡水',
+    '山西': '太原 大同 阳泉 长治 晋城 朔州 晋中 运城 忻州 临汾 吕梁',
+    '内蒙古': '呼和浩特 包头 乌海 赤峰 通辽 鄂尔多斯 呼伦贝尔 巴彦淖尔 乌兰察布 '
+              '兴安=兴安盟 锡林郭勒=锡林郭勒盟 阿拉善=阿拉善盟',
+    '辽宁': '沈阳 大连 鞍山 抚顺 本溪 丹东 锦州 营口 阜新 辽阳 盘锦 铁岭 朝阳 葫芦岛',
+    '吉林': '长春 吉林 四平 辽源 通化 白山 松原 白城 延边=延边朝鲜族自治州',
+    '黑龙江': '哈尔滨 齐齐哈尔 鸡西 鹤岗 双鸭山 大庆 伊春 佳木斯 七台河 牡丹江 黑河 绥化 '
+              '大兴安岭=大兴安岭地区',
+    '江苏': '南京 无锡 徐州 常州 苏州 南通 连云港 淮安 盐城 扬州 镇江 泰州 宿迁',
+    '浙江': '杭州 宁波 温州 嘉兴 湖州 绍兴 金华 衢州 舟山 台州 丽水',
+    '安徽': '合肥 芜湖 蚌埠 淮南 马鞍山 淮北 铜陵 安庆 黄山 滁州 阜阳 宿州 六安 亳州 池州 宣城',
+    '福建': '福州 厦门 莆田 三明 泉州 漳州 南平 龙岩 宁德',
+    '江西': '南昌 景德镇 萍乡 九江 新余 鹰潭 赣州 吉安 宜春 抚州 上饶',
+    '山东': '济南 青岛 淄博 枣庄 东营 烟台 潍坊 济宁 泰安 威海 日照 临沂 德州 聊城 滨州 菏泽',
+    '河南': '郑州 开封 洛阳 平顶山 安阳 鹤壁 新乡 焦作 濮阳 许昌 漯河 三门峡 南阳 商丘 信阳 周口 驻马店',
+    '湖北': '武汉 黄石 十堰 宜昌 襄阳 鄂州 荆门 孝感 荆州 黄冈 咸宁 随州 恩施=恩施土家族苗族自治州',
+    '湖南': '长沙 株洲 湘潭 衡阳 邵阳 岳阳 常德 张家界 益阳 郴州 永州 怀化 娄底 湘西=湘西土家族苗族自治州',
+    '广东': '广州 韶关 深圳 珠海 汕头 佛山 江门 湛江 茂名 肇庆 惠州 梅州 汕尾 河源 阳江 清远 东莞 中山 '
+            '潮州 揭阳 云浮',
+    '广西': '南宁 柳州 桂林 梧州 北海 防城港 钦州 贵港 玉林 百色 贺州 河池 来宾 崇左',
+    '海南': '海口 三亚 三沙 儋州',
+    '四川': '成都 自贡 攀枝花 泸州 德阳 绵阳 广元 遂宁 内江 乐山 南充 眉山 宜宾 广安 达州 雅安 巴中 资阳 '
+            '阿坝=阿坝藏族羌族自治州 甘孜=甘孜藏族自治州 凉山=凉山彝族自治州',
+    '贵州': '贵阳 六盘水 遵义 安顺 毕节 铜仁 黔西南=黔西南布依族苗族自治州 黔东南=黔东南苗族侗族自治州 '
+            '黔南=黔南布依族苗族自治州',
+    '云南': '昆明 曲靖 玉溪 保山 昭通 丽江 普洱 临沧 楚雄=楚雄彝族自治州 红河=红河哈尼族彝族自治州 '
+            '文山=文山壮族苗族自治州 西双版纳=西双版纳傣族自治州 大理=大理白族自治州 '
+            '德宏=德宏傣族景颇族自治州 怒江=怒江傈僳族自治州 迪庆=迪庆藏族自治州',
+    '西藏': '拉萨 日喀则 昌都 林芝 山南 那曲 阿里=阿里地区',
+    '陕西': '西安 铜川 宝鸡 咸阳 渭南 延安 汉中 榆林 安康 商洛',
+    '甘肃': '兰州 嘉峪关 金昌 白银 天水 武威 张掖 平凉 酒泉 庆阳 定西 陇南 '
+            '临夏=临夏回族自治州 甘南=甘南藏族自治州',
+    # 海南藏族自治州与海南省同名，简称写作“海南州”
+    '青海': '西宁 海东 海北=海北藏族自治州 黄南=黄南藏族自治州 海南州=海南藏族自治州 '
+            '果洛=果洛藏族自治州 玉树=玉树藏族自治州 海西=海西蒙古族藏族自治州',
+    '宁夏': '银川 石嘴山 吴忠 固原 中卫',
+    '新疆': '乌鲁木齐 克拉玛依 吐鲁番 哈密 昌吉=昌吉回族自治州 博尔塔拉=博尔塔拉蒙古自治州 '
+            '巴音郭楞=巴音郭楞蒙古自治州 阿克苏=阿克苏地区 克孜勒苏=克孜勒苏柯尔克孜自治州 '
+            '喀什=喀什地区 和田=和田地区 伊犁=伊犁哈萨克自治州 塔城=塔城地区 阿勒泰=阿勒泰地区',
+}
+
+# 地名表中找不到时，取第一个分隔符前的部分
+SEPARATORS = re.compile(r'[-·,，、/;；\s]+')
+
+# 记忆表上限，超过后清空重建
+MEMO_SIZE = 100_000
+
+
+def gazetteer_aliases(gazetteer=GAZETTEER):
+    """别名 -> 城市简称"""
+    aliases = {}
+    for entries in gazetteer.values():
+        for entry in entries.split():
+            short, _, full = entry.partition('=')
+            aliases[full or short + '市'] = short
+            aliases[short] = short
+    return aliases
+
+
+class CityNormalizer:
+    """按地名表把原始工作地点归一为城市简称"""
+
+    def __init__(self, aliases):
+        self.aliases = dict(aliases)
+        self._pattern = re.compile(f'(?:{_trie_regex(self.aliases)})(?![区县省])')
+        self._memo = {}
+
+    def _parse(self, location):
+        location = location.strip()
+        match = self._pattern.search(location)
+        if match:
+            return self.aliases[match.group()]
+        return SEPARATORS.split(location)[0] or location
+
+    def normalize(self, location):
+        """单个工作地点 -> 城市；缺失值返回 None"""
+        if pd.isna(location):
+            return None
+        location = str(location)
+        city = self._memo.get(location)
+        if city is None:
+            if len(self._memo) >= MEMO_SIZE:
+                self._memo.clear()
+            city = self._memo[location] = self._parse(location)
+        return city
+
+    def normalize_series(self, series):
+        """整列归一：只解析去重后的取值，再按编码展开"""
+        codes, uniques = pd.factorize(series)
+        cities = np.array([self.normalize(value) for value in uniques] + [None], dtype=object)
+        # 缺失值的编码为 -1，正好取到末尾的 None
+        return pd.Series(cities[codes], index=series.index, name=series.name)
+
+
+@lru_cache(maxsize=None)
+def default_city_normalizer():
+    """内置地名表的归一器（每个进程构建一次）"""
+    return CityNormalizer(gazetteer_aliases())
@@ -0,0 +1,66 @@
+"""
+筛选条件组合
+
+筛选不再每加一个条件就生成一张子表：各条件先按预计命中行数从少到多排序，
+第一个条件在整表上求值得到命中行的位置，之后的条件只在剩余位置上求值、
+继续收窄，最后返回行位置数组，整个过程不复制任何列。预计命中行数取自
+立方体单元计数（城市、学历、时长、薪资）与倒排表长度（技能、福利），
+估算开销与行数无关；无法估算的条件排在最后。
+"""
+
+import numpy as np
+
+from .categories import category_lookup
+from .tag_index import python_lists
+
+
+def take(values, positions):
+    """positions 为 None 时表示整表"""
+    return values if positions is None else values[positions]
+
+
+class Conditions:
+    """n 为整表行数"""
+
+    def __init__(self, n):
+        self.n = n
+        self._conditions = []
+
+    def add(self, evaluate, estimate=None):
+        """evaluate(positions) 返回这些行是否命中的布尔数组；estimate 为预计命中行数"""
+        estimate = self.n if estimate is None else estimate
+        self._conditions.append((estimate, len(self._conditions), evaluate))
+
+    def isin(self, series, values, estimate=None):
+        """类别列取值属于 values"""
+        lookup, codes = category_lookup(series, values), series.cat.codes.to_numpy()
+        self.add(lambda positions: lookup[take(codes, positions)], estimate)
+
+    def between(self, series, low, high, estimate=None):
+        """数值列在 [low, high] 区间内"""
+        values = series.to_numpy()
+
+        def evaluate(positions):
+            selected = take(values, positions)
+            return (selected >= low) & (selected <= high)
+        self.add(evaluate, estimate)
+
+    def bitmap(self, compute, estimate=None):
+        """整表位图（如倒排索引的 AND / OR 结果），在第一次求值时才计算"""
+        self.add(lambda positions: take(np.asarray(compute(), dtype=bool), positions), estimate)
+
+    def rows(self, series, predicate):
+        """逐行判断的条件（没有索引时的回退），只在剩余的行上调用 predicate"""
+        self.add(lambda positions: python_lists(series if positions is None else series.iloc[positions])
+                 .map(predicate).to_numpy(dtype=bool))
+
+    def positions(self):
+        """依次求值，返回全部条件都命中的行位置"""
+        positions = None
+        for _, _, evaluate in sorted(self._conditions, key=lambda c: c[:2]):
+            hit = evaluate(positions)
+            positions = np.flatnonzero(hit) if positions is None else positions[hit]
+            if len(positions) == 0:
+                break
+        return np.arange(self.n) if positions is None else positions
+
@@ -0,0 +1,187 @@
+"""
+预聚合数据立方体
+
+加载时按 城市 × 学历 × 实习时长 × 薪资 等低基数维度预先统计岗位数，
+筛选条件只涉及这些维度时，KPI、城市 TOP-N、学历分布、薪资直方图和
+统计摘要都直接由立方体单元计算，不再扫描行级数据。薪资维度保留原始
+日薪取值（整数元），因此区间筛选、中位数和分位数都是精确的。
+
+单元计数本身就是可合并的薪资分布（取值 -> 岗位数，合并即相加），直方图
+分箱、箱线图的四分位数与须线都在服务端由它算出，图表只需几百个数，
+与岗位数无关。
+"""
+
+import numpy as np
+import pandas as pd
+
+from .categories import isin_codes
+
+
+class OlapCube:
+    """维度列为 Categorical，度量列为数值（如日薪）"""
+
+    def __init__(self, df, dimensions, measure):
+        self.dimensions = list(dimensions)
+        self.measure = measure
+        self.cells = self._count(df)
+
+    def _count(self, df):
+        frame = df[self.dimensions + [self.measure]]
+        frame = frame[frame[self.measure].notna()]
+        cells = frame.groupby(self.dimensions + [self.measure], observed=True, dropna=False).size()
+        return self._finish(cells, df)
+
+    def _finish(self, cells, df):
+        cells = cells[cells > 0].rename('count').reset_index()
+        for dim in self.dimensions:
+            cells[dim] = cells[dim].astype(df[dim].dtype)
+        return cells
+
+    def update(self, removed, added, df):
+        """按差量原地更新：减去 removed 行、加上 added 行的单元计数
+
+        df 为更新后的整表，维度列按其类别重新编码；只在整表中消失的类别，
+        其单元计数正好相减为零，不会残留。
+        """
+        columns = self.dimensions + [self.measure]
+        removed_cells = self._count(removed)
+        removed_cells['count'] = -removed_cells['count']
+        cells = pd.concat([self.cells, removed_cells, self._count(added)], ignore_index=True)
+        for dim in self.dimensions:
+            cells[dim] = cells[dim].astype(object).astype(df[dim].dtype)
+        counts = cells.groupby(columns, observed=True, dropna=False)['count'].sum()
+        self.cells = self._finish(counts, df)
+
+    def slice(self, filters=None, measure_range=None):
+        """按维度取值（{维度: 取值列表}，None 表示不限）和度量区间切片"""
+        cells = self.cells
+        mask = np.ones(len(cells), dtype=bool)
+        for dim, values in (filters or {}).items():
+            if values is not None:
+                mask &= isin_codes(cells[dim], values)
+        if measure_range is not None:
+            values = cells[self.measure].to_numpy()
+            mask &= (values >= measure_range[0]) & (values <= measure_range[1])
+        return CubeSlice(cells[mask], self.measure)
+
+
+class CubeSlice:
+    """立方体切片上的聚合查询，结果与在对应行上计算一致"""
+
+    def __init__(self, cells, measure):
+        self.cells = cells
+        self.measure = measure
+        self._counts = cells['count'].to_numpy()
+        self._values = cells[measure].to_numpy(dtype=float)
+
+    def __len__(self):
+        return int(self._counts.sum())
+
+    def mean(self):
+        total = self._counts.sum()
+        return float((self._values * self._counts).sum() / total) if total else float('nan')
+
+    def nunique(self, dim):
+        return int(self.cells[dim].nunique())
+
+    def counts(self, dim):
+        """按维度计数，降序"""
+        codes = self.cells[dim].cat.codes.to_numpy()
+        categories = self.cells[dim].cat.categories
+        valid = codes >= 0
+        counts = np.bincount(codes[valid], weights=self._counts[valid], minlength=len(categories))
+        result = pd.Series(counts.astype(int), index=pd.Index(categories.astype(object), name=dim), name='count')
+        return result[result > 0].sort_values(ascending=False, kind='stable')
+
+    def mean_by(self, dim):
+        """按维度求度量均值"""
+        codes = self.cells[dim].cat.codes.to_numpy()
+        categories = self.cells[dim].cat.categories
+        valid = codes >= 0
+        counts = np.bincount(codes[valid], weights=self._counts[valid], minlength=len(categories))
+        sums = np.bincount(codes[valid], weights=(self._values * self._counts)[valid], minlength=len(categories))
+        observed = counts > 0
+        return pd.Series(sums[observed] / counts[observed],
+                         index=pd.Index(categories[observed].astype(object), name=dim), name=self.measure)
+
+    def distribution(self):
+        """度量取值 -> 岗位数，按取值升序"""
+        dist = pd.Series(self._counts, index=self._values).groupby(level=0).sum()
+        return dist.sort_index()
+
+    def quantile(self, q):
+        """与 Series.quantile 相同的线性插值分位数"""
+        dist = self.distribution()
+        return weighted_quantile(dist.index.to_numpy(dtype=float), dist.to_numpy(), q)
+
+    def median(self):
+        return self.quantile(0.5)
+
+    def describe(self):
+        """与 Series.describe 相同的统计摘要"""
+        n = len(self)
+        mean = self.mean()
+        if n > 1:
+            std = float(np.sqrt((self._counts * (self._values - mean) ** 2).sum() / (n - 1)))
+        else:
+            std = float('nan')
+        dist = self.distribution()
+        return pd.Series({
+            'count': float(n), 'mean': mean, 'std': std,
+            'min': float(dist.index.min()) if n else float('nan'),
+            '25%': self.quantile(0.25), '50%': self.quantile(0.5), '75%': self.quantile(0.75),
+            'max': float(dist.index.max()) if n else float('nan'),
+        }, name=self.measure)
+
+    def histogram(self, bins=40):
+        """等宽分箱的直方图：每箱的左右边界与岗位数"""
+        dist = self.distribution()
+        if dist.empty:
+            return pd.DataFrame({'left': [], 'right': [], 'count': []})
+        counts, edges = np.histogram(dist.index.to_numpy(dtype=float), bins=bins, weights=dist.to_numpy())
+        return pd.DataFrame({'left': edges[:-1], 'right': edges[1:], 'count': counts.astype(int)})
+
+    def box_stats(self, dim=None):
+        """箱线图统计：四分位数、1.5 倍四分位距内的须线、均值、标准差与须线外的取值
+
+        dim 为 None 时整体一行（行名为度量列名），否则按该维度的每个取值一行。
+        """
+        if dim is None:
+            groups = {self.measure: np.ones(len(self._values), dtype=bool)}
+        else:
+            codes = self.cells[dim].cat.codes.to_numpy()
+            categories = self.cells[dim].cat.categories
+            groups = {categories[code]: codes == code for code in np.unique(codes[codes >= 0])}
+        rows = {}
+        for name, selected in groups.items():
+            dist = pd.Series(self._counts[selected], index=self._values[selected]).groupby(level=0).sum()
+            if dist.sum() > 0:
+                rows[name] = _box(dist.index.to_numpy(dtype=float), dist.to_numpy())
+        return pd.DataFrame.from_dict(rows, orient='index', columns=BOX_COLUMNS).rename_axis(dim)
+
+
+BOX_COLUMNS = ['count', 'q1', 'median', 'q3', 'lowerfence', 'upperfence', 'mean', 'sd', 'outliers']
+
+
+def weighted_quantile(values, counts, q):
+    """升序取值 values 各出现 counts 次时，与 Series.quantile 相同的线性插值分位数"""
+    n = int(counts.sum())
+    if n == 0:
+        return float('nan')
+    cum = np.cumsum(counts)
+    pos = (n - 1) * q
+    lo, hi = int(np.floor(pos)), int(np.ceil(pos))
+    v_lo = values[np.searchsorted(cum, lo, side='right')]
+    v_hi = values[np.searchsorted(cum, hi, side='right')]
+    return float(v_lo + (v_hi - v_lo) * (pos - lo))
+
+
+def _box(values, counts):
+    n = int(counts.sum())
+    q1, median, q3 = (weighted_quantile(values, counts, q) for q in (0.25, 0.5, 0.75))
+    iqr = q3 - q1
+    inside = (values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)
+    mean = float((values * counts).sum() / n)
+    sd = float(np.sqrt((counts * (values - mean) ** 2).sum() / (n - 1))) if n > 1 else 0.0
+    return [n, q1, median, q3, float(values[inside].min()), float(values[inside].max()), mean, sd,
+            values[~inside].tolist()]
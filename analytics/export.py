@@ -0,0 +1,73 @@
+"""
+按需导出
+
+导出文件只在用户请求时生成：按块取出格式化后的行，逐块写入 CSV、gzip 压缩
+CSV 或 Parquet，不再在每次重跑时把整个筛选结果序列化成字符串。
+"""
+
+import codecs
+import gzip
+import io
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # 未安装 pyarrow 时不提供 Parquet 导出
+    pa = pq = None
+
+# {格式名: (扩展名, MIME 类型)}
+EXPORT_FORMATS = {
+    'CSV': ('.csv', 'text/csv'),
+    'CSV（gzip 压缩）': ('.csv.gz', 'application/gzip'),
+    'Parquet': ('.parquet', 'application/vnd.apache.parquet'),
+}
+
+
+def available_formats():
+    """当前环境可用的导出格式"""
+    return [name for name in EXPORT_FORMATS if name != 'Parquet' or pq is not None]
+
+
+def _write_csv(chunks, sink):
+    # 带 BOM 的 UTF-8，Excel 可直接打开
+    sink.write(codecs.BOM_UTF8)
+    for i, chunk in enumerate(chunks):
+        sink.write(chunk.to_csv(index=False, header=(i == 0)).encode('utf-8'))
+
+
+def _write_parquet(chunks, sink):
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                # 首块中全空的列按字符串列写出，后续分块按首块的 schema 转换
+                schema = pa.schema([pa.field(f.name, pa.string() if pa.types.is_null(f.type) else f.type)
+                                    for f in table.schema])
+                writer = pq.ParquetWriter(sink, schema)
+            writer.write_table(table.cast(schema))
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_export(chunks, fmt, sink):
+    """把 DataFrame 分块依次写入二进制文件对象 sink"""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"不支持的导出格式: {fmt}")
+    if fmt == 'Parquet':
+        if pq is None:
+            raise ImportError("Parquet 导出需要安装 pyarrow")
+        _write_parquet(chunks, sink)
+    elif fmt == 'CSV（gzip 压缩）':
+        with gzip.GzipFile(fileobj=sink, mode='wb') as compressed:
+            _write_csv(chunks, compressed)
+    else:
+        _write_csv(chunks, sink)
+
+
+def export_bytes(chunks, fmt):
+    """生成导出文件内容"""
+    buffer = io.BytesIO()
+    write_export(chunks, fmt, buffer)
+    return buffer.getvalue()
@@ -0,0 +1,136 @@
+"""
+增量导入
+
+每次爬取导出的岗位大多与上次相同。台账（manifest）记录上次导出每一行的
+职位id、原始内容哈希、行标签和状态；新导出按 职位id（重复的职位id 再按出现
+序号区分）与台账比对：职位id 与内容哈希都相同的行沿用已清洗的结果；内容有
+变化的行把旧行记为墓碑（tombstone）并重新清洗；新出现的职位id 只清洗一次；
+已下架的行记为墓碑，行标签不再复用。共享索引可按返回的差量原地更新（各数据集
+的 update_indexes），耗时与变化量成正比。
+"""
+
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+from .categories import encode_categoricals
+from .snapshot import load_snapshot, save_snapshot
+from .tag_index import is_list_dtype
+
+# 台账中的行状态
+LIVE, REJECTED, REMOVED = 0, 1, 2
+
+MANIFEST_COLUMNS = ['label', 'id', 'hash', 'state']
+
+
+class Delta:
+    """一次增量导入的差量：added 为新清洗的行，removed 为被移除（墓碑）的行
+
+    base_key 为差量所基于的上一份清洗结果的快照键，只有内存中的数据正是这一份时
+    才能按差量原地更新索引。
+    """
+
+    def __init__(self, added, removed, unchanged, changed, base_key=None):
+        self.added = added
+        self.removed = removed
+        self.unchanged = unchanged
+        # 内容有变化的职位id 数（旧行记为墓碑，新内容重新清洗）
+        self.changed = changed
+        self.base_key = base_key
+
+    def __repr__(self):
+        return (f"Delta(added={len(self.added)}, removed={len(self.removed)}, "
+                f"unchanged={self.unchanged}, changed={self.changed})")
+
+
+def content_hashes(raw):
+    """原始行的内容哈希，与行号无关"""
+    return pd.util.hash_pandas_object(raw, index=False).to_numpy()
+
+
+def _keys(ids):
+    """重复的职位id 按出现序号区分，返回 (职位id, 序号) 的 MultiIndex"""
+    ids = pd.Series(np.asarray(ids, dtype=str))
+    occurrence = ids.groupby(ids, sort=False).cumcount()
+    return pd.MultiIndex.from_arrays([ids.to_numpy(), occurrence.to_numpy()])
+
+
+def build_manifest(labels, ids, hashes, cleaned_index):
+    """原始行的台账：labels/ids/hashes 为清洗前取出的行标签、职位id 与内容哈希，
+    不在 cleaned_index 中（被清洗剔除）的行记为 REJECTED"""
+    state = np.where(np.isin(labels, cleaned_index.to_numpy()), LIVE, REJECTED)
+    return pd.DataFrame({'label': np.asarray(labels, dtype=np.int64), 'id': np.asarray(ids, dtype=str),
+                         'hash': hashes, 'state': state.astype('int8')})
+
+
+def refresh(stored, manifest, raw, clean, categorical_columns, id_column):
+    """以台账比对新导出 raw，返回 (清洗结果, 新台账, Delta)
+
+    结果中保留行按原顺序在前、新增行在后；新增行的标签接在台账已用过的最大标签之后。
+    """
+    raw = raw.reset_index(drop=True)
+    hashes = content_hashes(raw)
+    current = manifest[manifest['state'] != REMOVED]
+
+    # 按职位id 对齐，内容哈希相同才算未变化
+    matched = _keys(current['id'].to_numpy()).get_indexer(_keys(raw[id_column].astype(str).to_numpy()))
+    same = matched >= 0
+    same[same] = current['hash'].to_numpy()[matched[same]] == hashes[same]
+
+    # 台账中有、新导出中没有或内容已变化的行记为墓碑
+    gone = np.ones(len(current), dtype=bool)
+    gone[matched[same]] = False
+    tombstones = current[gone]
+    removed_labels = tombstones.loc[tombstones['state'] == LIVE, 'label'].to_numpy()
+    manifest = manifest.copy()
+    manifest.loc[tombstones.index, 'state'] = REMOVED
+
+    # 只清洗新增或内容有变化的行（被剔除过的行内容未变时不再重复清洗）
+    fresh = np.flatnonzero(~same)
+    start = int(manifest['label'].max()) + 1 if len(manifest) else 0
+    added_raw = raw.iloc[fresh].set_axis(pd.RangeIndex(start, start + len(fresh)))
+    # 清洗函数可能原地修改传入的数据，职位id 先取出
+    added_ids = added_raw[id_column].astype(str).to_numpy()
+    cleaned = clean(added_raw) if len(added_raw) else stored.iloc[:0]
+    added_manifest = build_manifest(added_raw.index.to_numpy(), added_ids, hashes[fresh], cleaned.index)
+    manifest = pd.concat([manifest, added_manifest], ignore_index=True)
+
+    removed = stored.loc[stored.index.isin(removed_labels)]
+    # 快照中的列表列由 Arrow 存储，新清洗的行先转成同样的类型再拼接
+    cleaned = cleaned.astype({name: stored[name].dtype for name in cleaned.columns
+                              if name in stored.columns and is_list_dtype(stored[name].dtype)})
+    df = pd.concat([stored.loc[~stored.index.isin(removed_labels)], cleaned])
+    # 拼接后类别不一致的分类列统一重新编码
+    df = encode_categoricals(df, categorical_columns)
+
+    changed = int((matched >= 0).sum() - same.sum())
+    delta = Delta(df.loc[cleaned.index], removed, unchanged=int(same.sum()), changed=changed)
+    return df, manifest, delta
+
+
+def manifest_key(file_path, *salts):
+    """台账键：源文件路径 + 清洗版本等附加因子（与文件内容无关，同一路径的新导出共用）"""
+    h = hashlib.sha256(os.path.abspath(file_path).encode())
+    for salt in salts:
+        h.update(b'\0' + str(salt).encode())
+    return f"manifest-{h.hexdigest()[:32]}"
+
+
+def load_state(file_path, *salts):
+    """读取上次导入的清洗结果与台账，任一缺失时返回 (None, None)"""
+    manifest = load_snapshot(manifest_key(file_path, *salts))
+    if manifest is None or 'data_key' not in manifest.attrs:
+        return None, None
+    stored = load_snapshot(manifest.attrs['data_key'])
+    if stored is None:
+        return None, None
+    return stored, manifest
+
+
+def save_state(manifest, data_key, file_path, *salts):
+    """保存台账，并记录对应清洗结果的快照键"""
+    manifest = manifest[MANIFEST_COLUMNS]
+    manifest.attrs = {'data_key': data_key}
+    return save_snapshot(manifest, manifest_key(file_path, *salts))
@@ -0,0 +1,139 @@
+"""
+分块流式导入
+
+超大的爬取导出文件按块读取 CSV，逐块执行清洗函数，把紧凑的分析表写成
+Arrow IPC 文件，职位描述、简历要求等长文本列单独写入文本库。两个文件按
+行号一一对应，文本库以内存映射方式按需读取，不常驻内存。加载时分析表的
+attrs['text_store'] 记录文本库路径，全文检索与关键词筛选通过 text_columns
+从中取回长文本列。
+"""
+
+import os
+import uuid
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:  # 未安装 pyarrow 时不提供流式导入
+    pa = None
+
+STREAMING_AVAILABLE = pa is not None
+
+DEFAULT_CHUNKSIZE = 50_000
+TEXT_COLUMNS = ['职位描述', '简历要求']
+
+
+def text_store_path(table_path):
+    """分析表对应的文本库路径"""
+    root, _ = os.path.splitext(table_path)
+    return f"{root}.text.arrow"
+
+
+def _to_arrow(df):
+    """DataFrame 转 Arrow 表，并统一为各分块都一致的类型"""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    fields = []
+    for field in table.schema:
+        t = field.type
+        # 分类列每块的类别不同，落盘为普通字符串，加载后再统一编码
+        if pa.types.is_dictionary(t):
+            t = t.value_type
+        elif pa.types.is_null(t):
+            t = pa.string()
+        elif pa.types.is_list(t) and pa.types.is_null(t.value_type):
+            t = pa.list_(pa.string())
+        fields.append(pa.field(field.name, t))
+    return table.cast(pa.schema(fields))
+
+
+def ingest_csv(source_path, clean, table_path, chunksize=DEFAULT_CHUNKSIZE,
+               text_columns=TEXT_COLUMNS, encoding='utf-8'):
+    """分块清洗 source_path，写出分析表 table_path 与文本库，返回写入的行数
+
+    clean 接收原始分块、返回清洗后的 DataFrame；文本列在清洗之后才拆出，
+    因此技能提取等依赖描述的步骤照常可用。
+    """
+    text_path = text_store_path(table_path)
+    os.makedirs(os.path.dirname(table_path) or '.', exist_ok=True)
+    suffix = f".{uuid.uuid4().hex}.tmp"
+    sinks, writers, schemas = [], [], []
+    rows = 0
+    try:
+        for chunk in pd.read_csv(source_path, chunksize=chunksize, encoding=encoding):
+            cleaned = clean(chunk)
+            texts = [c for c in text_columns if c in cleaned.columns]
+            tables = [_to_arrow(cleaned.drop(columns=texts)), _to_arrow(cleaned[texts])]
+
+            if not writers:
+                for path, table in zip([table_path, text_path], tables):
+                    sinks.append(pa.OSFile(path + suffix, 'wb'))
+                    writers.append(pa.ipc.new_file(sinks[-1], table.schema))
+                    schemas.append(table.schema)
+            for writer, schema, table in zip(writers, schemas, tables):
+                try:
+                    writer.write_table(table.cast(schema))
+                except (pa.ArrowInvalid, ValueError) as e:
+                    raise ValueError(f"第 {rows} 行之后的分块类型与首块不一致: {e}") from e
+            rows += len(cleaned)
+
+        for writer, sink in zip(writers, sinks):
+            writer.close()
+            sink.close()
+        for path in ([table_path, text_path] if writers else []):
+            os.replace(path + suffix, path)
+    finally:
+        for sink in sinks:
+            if not sink.closed:
+                sink.close()
+        for path in [table_path, text_path]:
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+    return rows
+
+
+class TextStore:
+    """内存映射的长文本库，行号与分析表一致"""
+
+    def __init__(self, path):
+        self._table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+
+    def __len__(self):
+        return self._table.num_rows
+
+    @property
+    def columns(self):
+        return self._table.column_names
+
+    def get(self, column, rows):
+        """按行号取出某个文本列"""
+        return self._table.column(column).take(pa.array(rows, type=pa.int64())).to_pylist()
+
+    def frame(self, columns, index, positions=None):
+        """按行号取出若干文本列，行标签取自分析表的 index；positions 为 None 时整表"""
+        table = self._table.select(list(columns))
+        if positions is not None:
+            table = table.take(pa.array(positions, type=pa.int64()))
+            index = index[positions]
+        return table.to_pandas().set_axis(index)
+
+
+def text_columns(df, columns, positions=None):
+    """取出 df 的文本列（positions 为 None 时整表）
+
+    df 中已有的列直接取用，流式导入时拆出的长文本列从 attrs['text_store'] 记录的
+    文本库读取；有列两处都找不到时返回 None。
+    """
+    columns = list(columns)
+    present = [c for c in columns if c in df.columns]
+    result = df[present] if positions is None else df[present].iloc[positions]
+    missing = [c for c in columns if c not in df.columns]
+    if not missing:
+        return result
+    path = df.attrs.get('text_store')
+    if pa is None or path is None or not os.path.exists(path):
+        return None
+    store = TextStore(path)
+    if len(store) != len(df) or not set(missing) <= set(store.columns):
+        return None
+    return pd.concat([result, store.frame(missing, df.index, positions)], axis=1)[columns]
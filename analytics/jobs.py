@@ -0,0 +1,350 @@
+"""
+实习僧岗位数据集（shixiseng.py）
+
+保留原始学历、时长取值，学历按层级向上兼容筛选，并提供综合推荐。
+"""
+
+import re
+import warnings
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from .categories import EDUCATION_ORDER, category_counts, encode_categoricals, leading_number
+from .cities import default_city_normalizer
+from .conditions import Conditions
+from .cube import OlapCube
+from .loader import load_dataset
+from .pagination import PagedTable
+from .recommend import Recommender
+from .salary import parse_salary_range
+from .selection import build_shared_indexes, counts_frame, update_shared_indexes
+from .skills import load_skill_matcher
+from .tag_index import python_lists
+from .text_index import substring_filter
+from .welfare import WelfareMatcher
+
+# 清洗逻辑变更时递增版本号，使旧快照自动失效
+CLEAN_VERSION = 'shixiseng-v7'
+
+DATA_PATH = "Big_data_development_results.csv"
+
+# 增量导入时识别岗位的列
+ID_COLUMN = '职位id'
+
+# 低基数列的分类编码：{列名: (固定类别顺序, 其余取值的排序键)}
+CATEGORICAL_COLUMNS = {
+    '城市': (None, None),
+    '学历要求': (EDUCATION_ORDER, None),
+    '所处行业': (None, None),
+    '公司名称': (None, None),
+    '每周天数': (None, leading_number),
+    '实习时长': (None, leading_number),
+}
+
+# 预聚合立方体的维度与度量
+CUBE_DIMENSIONS = ['城市', '学历要求', '实习时长']
+MEASURE = 'avg_salary'
+
+# 全文检索的文本列及其权重（标题命中比描述更相关）
+TEXT_FIELDS = {'职位标题': 3, '职位描述': 1}
+
+# 共享标签索引的列：(技能标签列, 福利标签列)
+TAG_COLUMNS = ('matched_skills', 'welfare_tags')
+
+# 详情表可排序的列：{显示名: 列名}
+SORT_COLUMNS = {'日薪': 'avg_salary', '城市': '城市', '学历': '学历要求',
+                '实习时长': '实习时长', '公司': '公司名称', '截止日期': '截止日期'}
+
+# 学历筛选：选中某一学历时，要求不高于它的岗位都符合
+EDUCATION_HIERARCHY = {
+    '不限': ['不限', '大专', '本科', '硕士', '博士'],
+    '大专': ['大专', '本科', '硕士', '博士'],
+    '本科': ['本科', '硕士', '博士'],
+    '硕士': ['硕士', '博士'],
+    '博士': ['博士']
+}
+
+
+def join_tags(x):
+    return ', '.join(x) if isinstance(x, list) and len(x) > 0 else '未标注'
+
+
+# 详情表与导出的列：{列名: 显示名}；列表类型的列只在取出的行上拼接
+TABLE_COLUMNS = {'职位标题': '职位标题', '公司名称': '公司', 'avg_salary': '日薪(元)', '城市': '城市',
+                 '学历要求': '学历', '实习时长': '实习时长', 'matched_skills': '技能要求',
+                 'welfare_tags': '福利', '详情页url': '详情页'}
+TABLE_FORMATTERS = {'matched_skills': join_tags, 'welfare_tags': join_tags}
+
+# 推荐分数的权重：薪资、技能数量、福利数量；match 为个人技能匹配度，只在给出个人技能时计入
+RECOMMEND_WEIGHTS = {'salary': 50, 'skills': 30, 'welfare': 20, 'match': 30}
+RECOMMEND_COLUMNS = ['职位标题', '公司名称', 'avg_salary', '城市', '学历要求', '实习时长',
+                     'matched_skills', 'welfare_tags', '推荐分数', '详情页url']
+
+# 技能关键词：存在 skill_keywords.json 时以配置文件为准
+SKILL_CONFIG_PATH = "skill_keywords.json"
+TECH_SKILLS = ['Java', 'Python', 'SQL', 'Hadoop', 'Spark', 'Flink',
+               'Hive', 'Kafka', 'Scala', 'C++', 'Linux', 'MySQL',
+               'Redis', 'HBase', 'Elasticsearch', 'Docker', 'Kubernetes']
+
+WELFARE_MAPPING = {
+    '转正': '转正机会', '转正机会': '转正机会', '留用机会': '转正机会',
+    '房补': '房补', '住房补贴': '房补', '餐补': '餐补', '饭补': '餐补',
+    '下午茶': '下午茶', '零食': '下午茶', '周末双休': '周末双休',
+    '双休': '周末双休', '五险一金': '五险一金', '五险': '五险一金',
+    '交通补助': '交通补助', '交通补贴': '交通补助', '节日福利': '节日福利',
+    '年终奖': '年终奖', '奖金': '年终奖', '弹性工作': '弹性工作',
+    '团建': '团建活动', '带薪年假': '带薪年假', '定期体检': '定期体检',
+}
+
+
+default_skill_matcher = partial(load_skill_matcher, SKILL_CONFIG_PATH, TECH_SKILLS)
+
+
+def clean_days_per_week(days_str):
+    if pd.isna(days_str):
+        return np.nan
+    numbers = re.findall(r'\d+', str(days_str))
+    if numbers:
+        return f"{numbers[0]}天／周"
+    return days_str
+
+
+def clean_duration(duration_str):
+    if pd.isna(duration_str):
+        return np.nan
+    numbers = re.findall(r'\d+', str(duration_str))
+    if numbers:
+        return f"{numbers[0]}个月"
+    return duration_str
+
+
+def extract_duration_months(duration_str):
+    if pd.isna(duration_str):
+        return np.nan
+    numbers = re.findall(r'\d+', str(duration_str))
+    if numbers:
+        return int(numbers[0])
+    return np.nan
+
+
+def extract_welfare_tags(welfare_str):
+    if pd.isna(welfare_str):
+        return []
+
+    tags = re.split(r'[,，、；;\s]+', str(welfare_str))
+    standardized_tags = []
+    for tag in tags:
+        tag = tag.strip()
+        if tag and len(tag) > 0:
+            mapped_tag = WELFARE_MAPPING.get(tag, tag)
+            if mapped_tag not in standardized_tags:
+                standardized_tags.append(mapped_tag)
+    return standardized_tags
+
+
+def clean(df, skill_matcher=None):
+    """清洗原始数据"""
+    skill_matcher = skill_matcher or default_skill_matcher()
+
+    # 1. 薪资清洗（向量化解析，统一折算为日薪）
+    df['avg_salary'] = np.trunc(parse_salary_range(df['薪资范围'])['avg'])
+
+    # 2. 每周天数、实习时长清洗
+    df['每周天数'] = df['每周天数'].apply(clean_days_per_week)
+    df['实习时长'] = df['实习时长'].apply(clean_duration)
+    df['duration_months'] = df['实习时长'].apply(extract_duration_months)
+
+    # 3. 工作地点清洗
+    df['城市'] = default_city_normalizer().normalize_series(df['工作地点']).fillna('未知')
+
+    # 4. 技能标签化（单次扫描，带词边界与别名）
+    df['matched_skills'] = skill_matcher.extract_series(df['职位描述'])
+
+    # 5. 福利标签化
+    if '福利待遇' in df.columns:
+        df['welfare_tags'] = df['福利待遇'].apply(extract_welfare_tags)
+    else:
+        warnings.warn("数据中没有'福利待遇'列，将创建空的福利标签")
+        df['welfare_tags'] = [[] for _ in range(len(df))]
+
+    df['截止日期'] = pd.to_datetime(df['截止日期'], errors='coerce')
+
+    # 6. 低基数列转为分类类型，筛选与计数直接使用整数编码
+    return encode_categoricals(df, CATEGORICAL_COLUMNS)
+
+
+def load(file_path=DATA_PATH, skill_matcher=None, workers=None, return_delta=False):
+    """加载并清洗数据（优先读取清洗结果快照）；return_delta 时另返回增量导入的差量"""
+    return load_dataset(file_path, clean, skill_matcher or default_skill_matcher(), CLEAN_VERSION,
+                        CATEGORICAL_COLUMNS, ID_COLUMN, workers=workers, return_delta=return_delta)
+
+
+def build_indexes(df):
+    """整表上的共享索引，另含推荐打分的特征矩阵与福利关键词匹配器"""
+    indexes = build_shared_indexes(df, TAG_COLUMNS, CUBE_DIMENSIONS, MEASURE, SORT_COLUMNS.values(), TEXT_FIELDS)
+    return _build_recommender(indexes, df)
+
+
+def update_indexes(indexes, df, delta):
+    """按增量导入的差量原地更新 build_indexes 构建的索引，df 为更新后的整表"""
+    update_shared_indexes(indexes, df, delta, TAG_COLUMNS)
+    return _build_recommender(indexes, df)
+
+
+def _build_recommender(indexes, df):
+    # 特征矩阵由标签索引的行计数直接得到，福利关键词匹配只依赖标签集合，增量更新时重建即可
+    indexes.recommender = Recommender(df, MEASURE, indexes.skills, indexes.welfare)
+    indexes.welfare_matcher = WelfareMatcher(indexes.welfare.tags, WELFARE_MAPPING)
+    return indexes
+
+
+def filter(df, indexes=None, cities=None, education="全部", duration="全部", salary_range=None,
+           skills=None, welfare=None, keywords=None):
+    """按筛选条件返回命中行在整表中的位置；传入 indexes 时技能/福利/关键词条件走索引
+
+    技能为 AND、福利为 OR、关键词各词均需命中（没有可检索的文本时抛出 ValueError）；学历按 EDUCATION_HIERARCHY 向上兼容，时长为最短月数。
+    各条件组合成一个选择向量，按预计命中行数从少到多依次收窄（预计行数取自 indexes），不生成中间子表。
+    """
+    conditions = Conditions(len(df))
+    cube = indexes.cube if indexes is not None else None
+
+    def estimate(filters=None, salary=None):
+        return None if cube is None else len(cube.slice(filters, salary))
+
+    if cities:
+        conditions.isin(df['城市'], cities, estimate({'城市': cities}))
+
+    if education in EDUCATION_HIERARCHY:
+        levels = EDUCATION_HIERARCHY[education]
+        conditions.isin(df['学历要求'], levels, estimate({'学历要求': levels}))
+
+    if duration != "全部":
+        duration_num = int(re.findall(r'\d+', duration)[0])
+        conditions.between(df['duration_months'], duration_num, np.inf)
+
+    if salary_range is not None:
+        conditions.between(df['avg_salary'], salary_range[0], salary_range[1], estimate(salary=salary_range))
+
+    if skills:
+        if indexes is not None:
+            conditions.bitmap(lambda: indexes.skills.all_of(skills),
+                              min(indexes.skills.frequency(tag) for tag in skills))
+        else:
+            conditions.rows(df['matched_skills'], lambda tags: all(skill in tags for skill in skills))
+
+    if welfare:
+        if indexes is not None:
+            conditions.bitmap(lambda: indexes.welfare.any_of(welfare),
+                              sum(indexes.welfare.frequency(tag) for tag in welfare))
+        else:
+            # 并集：只要包含任意一个指定的福利标签即可
+            conditions.rows(df['welfare_tags'],
+                            lambda tags: isinstance(tags, list) and any(w in tags for w in welfare))
+
+    if keywords:
+        if indexes is not None and indexes.text is not None:
+            conditions.bitmap(lambda: indexes.text.match(keywords))
+        else:
+            conditions.add(substring_filter(df, TEXT_FIELDS, keywords))
+
+    return conditions.positions()
+
+
+def slice_view(indexes, selection, cities=None, education="全部", duration="全部", salary_range=None,
+               skills=None, welfare=None, keywords=None):
+    """与 filter 相同条件下的立方体切片"""
+    # 技能/福利/关键词不是立方体维度，此时退回到筛选结果的维度列上重新聚合
+    if skills or welfare or keywords:
+        return OlapCube(selection.columns(*CUBE_DIMENSIONS, MEASURE), CUBE_DIMENSIONS, MEASURE).slice()
+
+    cube = indexes.cube
+    filters = {'城市': cities or None}
+    if education in EDUCATION_HIERARCHY:
+        filters['学历要求'] = EDUCATION_HIERARCHY[education]
+    if duration != "全部":
+        duration_num = int(re.findall(r'\d+', duration)[0])
+        months = {c: re.findall(r'\d+', str(c)) for c in cube.cells['实习时长'].cat.categories}
+        filters['实习时长'] = [c for c, nums in months.items() if nums and int(nums[0]) >= duration_num]
+    return cube.slice(filters, salary_range)
+
+
+def table(df, positions):
+    """按行位置分页的详情表"""
+    return PagedTable(df, positions, TABLE_COLUMNS, TABLE_FORMATTERS)
+
+
+def recommend(rows, top_n=10, weights=RECOMMEND_WEIGHTS, recommender=None, my_skills=None, positions=None):
+    """按薪资、技能数量、福利数量加权打分，返回分数最高的 top_n 个岗位
+
+    传入 recommender 时直接在预先算好的特征矩阵上打分，并可按 my_skills 计入个人技能匹配度；
+    此时可以传入整表 rows 与候选行的位置 positions，只取出入选的 top_n 行。
+    """
+    if recommender is not None:
+        if positions is None:
+            positions = recommender.index.get_indexer(rows.index)
+        top, scores = recommender.top(positions, top_n, weights, my_skills)
+        result = python_lists(rows.loc[recommender.index[top], [c for c in RECOMMEND_COLUMNS if c != '推荐分数']])
+        return result.assign(推荐分数=scores)[RECOMMEND_COLUMNS]
+
+    recommend_df = python_lists(rows.copy())
+    recommend_df['技能数量'] = recommend_df['matched_skills'].apply(len)
+    recommend_df['福利数量'] = recommend_df['welfare_tags'].apply(len)
+
+    # 各项按最大值归一化后乘以权重
+    recommend_df['推荐分数'] = 0.0
+    for column, weight in [('avg_salary', weights['salary']), ('技能数量', weights['skills']),
+                           ('福利数量', weights['welfare'])]:
+        if recommend_df[column].max() > 0:
+            recommend_df['推荐分数'] += recommend_df[column] / recommend_df[column].max() * weight
+
+    return recommend_df.nlargest(top_n, '推荐分数')[RECOMMEND_COLUMNS]
+
+
+def _city_stats(sel):
+    counts = sel.view.counts('城市').head(20)
+    return pd.DataFrame({'城市': counts.index, '岗位数量': counts.to_numpy(),
+                         '平均薪资': sel.view.mean_by('城市').reindex(counts.index).to_numpy()})
+
+
+def _skill_counts(sel):
+    skill_counts = sel.indexes.skills.counts(sel.labels).head(20)
+    return pd.DataFrame({'技能': skill_counts.index, '出现次数': skill_counts.values})
+
+
+def _time_stats(sel):
+    deadlines = sel.column('截止日期').dropna()
+    months = deadlines.dt.to_period('M').astype(str)
+    return months.groupby(months).size().sort_index().rename_axis('月份').reset_index(name='岗位数量')
+
+
+# 各图表的聚合：名称 -> 接收 Selection 的函数
+AGGREGATIONS = {
+    'kpi': lambda sel: {
+        'avg_salary': sel.view.mean(),
+        'median_salary': sel.view.median(),
+        'cities': sel.view.nunique('城市'),
+        'companies': sel.column('公司名称').nunique(),
+        'total_cities': sel.data['城市'].nunique(),
+        'total_companies': sel.data['公司名称'].nunique(),
+    },
+    'salary_histogram': lambda sel: sel.view.histogram(30),
+    'salary_box': lambda sel: sel.view.box_stats(),
+    'city_stats': _city_stats,
+    'skill_counts': _skill_counts,
+    'education_stats': lambda sel: counts_frame(sel.view.counts('学历要求'), ['学历', '数量']),
+    'company_stats': lambda sel: counts_frame(
+        category_counts(sel.column('公司名称')).head(10), ['公司', '岗位数量']),
+    'top_jobs': lambda sel: recommend(sel.data, recommender=sel.indexes.recommender, positions=sel.positions),
+    'time_stats': _time_stats,
+    'industry_stats': lambda sel: counts_frame(
+        category_counts(sel.column('所处行业')).head(15), ['行业', '数量']),
+}
+
+
+def aggregate(name, selection):
+    """计算名为 name 的图表聚合"""
+    if name not in AGGREGATIONS:
+        raise KeyError(f"未知的聚合: {name}")
+    return AGGREGATIONS[name](selection)
@@ -0,0 +1,163 @@
+"""
+数据加载
+
+两个看板共用的加载流程：优先读取清洗结果快照；超大文件分块流式清洗；
+否则整表读取 CSV 后清洗并写入快照。LiveDataset 在常驻进程中持有整表与
+共享索引，源文件有新导出时增量导入，并按差量更新索引。
+"""
+
+import copy
+import os
+import threading
+from functools import partial
+
+import pandas as pd
+
+from .categories import encode_categoricals
+from .incremental import build_manifest, content_hashes, load_state, refresh, save_state
+from .ingest import STREAMING_AVAILABLE, ingest_csv, text_store_path
+from .parallel import clean_parallel, process_pool, resolve_workers
+from .snapshot import load_snapshot, save_snapshot, snapshot_key, snapshot_path
+
+# 依次尝试的文件编码
+ENCODINGS = ['utf-8', 'gbk', 'gb18030', 'utf-8-sig']
+
+# 源文件超过该大小时改为分块流式清洗，长文本列单独写入文本库
+STREAMING_THRESHOLD_BYTES = 256 * 1024 * 1024
+
+
+def read_csv(file_path, encodings=ENCODINGS):
+    """按 encodings 依次尝试读取 CSV"""
+    for encoding in encodings[:-1]:
+        try:
+            return pd.read_csv(file_path, encoding=encoding)
+        except UnicodeDecodeError:
+            continue
+    return pd.read_csv(file_path, encoding=encodings[-1])
+
+
+def rename_columns(raw, expected_columns):
+    """列数与 expected_columns 一致时按位置重命名表头"""
+    if expected_columns is not None and len(raw.columns) == len(expected_columns):
+        raw.columns = expected_columns
+    return raw
+
+
+def load_cleaned(file_path, clean, version, categorical_columns, salt='',
+                 streaming_threshold=STREAMING_THRESHOLD_BYTES, workers=None, id_column=None,
+                 return_delta=False, expected_columns=None):
+    """读取并清洗 file_path，返回的 DataFrame 在 attrs['data_key'] 中记录快照键
+
+    流式导入时长文本列不在返回的 DataFrame 中，attrs['text_store'] 记录其文本库路径。
+
+    version 与 salt（如技能配置摘要）参与快照键，清洗逻辑或配置变化时旧快照自动失效。
+    workers > 1 时在进程池中并行清洗（clean 需可被 pickle），结果与单进程一致。
+    给出 id_column 时记录增量台账：同一路径的新导出只清洗新增或变化的行
+    （流式导入的超大文件不记录台账）。return_delta 时返回 (DataFrame, Delta)，
+    没有发生增量导入时 Delta 为 None。
+    expected_columns 为按位置重命名表头的列名，在取 id_column 与内容哈希之前应用；
+    重命名后仍没有 id_column 时整表清洗，不记录台账。
+    """
+    key = snapshot_key(file_path, version, salt)
+    df = load_snapshot(key)
+    delta = None
+    if df is not None:
+        return (_with_attrs(df, key), delta) if return_delta else _with_attrs(df, key)
+
+    workers = resolve_workers(workers)
+    with process_pool(workers) as executor:
+        def run(raw):
+            return clean_parallel(raw, clean, categorical_columns, workers, executor)
+
+        if STREAMING_AVAILABLE and os.path.getsize(file_path) >= streaming_threshold:
+            for encoding in ENCODINGS:
+                try:
+                    ingest_csv(file_path, run, snapshot_path(key), encoding=encoding)
+                    break
+                except UnicodeDecodeError:
+                    continue
+            df = load_snapshot(key)
+            if df is not None:
+                # 分块写出的分类列为普通字符串，全量统一编码后覆盖快照
+                df = encode_categoricals(df, categorical_columns)
+                save_snapshot(df, key)
+
+        raw = None if df is not None else rename_columns(read_csv(file_path), expected_columns)
+        if raw is not None and (id_column is None or id_column not in raw.columns):
+            df = run(raw)
+            save_snapshot(df, key)
+        elif raw is not None:
+            stored, manifest = load_state(file_path, version, salt)
+            if stored is not None:
+                base_key = manifest.attrs['data_key']
+                df, manifest, delta = refresh(stored, manifest, raw, run, categorical_columns, id_column)
+                delta.base_key = base_key
+            else:
+                # 清洗会原地修改 raw，台账所需的 职位id 与内容哈希先取出
+                ids, hashes = raw[id_column].astype(str).to_numpy(), content_hashes(raw)
+                df = run(raw)
+                manifest = build_manifest(raw.index.to_numpy(), ids, hashes, df.index)
+            save_snapshot(df, key)
+            save_state(manifest, key, file_path, version, salt)
+
+    return (_with_attrs(df, key), delta) if return_delta else _with_attrs(df, key)
+
+
+def load_dataset(file_path, clean, skill_matcher, version, categorical_columns, id_column,
+                 workers=None, return_delta=False, expected_columns=None):
+    """数据集模块共用的 load：按 skill_matcher 清洗，技能配置摘要参与快照键"""
+    # partial 可被 pickle，workers > 1 时交给进程池并行清洗
+    return load_cleaned(file_path, partial(clean, skill_matcher=skill_matcher), version, categorical_columns,
+                        salt=skill_matcher.signature, workers=workers, id_column=id_column,
+                        return_delta=return_delta, expected_columns=expected_columns)
+
+
+def _with_attrs(df, key):
+    df.attrs['data_key'] = key
+    text_path = text_store_path(snapshot_path(key))
+    if os.path.exists(text_path):
+        df.attrs['text_store'] = text_path
+    return df
+
+
+def _file_signature(file_path):
+    stat = os.stat(file_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class LiveDataset:
+    """常驻进程中的整表与共享索引，module 为数据集模块（jobs / overview）
+
+    current() 每次检查源文件的修改时间与大小；有新导出时调用 module.load 增量导入，
+    差量正好接在内存中的数据之后时在索引的副本上用 module.update_indexes 更新，
+    否则（首次加载、快照命中、台账缺失）重新构建。(整表, 索引) 在锁内整体替换，
+    刷新完成前已开始的页面重跑继续使用旧的一对，不会拿到旧整表配新索引。
+    """
+
+    def __init__(self, module, file_path, **load_kwargs):
+        self.module = module
+        self.file_path = file_path
+        self.load_kwargs = load_kwargs
+        self.data = None
+        self.indexes = None
+        self.last_delta = None
+        self._signature = None
+        self._lock = threading.Lock()
+
+    def current(self):
+        """返回 (整表, 索引)，源文件有变化时先刷新"""
+        with self._lock:
+            signature = _file_signature(self.file_path)
+            if signature != self._signature:
+                self._refresh()
+                self._signature = signature
+            return self.data, self.indexes
+
+    def _refresh(self):
+        data, delta = self.module.load(self.file_path, return_delta=True, **self.load_kwargs)
+        if (delta is not None and self.indexes is not None
+                and delta.base_key == self.data.attrs.get('data_key')):
+            indexes = self.module.update_indexes(copy.deepcopy(self.indexes), data, delta)
+        else:
+            indexes = self.module.build_indexes(data)
+        self.data, self.indexes, self.last_delta = data, indexes, delta
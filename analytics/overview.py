@@ -0,0 +1,267 @@
+"""
+综合看板数据集（app.py）
+
+学历、时长归为少数几类，薪资无效的岗位在清洗时剔除。
+"""
+
+import os
+import re
+from functools import partial
+
+import pandas as pd
+
+from .categories import EDUCATION_ORDER, category_counts, encode_categoricals, leading_number
+from .cities import default_city_normalizer
+from .conditions import Conditions
+from .cube import OlapCube
+from .loader import load_dataset, rename_columns
+from .pagination import PagedTable
+from .salary import parse_salary_range
+from .selection import build_shared_indexes, counts_frame, update_shared_indexes
+from .skills import load_skill_matcher
+from .text_index import substring_filter
+
+# 清洗逻辑变更时递增版本号，使旧快照自动失效
+CLEAN_VERSION = 'app-v7'
+
+# 依次查找的数据文件位置
+DATA_PATHS = [
+    '../Big_data_development_results.csv',  # 本地开发环境
+    'Big_data_development_results.csv',     # Streamlit Cloud
+    './Big_data_development_results.csv'    # 当前目录
+]
+
+# 增量导入时识别岗位的列
+ID_COLUMN = '职位id'
+
+EXPECTED_COLUMNS = ['职位id', '职位标题', '薪资范围', '公司名称', '工作地点',
+                    '所处行业', '学历要求', '每周天数', '实习时长', '福利待遇',
+                    '职位描述', '简历要求', '截止日期', '详细地址', '详情页url']
+
+# 低基数列的分类编码：{列名: (固定类别顺序, 其余取值的排序键)}
+CATEGORICAL_COLUMNS = {
+    '城市': (None, None),
+    '学历要求': (EDUCATION_ORDER, None),
+    '学历分类': (EDUCATION_ORDER, None),
+    '实习时长分类': (['3个月', '6个月', '长期实习', '其他'], None),
+    '所处行业': (None, None),
+    '公司名称': (None, None),
+    '每周天数': (None, leading_number),
+}
+
+# 预聚合立方体的维度与度量
+CUBE_DIMENSIONS = ['城市', '学历分类', '实习时长分类']
+MEASURE = '平均薪资'
+
+# 全文检索的文本列及其权重（标题命中比描述更相关）
+TEXT_FIELDS = {'职位标题': 3, '职位描述': 1}
+
+# 共享标签索引的列：(技能标签列, 福利标签列)
+TAG_COLUMNS = ('技能标签', '福利标签')
+
+# 岗位列表可排序的列：{显示名: 列名}
+SORT_COLUMNS = {'日薪': '平均薪资', '城市': '城市', '学历': '学历分类',
+                '实习时长': '实习时长分类', '公司': '公司名称'}
+
+# 岗位列表与导出的列：{列名: 显示名}；标签列只在取出的行上拼接
+TABLE_COLUMNS = {'职位标题': '职位标题', '公司名称': '公司名称', '城市': '城市', '平均薪资': '平均薪资',
+                 '学历分类': '学历分类', '实习时长分类': '实习时长分类', '技能标签': '技能',
+                 '福利标签': '福利', '详情页url': '详情页url'}
+TABLE_FORMATTERS = {'技能标签': lambda x: ', '.join(x[:5]) if x else '未提取',
+                    '福利标签': lambda x: ', '.join(x[:3]) if x else '未提取'}
+
+# 技能关键词：存在 skill_keywords.json 时以配置文件为准
+SKILL_CONFIG_PATH = 'skill_keywords.json'
+TECH_KEYWORDS = ['Hadoop', 'Spark', 'Flink', 'Python', 'Java', 'SQL', 'Kafka',
+                 'Hive', 'HBase', 'Scala', 'ETL', 'MySQL', 'Redis', 'Elasticsearch',
+                 'Docker', 'Kubernetes', 'Linux', 'Shell', 'ClickHouse',
+                 '数据仓库', '数据湖', '实时计算', '离线计算', 'MapReduce', 'HDFS']
+
+
+def find_data_file(paths=DATA_PATHS):
+    """返回第一个存在的数据文件路径，都不存在时返回 None"""
+    return next((p for p in paths if os.path.exists(p)), None)
+
+
+default_skill_matcher = partial(load_skill_matcher, SKILL_CONFIG_PATH, TECH_KEYWORDS)
+
+
+def standardize_education(edu):
+    edu_str = str(edu).lower()
+    if '博士' in edu_str:
+        return '博士'
+    elif '硕士' in edu_str or '研究生' in edu_str:
+        return '硕士'
+    elif '本科' in edu_str or '学士' in edu_str:
+        return '本科'
+    elif '大专' in edu_str or '专科' in edu_str:
+        return '大专'
+    else:
+        return '不限'
+
+
+def classify_duration(duration):
+    duration_str = str(duration)
+    if '3' in duration_str and '月' in duration_str:
+        return '3个月'
+    elif '6' in duration_str and '月' in duration_str:
+        return '6个月'
+    elif '长期' in duration_str or '灵活' in duration_str:
+        return '长期实习'
+    else:
+        return '其他'
+
+
+def extract_welfare(welfare_str):
+    if pd.isna(welfare_str):
+        return []
+    tags = re.split(r'[,，;；、\s]+', str(welfare_str))
+    return [tag.strip() for tag in tags if tag.strip()]
+
+
+def clean(df, skill_matcher=None):
+    """清洗原始数据，派生薪资、城市、技能、学历、时长、福利字段"""
+    skill_matcher = skill_matcher or default_skill_matcher()
+    df = rename_columns(df, EXPECTED_COLUMNS)
+
+    # 薪资清洗（向量化解析，统一折算为日薪）
+    salary = parse_salary_range(df['薪资范围'])
+    df['最低薪资'] = salary['min']
+    df['最高薪资'] = salary['max']
+    df['平均薪资'] = salary['avg'].fillna(0).astype(int)
+
+    # 城市提取
+    df['城市'] = default_city_normalizer().normalize_series(df['工作地点'])
+
+    # 技能提取（单次扫描，带词边界与别名）
+    df['技能标签'] = skill_matcher.extract_series(df['职位描述'])
+
+    df['学历分类'] = df['学历要求'].apply(standardize_education)
+    df['实习时长分类'] = df['实习时长'].apply(classify_duration)
+    df['福利标签'] = df['福利待遇'].apply(extract_welfare)
+
+    # 删除无效数据
+    df = df[(df['平均薪资'] > 0) & (df['城市'].notna()) & (df['城市'] != '')]
+
+    # 低基数列转为分类类型，筛选与计数直接使用整数编码
+    return encode_categoricals(df.copy(), CATEGORICAL_COLUMNS)
+
+
+def load(file_path, skill_matcher=None, workers=None, return_delta=False):
+    """加载并清洗数据（优先读取清洗结果快照）；return_delta 时另返回增量导入的差量"""
+    return load_dataset(file_path, clean, skill_matcher or default_skill_matcher(), CLEAN_VERSION,
+                        CATEGORICAL_COLUMNS, ID_COLUMN, workers=workers, return_delta=return_delta,
+                        expected_columns=EXPECTED_COLUMNS)
+
+
+def build_indexes(df):
+    """整表上的共享索引"""
+    return build_shared_indexes(df, TAG_COLUMNS, CUBE_DIMENSIONS, MEASURE, SORT_COLUMNS.values(), TEXT_FIELDS)
+
+
+def update_indexes(indexes, df, delta):
+    """按增量导入的差量原地更新 build_indexes 构建的索引，df 为更新后的整表"""
+    return update_shared_indexes(indexes, df, delta, TAG_COLUMNS)
+
+
+def filter(df, indexes, cities=None, salary_range=None, education=None, durations=None,
+           skills=None, welfare=None, keywords=None):
+    """按筛选条件返回命中行在整表中的位置；多选为空表示不限，技能为 AND、福利为 OR，关键词各词均需命中
+
+    没有可检索的文本（既无长文本列也无文本库）时按关键词筛选会抛出 ValueError。
+
+    各条件组合成一个选择向量，按预计命中行数从少到多依次收窄，不生成中间子表。
+    """
+    conditions = Conditions(len(df))
+    cube = indexes.cube
+
+    for column, values in [('城市', cities), ('学历分类', education), ('实习时长分类', durations)]:
+        if values:
+            conditions.isin(df[column], values, estimate=len(cube.slice({column: values})))
+
+    if salary_range is not None:
+        conditions.between(df['平均薪资'], salary_range[0], salary_range[1],
+                           estimate=len(cube.slice(measure_range=salary_range)))
+
+    # 技能 AND / 福利 OR 通过倒排索引的位图运算完成
+    if skills:
+        conditions.bitmap(lambda: indexes.skills.all_of(skills),
+                          estimate=min(indexes.skills.frequency(tag) for tag in skills))
+
+    if welfare:
+        conditions.bitmap(lambda: indexes.welfare.any_of(welfare),
+                          estimate=sum(indexes.welfare.frequency(tag) for tag in welfare))
+
+    if keywords:
+        if indexes.text is not None:
+            conditions.bitmap(lambda: indexes.text.match(keywords))
+        else:
+            conditions.add(substring_filter(df, TEXT_FIELDS, keywords))
+
+    return conditions.positions()
+
+
+def slice_view(indexes, selection, cities=None, salary_range=None, education=None, durations=None,
+               skills=None, welfare=None, keywords=None):
+    """与 filter 相同条件下的立方体切片"""
+    # 技能/福利/关键词不是立方体维度，此时退回到筛选结果的维度列上重新聚合
+    if skills or welfare or keywords:
+        return OlapCube(selection.columns(*CUBE_DIMENSIONS, MEASURE), CUBE_DIMENSIONS, MEASURE).slice()
+    return indexes.cube.slice({'城市': cities or None, '学历分类': education or None,
+                               '实习时长分类': durations or None}, salary_range)
+
+
+def table(df, positions):
+    """按行位置分页的岗位列表"""
+    return PagedTable(df, positions, TABLE_COLUMNS, TABLE_FORMATTERS)
+
+
+def _salary_stats(sel):
+    salary_stats = sel.view.describe().to_frame()
+    salary_stats.columns = ['统计值']
+    salary_stats.index = ['数量', '平均值', '标准差', '最小值', '25%分位', '中位数', '75%分位', '最大值']
+    return salary_stats
+
+
+def _skill_combos(sel):
+    skill_combos = sel.column('技能标签').apply(
+        lambda x: ', '.join(sorted(x)) if len(x) > 1 else None
+    ).dropna()
+    return counts_frame(skill_combos.value_counts().head(10), ['技能组合', '出现次数'])
+
+
+# 各图表的聚合：名称 -> 接收 Selection 的函数
+AGGREGATIONS = {
+    'kpi': lambda sel: {
+        'jobs': len(sel.view),
+        'avg_salary': sel.view.mean(),
+        'companies': sel.column('公司名称').nunique(),
+        'cities': sel.view.nunique('城市'),
+        'top_city': sel.view.counts('城市').index[0] if len(sel.view) > 0 else "无",
+    },
+    'edu_counts': lambda sel: counts_frame(sel.view.counts('学历分类'), ['学历', '数量']),
+    'duration_counts': lambda sel: counts_frame(sel.view.counts('实习时长分类'), ['时长', '数量']),
+    'company_counts': lambda sel: counts_frame(
+        category_counts(sel.column('公司名称')).head(10), ['公司', '岗位数']),
+    'industry_counts': lambda sel: counts_frame(
+        category_counts(sel.column('所处行业')).head(10), ['行业', '数量']),
+    'salary_histogram': lambda sel: sel.view.histogram(40),
+    'salary_box': lambda sel: sel.view.box_stats(),
+    'edu_salary_box': lambda sel: sel.view.box_stats('学历分类'),
+    'salary_median': lambda sel: sel.view.median(),
+    'salary_stats': _salary_stats,
+    'city_counts': lambda sel: counts_frame(sel.view.counts('城市').head(15), ['城市', '岗位数']),
+    'city_salary': lambda sel: counts_frame(
+        sel.view.mean_by('城市').sort_values(ascending=False).head(15), ['城市', '平均薪资']),
+    'top_cities': lambda sel: sel.view.counts('城市').head(10).index.tolist(),
+    'city_salary_box': lambda sel: sel.view.box_stats('城市').reindex(sel.view.counts('城市').head(10).index),
+    'skill_counts': lambda sel: sel.indexes.skills.counts(sel.labels),
+    'skill_combos': _skill_combos,
+}
+
+
+def aggregate(name, selection):
+    """计算名为 name 的图表聚合"""
+    if name not in AGGREGATIONS:
+        raise KeyError(f"未知的聚合: {name}")
+    return AGGREGATIONS[name](selection)
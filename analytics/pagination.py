@@ -0,0 +1,124 @@
+"""
+服务端分页表格
+
+整表按可排序列预先排好行位置（升序、降序各一份），筛选结果排序时只需按
+掩码从预排序数组中抽取，不再对筛选结果重新排序。分页时只取出并格式化
+当前页的行，翻页耗时与结果集大小无关。
+"""
+
+import numpy as np
+import pandas as pd
+
+from .tag_index import python_lists
+
+
+def _sort_keys(series):
+    """列值转为可比较的数值键，缺失值返回 NaN"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # 分类列按类别顺序排序（如学历按 EDUCATION_ORDER）
+        codes = series.cat.codes.to_numpy()
+        return np.where(codes >= 0, codes, np.nan)
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        keys = series.to_numpy(dtype='datetime64[ns]').astype('int64').astype(float)
+        keys[series.isna().to_numpy()] = np.nan
+        return keys
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return series.to_numpy(dtype=float, na_value=np.nan)
+    codes, _ = pd.factorize(series, sort=True)
+    return np.where(codes >= 0, codes, np.nan)
+
+
+class SortIndex:
+    """整表各列的预排序行位置，缺失值始终排在最后"""
+
+    def __init__(self, df, columns):
+        self.index = df.index
+        self.columns = list(columns)
+        self._orders = {}
+        for column in self.columns:
+            keys = _sort_keys(df[column])
+            valid = np.flatnonzero(~np.isnan(keys))
+            missing = np.flatnonzero(np.isnan(keys))
+            asc = valid[np.argsort(keys[valid], kind='stable')]
+            desc = valid[np.argsort(-keys[valid], kind='stable')]
+            self._orders[column] = (np.concatenate([asc, missing]), np.concatenate([desc, missing]))
+
+    def update(self, df, removed):
+        """按差量原地更新：df 为删除 removed 标签的行、并在末尾追加新行后的整表
+
+        保留行之间的相对顺序不变，新增行排序后用 searchsorted 归并进去，
+        结果与重新构建一致。
+        """
+        keep = ~self.index.isin(removed)
+        new_positions = np.cumsum(keep) - 1
+        added = np.arange(int(keep.sum()), len(df))
+        self.index = df.index
+        for column in self.columns:
+            keys = _sort_keys(df[column])
+            merged = []
+            for old, sign in zip(self._orders[column], (1, -1)):
+                old = new_positions[old[keep[old]]]
+                old_valid = old[~np.isnan(keys[old])]
+                new_valid = added[~np.isnan(keys[added])]
+                new_valid = new_valid[np.argsort(sign * keys[new_valid], kind='stable')]
+                # 相同键值的保留行位置更小，排在新增行之前（与稳定排序一致）
+                at = np.searchsorted(sign * keys[old_valid], sign * keys[new_valid], side='right')
+                merged.append(np.concatenate([np.insert(old_valid, at, new_valid),
+                                              old[np.isnan(keys[old])], added[np.isnan(keys[added])]]))
+            self._orders[column] = tuple(merged)
+
+    def positions(self, labels):
+        """筛选结果的行标签 -> 整表中的行位置"""
+        return self.index.get_indexer(labels)
+
+    def order(self, positions, column=None, ascending=True):
+        """按 column 排序后的行位置；column 为 None 时保持原顺序"""
+        positions = np.asarray(positions, dtype=np.int64)
+        if column is None:
+            return positions
+        mask = np.zeros(len(self.index), dtype=bool)
+        mask[positions] = True
+        order = self._orders[column][0 if ascending else 1]
+        return order[mask[order]]
+
+
+class PagedTable:
+    """按给定行位置分页的只读表格视图
+
+    columns 为 {原列名: 显示列名}，formatters 为 {原列名: 单值格式化函数}，
+    只在取出的行上执行。
+    """
+
+    def __init__(self, df, positions, columns, formatters=None):
+        self._df = df
+        self._positions = positions
+        self._columns = dict(columns)
+        self._formatters = dict(formatters or {})
+
+    def __len__(self):
+        return len(self._positions)
+
+    def page_count(self, page_size):
+        return max(1, (len(self) - 1) // page_size + 1)
+
+    def _frame(self, start, stop):
+        """第 start 到 stop 行（结果集中的序号）格式化后的表格，行索引即序号"""
+        rows = python_lists(self._df.iloc[self._positions[start:stop]][list(self._columns)])
+        data = {}
+        for column, label in self._columns.items():
+            values = rows[column]
+            if column in self._formatters:
+                values = values.map(self._formatters[column]).astype(object)
+            data[label] = values.to_numpy()
+        return pd.DataFrame(data, index=pd.RangeIndex(start, start + len(rows)))
+
+    def page(self, number, page_size):
+        """第 number 页（从 1 开始），超出范围时返回最后一页"""
+        number = min(max(1, int(number)), self.page_count(page_size))
+        start = (number - 1) * page_size
+        return self._frame(start, start + page_size)
+
+    def chunks(self, chunk_size=10_000):
+        """按块依次产出格式化后的全部行，供导出使用"""
+        for start in range(0, len(self), chunk_size):
+            yield self._frame(start, start + chunk_size)
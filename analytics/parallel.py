@@ -0,0 +1,61 @@
+"""
+多进程并行清洗
+
+技能提取、城市、福利、学历、时长等逐行清洗步骤互不依赖：原始数据按行切成
+若干分区交给进程池分别清洗，按分区顺序拼接后统一做分类编码，结果与单进程
+清洗完全一致。
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+
+import numpy as np
+import pandas as pd
+
+from .categories import encode_categoricals
+
+# 未显式指定进程数时读取的环境变量
+WORKERS_ENV = 'CLEAN_WORKERS'
+
+# 每个分区的最少行数，数据量太小时进程间传输的开销大于收益
+MIN_PARTITION_ROWS = 10_000
+
+
+def resolve_workers(workers=None):
+    """进程数：None 时读取环境变量 CLEAN_WORKERS（默认 1，即不并行），0 或负数表示全部 CPU 核"""
+    if workers is None:
+        workers = int(os.environ.get(WORKERS_ENV, '1'))
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    return workers
+
+
+def process_pool(workers):
+    """workers > 1 时返回进程池（子进程在首次提交任务时才启动），否则返回空上下文"""
+    if workers <= 1:
+        return nullcontext(None)
+    # spawn 不继承父进程的线程与锁，在 Streamlit 服务进程中使用更安全
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
+
+def clean_parallel(df, clean, categorical_columns, workers=None, executor=None,
+                   min_partition_rows=MIN_PARTITION_ROWS):
+    """按行分区并行执行 clean(分区)，按原顺序拼接并重新统一分类编码
+
+    clean 需可被 pickle（模块级函数或 functools.partial）。传入 executor 时复用
+    该进程池，否则临时创建一个。
+    """
+    workers = resolve_workers(workers)
+    partitions = min(workers, len(df) // min_partition_rows)
+    if partitions <= 1:
+        return clean(df)
+
+    bounds = np.linspace(0, len(df), partitions + 1).astype(int)
+    parts = [df.iloc[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+    with (nullcontext(executor) if executor is not None else process_pool(workers)) as pool:
+        # map 按提交顺序返回结果，拼接顺序与原始行顺序一致
+        cleaned = list(pool.map(clean, parts))
+    # 各分区独立编码的类别不同，拼接后统一重新编码
+    return encode_categoricals(pd.concat(cleaned), categorical_columns)
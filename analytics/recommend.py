@@ -0,0 +1,55 @@
+"""
+岗位推荐打分
+
+加载时为每行预先算好特征向量（日薪、技能数、福利数），推荐时只取筛选结果
+对应的行，各特征按筛选结果内的最大值归一化后与权重做一次矩阵乘法；给出
+个人技能时再加上技能匹配度（命中的个人技能占比）。TOP-K 用 argpartition
+选出，不对全部结果排序。
+"""
+
+import numpy as np
+
+
+class Recommender:
+    """行位置与构建时的 DataFrame 对齐；skills/welfare 为对应列的 TagIndex"""
+
+    # 特征列顺序，与权重字典的键对应
+    FEATURES = ['salary', 'skills', 'welfare']
+
+    def __init__(self, df, salary_column, skills, welfare):
+        self.index = df.index
+        self.skills = skills
+        self.features = np.column_stack([
+            df[salary_column].to_numpy(dtype=float, na_value=np.nan),
+            skills.row_counts().astype(float),
+            welfare.row_counts().astype(float),
+        ])
+
+    def scores(self, positions, weights, my_skills=None):
+        """positions 对应行的推荐分数；缺失特征参与加权的行为 NaN"""
+        positions = np.asarray(positions, dtype=np.int64)
+        x = self.features[positions]
+        maxima = np.nanmax(x, axis=0, initial=0.0) if len(x) else np.zeros(len(self.FEATURES))
+        # 最大值不为正的特征不参与打分
+        coef = np.array([weights.get(name, 0) for name in self.FEATURES], dtype=float)
+        coef = np.divide(coef, maxima, out=np.zeros_like(coef), where=maxima > 0)
+        used = coef != 0
+        scores = np.nan_to_num(x[:, used]) @ coef[used]
+        scores[np.isnan(x[:, used]).any(axis=1)] = np.nan
+
+        if my_skills and weights.get('match'):
+            matched = self.skills.overlap(my_skills)[positions]
+            scores += matched / len(set(my_skills)) * weights['match']
+        return scores
+
+    def top(self, positions, k=10, weights=None, my_skills=None):
+        """分数最高的 k 行：返回 (行位置, 分数)，同分时靠前的行优先，NaN 不参与"""
+        positions = np.asarray(positions, dtype=np.int64)
+        scores = self.scores(positions, weights or {}, my_skills)
+        valid = np.flatnonzero(~np.isnan(scores))
+        if len(valid) > k:
+            # argpartition 选出第 k 大的分数，再把与其同分的行全部纳入候选，保证取舍稳定
+            kth = scores[valid[np.argpartition(-scores[valid], k - 1)[k - 1]]]
+            valid = valid[scores[valid] >= kth]
+        chosen = valid[np.lexsort((valid, -scores[valid]))][:k]
+        return positions[chosen], scores[chosen]
@@ -0,0 +1,55 @@
+"""
+向量化薪资解析
+
+把 "150-250/天"、"8k-10k/月"、"300元/天"、"8k" 等薪资文本一次性解析为
+最低/最高/平均日薪三列。先对原始文本去重，再在去重后的取值上做一次
+Series.str.extract，最后按编码回填，重复度高的大数据集只需解析少量文本。
+"""
+
+import numpy as np
+import pandas as pd
+
+# 月薪、周薪、时薪折算为日薪
+WORK_DAYS_PER_MONTH = 21.75
+WORK_DAYS_PER_WEEK = 5
+WORK_HOURS_PER_DAY = 8
+
+UNIT_TO_DAILY = {
+    '天': 1.0, '日': 1.0,
+    '月': 1.0 / WORK_DAYS_PER_MONTH,
+    '周': 1.0 / WORK_DAYS_PER_WEEK,
+    '时': float(WORK_HOURS_PER_DAY), '小时': float(WORK_HOURS_PER_DAY),
+}
+
+SALARY_PATTERN = (
+    r'(?P<low>\d+(?:\.\d+)?)\s*(?P<low_k>[kK千])?'
+    r'(?:\s*[-~～—至到]\s*(?P<high>\d+(?:\.\d+)?)\s*(?P<high_k>[kK千])?)?'
+    r'\s*元?\s*(?:[/／每]\s*(?P<unit>小时|天|日|月|周|时))?'
+)
+
+
+def parse_salary_range(salary_series):
+    """解析薪资文本，返回 min / max / avg 三列（单位：元/天，无法解析为 NaN）"""
+    codes, uniques = pd.factorize(salary_series.astype(str))
+    parts = pd.Series(uniques, dtype=object).str.extract(SALARY_PATTERN)
+
+    low = parts['low'].astype(float)
+    high = parts['high'].astype(float).fillna(low)
+
+    # 任一端写了 K 时两端都按千计（"3-5K"、"3K-5" 都是 3000-5000）
+    thousands = parts['low_k'].notna() | parts['high_k'].notna()
+    low = low * np.where(thousands, 1000, 1)
+    high = high * np.where(thousands, 1000, 1)
+
+    # 未标注单位时：带 K 的按月薪，其余按实习僧默认的日薪处理
+    unit = parts['unit'].fillna(pd.Series(np.where(thousands, '月', '天'), index=parts.index))
+    factor = unit.map(UNIT_TO_DAILY)
+    low = low * factor
+    high = high * factor
+
+    result = pd.DataFrame({'min': low, 'max': high, 'avg': (low + high) / 2})
+    result = result.iloc[codes].reset_index(drop=True)
+    # factorize 把缺失值编码为 -1，对应位置整行置空
+    result.loc[codes < 0] = np.nan
+    result.index = salary_series.index
+    return result
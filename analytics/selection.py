@@ -0,0 +1,102 @@
+"""
+筛选结果与共享索引
+
+Indexes 是整表上只构建一次的索引（build_shared_indexes / update_shared_indexes
+按各数据集的列名构建与增量更新）；Selection 是一次筛选的结果，
+各数据集的聚合函数只从 Selection 取数据。Selection 只保存命中行在整表中的
+位置，整表为所有会话共享的只读数据，按需取列时才复制对应的行（Arrow 存储的
+列表列同时转为 Python list）。
+"""
+
+import numpy as np
+
+from .cube import OlapCube
+from .ingest import text_columns
+from .pagination import SortIndex
+from .tag_index import TagIndex, python_lists
+from .text_index import TextIndex
+
+
+class Indexes:
+    """技能/福利倒排索引、预聚合立方体、预排序索引、全文检索索引（缺少文本列时为 None）、
+    推荐打分的特征矩阵与福利关键词匹配器（未构建时为 None）"""
+
+    def __init__(self, skills, welfare, cube, sort, text=None, recommender=None, welfare_matcher=None):
+        self.skills = skills
+        self.welfare = welfare
+        self.cube = cube
+        self.sort = sort
+        self.text = text
+        self.recommender = recommender
+        self.welfare_matcher = welfare_matcher
+
+
+def build_text_index(df, text_fields):
+    """全文检索索引，加载时即建好倒排表；流式导入的数据从文本库读取长文本列，都没有时返回 None"""
+    texts = text_columns(df, text_fields)
+    return None if texts is None else TextIndex(texts, text_fields).build()
+
+
+def build_shared_indexes(df, tag_columns, cube_dimensions, measure, sort_columns, text_fields):
+    """两个数据集共有的索引，tag_columns 为 (技能标签列, 福利标签列)"""
+    skill_column, welfare_column = tag_columns
+    return Indexes(skills=TagIndex(df[skill_column]), welfare=TagIndex(df[welfare_column]),
+                   cube=OlapCube(df, cube_dimensions, measure), sort=SortIndex(df, sort_columns),
+                   text=build_text_index(df, text_fields))
+
+
+def update_shared_indexes(indexes, df, delta, tag_columns):
+    """按增量导入的差量原地更新 build_shared_indexes 构建的索引，df 为更新后的整表"""
+    skill_column, welfare_column = tag_columns
+    removed = delta.removed.index
+    indexes.skills.update(removed, delta.added[skill_column])
+    indexes.welfare.update(removed, delta.added[welfare_column])
+    indexes.cube.update(delta.removed, delta.added, df)
+    indexes.sort.update(df, removed)
+    if indexes.text is not None:
+        indexes.text.update(removed, delta.added)
+    return indexes
+
+
+class Selection:
+    """data 为整表，positions 为筛选命中的行位置，view 为同一条件下的立方体切片"""
+
+    def __init__(self, data, positions, view, indexes):
+        self.data = data
+        self.positions = np.asarray(positions, dtype=np.int64)
+        self.view = view
+        self.indexes = indexes
+        self._rows = None
+
+    def __len__(self):
+        return len(self.positions)
+
+    @property
+    def labels(self):
+        """命中行的行标签"""
+        return self.data.index[self.positions]
+
+    @property
+    def rows(self):
+        """筛选后的完整行，第一次访问时才取出"""
+        if self._rows is None:
+            self._rows = python_lists(self.data.take(self.positions))
+        return self._rows
+
+    def columns(self, *names):
+        """只取出部分列的筛选结果"""
+        if self._rows is not None:
+            return self._rows[list(names)]
+        return python_lists(self.data[list(names)].take(self.positions))
+
+    def column(self, name):
+        if self._rows is not None:
+            return self._rows[name]
+        return python_lists(self.data[name].take(self.positions))
+
+
+def counts_frame(counts, columns):
+    """计数结果转为两列 DataFrame"""
+    frame = counts.reset_index()
+    frame.columns = columns
+    return frame
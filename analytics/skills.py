@@ -0,0 +1,124 @@
+"""
+多模式技能匹配
+
+把技能关键词及其别名编译成一棵前缀树，再展开成一个正则表达式，
+每条职位描述只需扫描一遍即可找出全部技能。英文关键词带词边界约束，
+避免 Java 命中 JavaScript、SQL 命中 MySQL 这类误报；关键词数量增加时
+单条描述的匹配耗时基本不变。
+"""
+
+import hashlib
+import json
+import os
+import re
+
+import pandas as pd
+
+# 常见别名/连写形式，只有规范名出现在关键词列表中时才生效
+DEFAULT_SYNONYMS = {
+    'Spark': ['PySpark', 'SparkSQL', 'SparkStreaming'],
+    'Flink': ['FlinkSQL', 'PyFlink'],
+    'Hive': ['HiveSQL', 'HQL'],
+    'SQL': ['SparkSQL', 'FlinkSQL', 'HiveSQL', 'HQL'],
+    'Python': ['PySpark', 'PyFlink'],
+    'Kubernetes': ['K8s'],
+    '数据仓库': ['数仓'],
+    '实时计算': ['流式计算', '流计算'],
+}
+
+# 文本统一转大写后匹配，英文词边界只看相邻字母，允许 Python3、Java8 等写法
+_WORD_CHAR = 'A-Z'
+
+
+def _trie_regex(words):
+    """把一组词编译成前缀树形式的正则，共享前缀只比较一次"""
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def walk(node):
+        branches = [re.escape(ch) + walk(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        optional = '' in node
+        if len(branches) == 1 and not optional:
+            return branches[0]
+        group = '(?:' + '|'.join(branches) + ')'
+        # 贪婪的可选分组保证优先尝试更长的词
+        return group + '?' if optional else group
+
+    return walk(trie)
+
+
+def _is_word_char(ch):
+    return ch.isascii() and ch.isalnum()
+
+
+class SkillMatcher:
+    """技能匹配器：一次扫描提取所有技能，支持别名与词边界"""
+
+    def __init__(self, skills, synonyms=None):
+        self.skills = list(dict.fromkeys(skills))
+        order = {skill: i for i, skill in enumerate(self.skills)}
+
+        # 别名（大写） -> 对应的规范技能序号
+        self._aliases = {}
+        for skill in self.skills:
+            self._aliases.setdefault(skill.upper(), set()).add(order[skill])
+        for skill, aliases in (synonyms or {}).items():
+            if skill not in order:
+                continue
+            for alias in aliases:
+                self._aliases.setdefault(alias.upper(), set()).add(order[skill])
+
+        # 按首尾是否为英文/数字分桶，分别加上对应的词边界
+        buckets = {}
+        for alias in self._aliases:
+            bounds = (_is_word_char(alias[0]), _is_word_char(alias[-1]))
+            buckets.setdefault(bounds, []).append(alias)
+        parts = []
+        for (left, right), words in sorted(buckets.items(), reverse=True):
+            parts.append(
+                (f'(?<![{_WORD_CHAR}])' if left else '')
+                + f'(?:{_trie_regex(words)})'
+                + (f'(?![{_WORD_CHAR}])' if right else '')
+            )
+        self._pattern = re.compile('|'.join(parts) or r'(?!)')
+
+    @classmethod
+    def from_config(cls, path):
+        """从 JSON 配置加载：可以是技能列表，或 {"skills": [...], "synonyms": {...}}"""
+        with open(path, encoding='utf-8') as f:
+            config = json.load(f)
+        if isinstance(config, list):
+            return cls(config, DEFAULT_SYNONYMS)
+        return cls(config['skills'], config.get('synonyms', DEFAULT_SYNONYMS))
+
+    @property
+    def signature(self):
+        """关键词与别名的摘要，用于让清洗结果快照随配置变化失效"""
+        payload = json.dumps([self.skills, sorted((k, sorted(v)) for k, v in self._aliases.items())],
+                             ensure_ascii=False)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:12]
+
+    def extract(self, text):
+        """返回描述中出现的技能，顺序与关键词列表一致"""
+        if pd.isna(text):
+            return []
+        found = set()
+        for alias in self._pattern.findall(str(text).upper()):
+            found.update(self._aliases[alias])
+        return [self.skills[i] for i in sorted(found)]
+
+    def extract_series(self, series):
+        return series.map(self.extract)
+
+
+def load_skill_matcher(config_path, default_skills, default_synonyms=DEFAULT_SYNONYMS):
+    """配置文件存在时从配置加载关键词，否则使用代码内置的默认列表"""
+    if config_path and os.path.exists(config_path):
+        return SkillMatcher.from_config(config_path)
+    return SkillMatcher(default_skills, default_synonyms)
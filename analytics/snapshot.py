@@ -0,0 +1,90 @@
+"""
+清洗结果快照缓存
+
+首次加载时把清洗后的完整数据写成 Arrow IPC (Feather v2) 文件，
+文件名由源 CSV 内容哈希与清洗版本号共同决定；之后的冷启动直接以
+内存映射方式读取快照，多个副本/进程共享同一份清洗产物。读取时各列
+不合并成二维块：无缺失的数值/日期列直接引用映射文件的缓冲区，同一台机器上
+读取同一快照的进程共用操作系统页缓存中的同一份数据。字符串列在 pandas 3
+（默认由 Arrow 存储字符串）下同样不复制，pandas 2.x 下会转换为 Python 对象。
+技能/福利等列表列保持 Arrow 存储（pd.ArrowDtype），不在读取时逐行转换为 list。
+"""
+
+import hashlib
+import os
+import uuid
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:  # 未安装 pyarrow 时退化为每次重新清洗
+    pa = None
+
+# 快照目录，可通过环境变量指向多副本共享的挂载盘
+SNAPSHOT_DIR_ENV = 'SNAPSHOT_DIR'
+DEFAULT_SNAPSHOT_DIR = '.snapshots'
+
+
+def file_digest(file_path, block_size=1 << 20):
+    """按块计算文件的 SHA-256，避免一次性读入大文件"""
+    h = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def snapshot_key(file_path, *salts):
+    """快照键：源文件内容哈希 + 清洗逻辑版本等附加因子"""
+    h = hashlib.sha256(file_digest(file_path).encode())
+    for salt in salts:
+        h.update(b'\0' + str(salt).encode())
+    return h.hexdigest()[:32]
+
+
+def snapshot_path(key, snapshot_dir=None):
+    snapshot_dir = snapshot_dir or os.environ.get(SNAPSHOT_DIR_ENV, DEFAULT_SNAPSHOT_DIR)
+    return os.path.join(snapshot_dir, f"{key}.arrow")
+
+
+def load_snapshot(key, snapshot_dir=None):
+    """读取快照，不存在或损坏时返回 None"""
+    if pa is None:
+        return None
+    path = snapshot_path(key, snapshot_dir)
+    if not os.path.exists(path):
+        return None
+    try:
+        table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+    except (OSError, pa.ArrowInvalid):
+        return None
+
+    # 列表列（技能/福利标签）保持 Arrow 存储，标签索引直接在 Arrow 数组上构建，
+    # 展示时只把取出的行转换为 Python list（见 tag_index.python_lists）
+    metadata = table.schema.pandas_metadata or {}
+    index_cols = {c for c in metadata.get('index_columns', []) if isinstance(c, str)}
+    columns = [name for name in table.schema.names if name not in index_cols]
+    df = table.to_pandas(split_blocks=True,
+                         types_mapper=lambda t: pd.ArrowDtype(t) if pa.types.is_list(t) else None)
+    return df[columns]
+
+
+def save_snapshot(df, key, snapshot_dir=None):
+    """写入快照；先写临时文件再原子替换，防止并发读到半个文件"""
+    if pa is None:
+        return None
+    path = snapshot_path(key, snapshot_dir)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=True)
+        with pa.OSFile(tmp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+    except (OSError, pa.ArrowException):
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return None
+    return path
@@ -0,0 +1,146 @@
+"""
+标签倒排索引
+
+加载时把技能/福利等列表列展开为 (标签编码, 行号) 两个数组并按标签排序，
+每个标签对应一段连续的行号（倒排表）。筛选时按需把倒排表展开成布尔位图，
+AND / OR 条件变成 NumPy 按位运算；标签计数用 bincount 一次完成。
+从快照读取的列表列由 Arrow 存储，构建时直接按偏移量展开，不逐行转换成 Python list；
+取出少量行展示时再用 python_lists 转换。
+"""
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # 没有 pyarrow 时也不会出现 Arrow 存储的列表列
+    pa = None
+
+
+def is_list_dtype(dtype):
+    """Arrow 存储的列表列（从快照读取的技能/福利列）"""
+    return isinstance(dtype, pd.ArrowDtype) and dtype.type is list
+
+
+def python_lists(data):
+    """Series/DataFrame 中 Arrow 存储的列表列转为 Python list；只对取出的行调用，不转换整表"""
+    if isinstance(data, pd.Series):
+        if not is_list_dtype(data.dtype):
+            return data
+        return pd.Series(data.tolist(), index=data.index, name=data.name, dtype=object)
+    columns = [name for name in data.columns if is_list_dtype(data[name].dtype)]
+    if not columns:
+        return data
+    return data.assign(**{name: python_lists(data[name]) for name in columns})
+
+
+def _postings(tag_series):
+    """展开列表列：返回每个标签所在的行号与平铺后的标签（Series）"""
+    if is_list_dtype(tag_series.dtype):
+        # Arrow 列表列直接取各行长度与平铺后的值，不逐行转换
+        values = pa.array(tag_series)
+        lengths = pc.list_value_length(values).fill_null(0).to_numpy()
+        flat = pd.Series(pd.arrays.ArrowExtensionArray(pc.list_flatten(values)))
+    else:
+        lengths = tag_series.map(lambda x: len(x) if isinstance(x, list) else 0).to_numpy(dtype=np.int64)
+        flat = pd.Series([tag for tags in tag_series if isinstance(tags, list) for tag in tags], dtype=object)
+    rows = np.repeat(np.arange(len(tag_series)), lengths)
+    return rows, flat
+
+
+class TagIndex:
+    """列表列的倒排索引，行位置与构建时的 DataFrame 对齐"""
+
+    def __init__(self, tag_series):
+        self.index = tag_series.index
+        rows, flat = _postings(tag_series)
+        codes, tags = pd.factorize(flat)
+        self.tags = list(tags)
+        self._positions = {tag: i for i, tag in enumerate(self.tags)}
+        self._set_postings(codes, rows)
+
+    def _set_postings(self, codes, rows):
+        # 按标签编码稳定排序，每个标签的行号落在 [offsets[i], offsets[i+1]) 区间
+        order = np.argsort(codes, kind='stable')
+        self._codes = codes[order]
+        self._rows = rows[order]
+        self._offsets = np.searchsorted(self._codes, np.arange(len(self.tags) + 1))
+
+    def update(self, removed, added):
+        """按差量原地更新：删除行标签在 removed 中的行，在末尾追加 added（标签列表的 Series）
+
+        更新后的行位置与 保留行在前、新增行在后 的 DataFrame 对齐，各标签的倒排表与重新构建一致。
+        """
+        keep = ~self.index.isin(removed)
+        # 保留行的新位置 = 原位置 - 之前被删除的行数
+        new_positions = np.cumsum(keep) - 1
+        live = keep[self._rows]
+        codes, rows = self._codes[live], new_positions[self._rows[live]]
+
+        added_rows, flat = _postings(added)
+        for tag in flat:
+            if tag not in self._positions:
+                self._positions[tag] = len(self.tags)
+                self.tags.append(tag)
+        added_codes = np.fromiter((self._positions[tag] for tag in flat), dtype=codes.dtype, count=len(flat))
+
+        self.index = self.index[keep].append(added.index)
+        self._set_postings(np.concatenate([codes, added_codes]),
+                           np.concatenate([rows, added_rows + int(keep.sum())]))
+
+    def __len__(self):
+        return len(self.index)
+
+    def bitmap(self, tag):
+        """单个标签的布尔位图；未知标签返回全 False"""
+        mask = np.zeros(len(self), dtype=bool)
+        i = self._positions.get(tag)
+        if i is not None:
+            mask[self._rows[self._offsets[i]:self._offsets[i + 1]]] = True
+        return mask
+
+    def all_of(self, tags):
+        """同时包含全部标签的行（AND）"""
+        mask = np.ones(len(self), dtype=bool)
+        # 先处理出现次数最少的标签，结果更快收敛
+        for tag in sorted(tags, key=self.frequency):
+            mask &= self.bitmap(tag)
+            if not mask.any():
+                break
+        return pd.Series(mask, index=self.index)
+
+    def any_of(self, tags):
+        """至少包含一个标签的行（OR）"""
+        mask = np.zeros(len(self), dtype=bool)
+        for tag in tags:
+            mask |= self.bitmap(tag)
+        return pd.Series(mask, index=self.index)
+
+    def frequency(self, tag):
+        i = self._positions.get(tag)
+        return 0 if i is None else int(self._offsets[i + 1] - self._offsets[i])
+
+    def row_counts(self):
+        """每行的标签个数"""
+        return np.bincount(self._rows, minlength=len(self))
+
+    def overlap(self, tags):
+        """每行包含 tags 中标签的个数"""
+        hits = np.zeros(len(self), dtype=np.int64)
+        for tag in set(tags):
+            i = self._positions.get(tag)
+            if i is not None:
+                hits[self._rows[self._offsets[i]:self._offsets[i + 1]]] += 1
+        return hits
+
+    def counts(self, labels=None):
+        """统计各标签出现次数，可限定为 labels 指定的行（如筛选结果的索引），按次数降序"""
+        codes = self._codes
+        if labels is not None:
+            selected = np.zeros(len(self), dtype=bool)
+            selected[self.index.get_indexer(labels)] = True
+            codes = codes[selected[self._rows]]
+        counts = np.bincount(codes, minlength=len(self.tags))
+        result = pd.Series(counts, index=pd.Index(self.tags, dtype=object), dtype=int)
+        return result[result > 0].sort_values(ascending=False, kind='stable')
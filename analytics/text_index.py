@@ -0,0 +1,262 @@
+"""
+全文检索倒排索引
+
+职位标题、职位描述在加载时切词并建成倒排表：中文按相邻两字切分（二元组），
+英文与数字按整词切分并转小写。查询按 BM25 打分，多个查询词之间为 AND，
+最后一个词按前缀匹配（输入到一半也能命中）；单独一个汉字的查询词匹配所有
+含该字的二元组。命中位图与打分都由 NumPy 在倒排表上完成，不再逐行
+str.contains。
+
+切词是向量化的：汉字二元组直接由码位数组（UTF-32）错位拼接得到整数词键，
+英文/数字词由 Series.str.findall 一次取出，词表只在去重后的词上构建。词表
+按字典序编号，同一前缀的词编号连续，前缀匹配对应倒排表中的一整段，不需要
+逐词展开，也不会截断。
+"""
+
+import re
+from bisect import bisect_left
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+from .ingest import text_columns
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9][a-z0-9+#]*|[\u4e00-\u9fff]+')
+WORD_PATTERN = r'[a-z0-9][a-z0-9+#]*'
+CJK_FIRST, CJK_LAST = 0x4E00, 0x9FFF
+
+# 汉字切词时每块处理的字符数上限（码位数组约 12 字节/字符）
+CHUNK_CHARS = 4_000_000
+
+
+def tokenize(text):
+    """中文按字二元组（单个汉字原样保留）、英文/数字按词切分，统一小写"""
+    tokens = []
+    for word in TOKEN_PATTERN.findall(str(text).lower()):
+        if len(word) > 1 and '\u4e00' <= word[0] <= '\u9fff':
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+def _is_cjk_char(token):
+    return len(token) == 1 and '\u4e00' <= token <= '\u9fff'
+
+
+def _cjk_tokens(texts):
+    """汉字切词：返回 (行号, 词键)；二元组的词键为两个码位拼接（高 16 位为首字），单字为码位本身"""
+    values, lengths = texts.to_numpy(), texts.str.len().to_numpy()
+    ends = np.cumsum(lengths)
+    docs, keys, start = [], [], 0
+    while start < len(values):
+        # 每块至少一行，字符数不超过 CHUNK_CHARS
+        stop = max(int(np.searchsorted(ends, ends[start] - lengths[start] + CHUNK_CHARS, side='right')), start + 1)
+        cp = np.frombuffer(''.join(values[start:stop]).encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+        doc = np.repeat(np.arange(start, stop), lengths[start:stop])
+        cjk = (cp >= CJK_FIRST) & (cp <= CJK_LAST)
+        # 相邻两个汉字且属于同一行时构成二元组；两侧都不是二元组的汉字是单字
+        pair = cjk[:-1] & cjk[1:] & (doc[:-1] == doc[1:])
+        in_pair = np.append(pair, False) | np.insert(pair, 0, False)
+        single = cjk & ~in_pair
+        docs += [doc[:-1][pair], doc[single]]
+        keys += [(cp[:-1][pair].astype(np.int64) << 16) | cp[1:][pair], cp[single].astype(np.int64)]
+        start = stop
+    if not docs:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    return np.concatenate(docs), np.concatenate(keys)
+
+
+def _cjk_term(key):
+    return chr(key) if key < 0x10000 else chr(key >> 16) + chr(key & 0xFFFF)
+
+
+def _gather(offsets, ids):
+    """多个词的倒排表区间 [offsets[t], offsets[t+1]) 拼接成一个下标数组"""
+    starts, stops = offsets[ids], offsets[ids + 1]
+    lengths = stops - starts
+    return np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+
+
+class TextIndex:
+    """多个文本列上的 BM25 倒排索引，行位置与构建时的 DataFrame 对齐
+
+    fields 为 {列名: 权重}，词频与文档长度按权重累加（如标题权重高于描述）。
+    """
+
+    def __init__(self, df, fields, k1=1.2, b=0.75):
+        self.fields = dict(fields)
+        self.k1 = k1
+        self.b = b
+        self.index = df.index
+        self._vocab = {}
+        self._pending = df[list(self.fields)]
+
+    def __len__(self):
+        return len(self.index)
+
+    def build(self):
+        """构建倒排表（查询与更新时自动调用，已构建时直接返回）"""
+        if self._pending is not None:
+            terms, docs, tfs, self._lengths = self._postings(self._pending)
+            self._pending = None
+            self._set_postings(terms, docs, tfs)
+        return self
+
+    def _postings(self, df):
+        """切词：返回 (词编号, 行号, 加权词频) 三个数组与各行的加权长度"""
+        terms, docs, tfs = [], [], []
+        lengths = np.zeros(len(df))
+        for column, weight in self.fields.items():
+            texts = df[column].where(df[column].map(lambda x: isinstance(x, str)), '').str.lower()
+            cjk_docs, cjk_keys = _cjk_tokens(texts)
+            words = texts.str.findall(WORD_PATTERN)
+            word_docs = np.repeat(np.arange(len(texts)), words.str.len().to_numpy())
+            for field_docs, codes, uniques in [
+                    (cjk_docs, *pd.factorize(cjk_keys)),
+                    (word_docs, *pd.factorize(pd.Series(list(chain.from_iterable(words)), dtype=object)))]:
+                if len(codes) == 0:
+                    continue
+                names = map(_cjk_term, uniques.tolist()) if field_docs is cjk_docs else uniques
+                ids = np.fromiter((self._vocab.setdefault(t, len(self._vocab)) for t in names),
+                                  dtype=np.int64, count=len(uniques))
+                terms.append(ids[codes])
+                docs.append(field_docs)
+                tfs.append(np.full(len(codes), float(weight)))
+                lengths += weight * np.bincount(field_docs, minlength=len(df))
+        if not terms:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, np.zeros(0), lengths
+        return np.concatenate(terms), np.concatenate(docs), np.concatenate(tfs), lengths
+
+    def _set_postings(self, terms, docs, tfs):
+        # 词表按字典序重新编号，同一前缀的词编号连续；删除行后不再出现的词移出词表
+        present = np.bincount(terms, minlength=len(self._vocab)) > 0
+        self._sorted_terms = sorted(t for t, i in self._vocab.items() if present[i])
+        rank = np.full(len(self._vocab), -1, dtype=np.int64)
+        rank[[self._vocab[t] for t in self._sorted_terms]] = np.arange(len(self._sorted_terms))
+        self._vocab = {t: i for i, t in enumerate(self._sorted_terms)}
+        self._ending_with = None
+
+        # 同一行的同一个词出现多次或出现在多个字段时合并词频
+        width = max(len(self), 1)
+        keys = rank[terms] * width + docs
+        order = np.argsort(keys)
+        keys = keys[order]
+        starts = np.flatnonzero(np.diff(keys, prepend=-1))
+        tfs = np.add.reduceat(tfs[order], starts) if len(starts) else tfs[:0]
+        terms, docs = keys[starts] // width, keys[starts] % width
+
+        # 按词编号排序，每个词的倒排表落在 [offsets[t], offsets[t+1]) 区间
+        self._docs = docs
+        self._offsets = np.searchsorted(terms, np.arange(len(self._vocab) + 1))
+        self._doc_freq = np.diff(self._offsets)
+
+        # BM25 中只依赖倒排表本身的部分预先算好，查询时只需按行累加
+        n = len(self)
+        avg_length = self._lengths.mean() if n and self._lengths.sum() else 1.0
+        idf = np.log(1 + (n - self._doc_freq + 0.5) / (self._doc_freq + 0.5))
+        norm = self.k1 * (1 - self.b + self.b * self._lengths[docs] / avg_length)
+        self._scores = idf[terms] * tfs * (self.k1 + 1) / (tfs + norm)
+        self._tfs = tfs
+        self._terms = terms
+
+    def update(self, removed, added):
+        """按差量原地更新：删除行标签在 removed 中的行，在末尾追加 added（含文本列的 DataFrame）
+
+        只对新增行切词；行位置与 保留行在前、新增行在后 的 DataFrame 对齐，打分与重新构建一致。
+        """
+        keep = ~self.index.isin(removed)
+        if self._pending is not None:
+            # 尚未构建时只更新待切词的文本
+            self._pending = pd.concat([self._pending[keep], added[list(self.fields)]])
+            self.index = self._pending.index
+            return
+        new_positions = np.cumsum(keep) - 1
+        live = keep[self._docs]
+        terms, docs, tfs = self._terms[live], new_positions[self._docs[live]], self._tfs[live]
+
+        added_terms, added_docs, added_tfs, added_lengths = self._postings(added)
+        self.index = self.index[keep].append(added.index)
+        self._lengths = np.concatenate([self._lengths[keep], added_lengths])
+        self._set_postings(np.concatenate([terms, added_terms]),
+                           np.concatenate([docs, added_docs + int(keep.sum())]),
+                           np.concatenate([tfs, added_tfs]))
+
+    def _bigrams_ending_with(self, char):
+        """以 char 结尾、且首字不是 char 的二元组编号（首次查询单字时构建）"""
+        if self._ending_with is None:
+            ending = {}
+            for term, i in self._vocab.items():
+                if len(term) == 2 and term[0] != term[1] and _is_cjk_char(term[1]):
+                    ending.setdefault(term[1], []).append(i)
+            self._ending_with = {c: np.asarray(ids, dtype=np.int64) for c, ids in ending.items()}
+        return self._ending_with.get(char, np.zeros(0, dtype=np.int64))
+
+    def _hits(self, token, prefix):
+        """查询词命中的倒排表下标；prefix 时匹配所有以该词开头的词，单个汉字匹配所有含该字的词"""
+        if prefix or _is_cjk_char(token):
+            # 同一前缀的词编号连续，对应倒排表中的一整段
+            start = bisect_left(self._sorted_terms, token)
+            stop = bisect_left(self._sorted_terms, token + '\uffff')
+            hits = np.arange(self._offsets[start], self._offsets[stop])
+        else:
+            term = self._vocab.get(token)
+            hits = np.zeros(0, dtype=np.int64) if term is None else np.arange(self._offsets[term], self._offsets[term + 1])
+        if _is_cjk_char(token):
+            hits = np.concatenate([hits, _gather(self._offsets, self._bigrams_ending_with(token))])
+        return hits
+
+    def scores(self, query, prefix=True):
+        """每行的 BM25 得分与命中位图（所有查询词都命中为 True），空查询时全部命中、得分为 0"""
+        self.build()
+        n = len(self)
+        mask = np.ones(n, dtype=bool)
+        total = np.zeros(n)
+        tokens = list(dict.fromkeys(tokenize(query)))
+        for i, token in enumerate(tokens):
+            hits = self._hits(token, prefix and i == len(tokens) - 1)
+            if len(hits) == 0:
+                return np.zeros(n, dtype=bool), total
+            docs = self._docs[hits]
+            total += np.bincount(docs, weights=self._scores[hits], minlength=n)
+            hit = np.zeros(n, dtype=bool)
+            hit[docs] = True
+            mask &= hit
+        return mask, np.where(mask, total, 0.0)
+
+    def match(self, query):
+        """包含全部查询词的行（AND）"""
+        mask, _ = self.scores(query)
+        return pd.Series(mask, index=self.index)
+
+    def rank(self, positions, query):
+        """按相关度从高到低排列 positions（整表中的行位置），同分保持原顺序"""
+        positions = np.asarray(positions, dtype=np.int64)
+        _, total = self.scores(query)
+        return positions[np.argsort(-total[positions], kind='stable')]
+
+
+def substring_filter(df, fields, keywords):
+    """没有倒排索引时的回退：fields 各列拼接后包含全部关键词（忽略大小写、逐行子串匹配）
+
+    返回供 Conditions.add 使用的 evaluate(positions)，只读取剩余行的文本；
+    df 既没有这些列、也没有对应的文本库时抛出 ValueError，不会返回未筛选的结果。
+    """
+    fields = list(fields)
+    if text_columns(df, fields, np.empty(0, dtype=np.int64)) is None:
+        raise ValueError(f"数据中没有 {'/'.join(fields)} 文本列，无法按关键词筛选")
+    words = keywords.lower().split()
+
+    def evaluate(positions):
+        texts = text_columns(df, fields, positions)
+        text = texts[fields[0]].fillna('').astype(str)
+        for column in fields[1:]:
+            text = text + '\n' + texts[column].fillna('').astype(str)
+        text = text.str.lower()
+        hit = np.ones(len(text), dtype=bool)
+        for word in words:
+            hit &= text.str.contains(word, regex=False).to_numpy(dtype=bool)
+        return hit
+    return evaluate
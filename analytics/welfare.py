@@ -0,0 +1,61 @@
+"""
+福利关键词匹配
+
+侧边栏输入的福利关键词与福利标签互相包含即算命中（忽略大小写），并按
+WELFARE_MAPPING 的同义词扩展（输入“饭补”也能命中“餐补”）。加载时把每个
+标签的全部子串建成 子串 -> 标签 的字典：“关键词是标签的子串”一次查表即得；
+“标签是关键词的子串”则枚举关键词自身的子串查表。单个关键词的匹配耗时只与
+关键词长度有关，与标签数量无关。
+"""
+
+
+def _substrings(text):
+    return {text[i:j] for i in range(len(text)) for j in range(i + 1, len(text) + 1)}
+
+
+class _SubstringIndex:
+    """字符串集合上的双向包含查询"""
+
+    def __init__(self, strings):
+        self._exact = {}
+        self._containing = {}
+        for s in strings:
+            key = s.lower()
+            self._exact.setdefault(key, set()).add(s)
+            for sub in _substrings(key):
+                self._containing.setdefault(sub, set()).add(s)
+
+    def related(self, keyword):
+        """包含 keyword 或被 keyword 包含的字符串"""
+        keyword = keyword.lower()
+        result = set(self._containing.get(keyword, ()))
+        for sub in _substrings(keyword):
+            result |= self._exact.get(sub, set())
+        return result
+
+
+class WelfareMatcher:
+    """tags 为数据中出现过的福利标签，synonyms 为 {别名: 规范名}"""
+
+    def __init__(self, tags, synonyms=None):
+        self.tags = sorted(tags)
+        self._order = {tag: i for i, tag in enumerate(self.tags)}
+        self._tags = _SubstringIndex(self.tags)
+        self._synonyms = {alias.lower(): canonical for alias, canonical in (synonyms or {}).items()}
+        self._aliases = _SubstringIndex(self._synonyms)
+
+    def match(self, keyword):
+        """单个关键词命中的标签，按标签字典序排列"""
+        matched = self._tags.related(keyword)
+        for alias in self._aliases.related(keyword):
+            canonical = self._synonyms[alias.lower()]
+            if canonical.lower() != keyword.lower():
+                matched |= self._tags.related(canonical)
+        return sorted(matched, key=self._order.__getitem__)
+
+    def match_any(self, keywords):
+        """一组关键词（OR）命中的标签，按关键词顺序去重"""
+        matched = {}
+        for keyword in keywords:
+            matched.update(dict.fromkeys(self.match(keyword)))
+        return list(matched)
@@ -2,12 +2,16 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-import re
 import numpy as np
-from collections import Counter
 from datetime import datetime
-from wordcloud import WordCloud
-import matplotlib.pyplot as plt
+from analytics import LiveDataset, Selection, overview
+from analytics.agg_cache import AggregationCache, state_key
+from analytics.cube import CubeSlice
+from analytics.export import EXPORT_FORMATS, available_formats, export_bytes
+from chart_payload import plotly_chart
+from lazy_tabs import render_tabs
+from salary_charts import box_figure, histogram_figure
+from wordcloud_image import frequency_key, render_wordcloud_png
 
 # ============================================================================
 # 页面配置
@@ -44,139 +48,61 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # ============================================================================
-# 数据加载与清洗函数
+# 数据加载（清洗、筛选与聚合逻辑见 analytics.overview）
 # ============================================================================
-@st.cache_data
+# 聚合缓存的内存上限
+AGG_CACHE_BYTES = 64 * 1024 * 1024
+JOBS_PAGE_SIZE = 100
+
+@st.cache_resource
+def load_dataset(file_path):
+    """整表与共享索引（所有会话共享同一份只读数据，不逐会话复制）；源文件有新导出时增量刷新，索引按差量原地更新"""
+    return LiveDataset(overview, file_path)
+
 def load_and_clean_data():
-    """加载并清洗数据"""
-    df = None
-    
-    # 尝试多个可能的文件路径
-    possible_paths = [
-        '../Big_data_development_results.csv',  # 本地开发环境
-        'Big_data_development_results.csv',     # Streamlit Cloud
-        './Big_data_development_results.csv'    # 当前目录
-    ]
-    
-    # 尝试多种编码和路径读取CSV文件
-    for file_path in possible_paths:
-        for encoding in ['utf-8', 'gbk', 'gb18030', 'utf-8-sig']:
-            try:
-                df = pd.read_csv(file_path, encoding=encoding)
-                break
-            except FileNotFoundError:
-                continue
-            except Exception as e:
-                continue
-        if df is not None:
-            break
-    
-    # 如果所有编码和路径都失败
-    if df is None:
-        st.error("❌ 无法读取数据文件：Big_data_development_results.csv")
-        st.info("💡 请确保数据文件在项目根目录或上级目录中")
-        return None
-    
-    expected_cols = ['职位id', '职位标题', '薪资范围', '公司名称', '工作地点', 
-                     '所处行业', '学历要求', '每周天数', '实习时长', '福利待遇',
-                     '职位描述', '简历要求', '截止日期', '详细地址', '详情页url']
-    
-    if len(df.columns) == len(expected_cols):
-        df.columns = expected_cols
-    
-    # 薪资清洗
-    def parse_salary(salary_str):
-        try:
-            nums = re.findall(r'\d+', str(salary_str))
-            if len(nums) >= 2:
-                return int(nums[0]), int(nums[1])
-            elif len(nums) == 1:
-                return int(nums[0]), int(nums[0])
-            else:
-                return None, None
-        except:
-            return None, None
-    
-    df[['最低薪资', '最高薪资']] = df['薪资范围'].apply(lambda x: pd.Series(parse_salary(x)))
-    df['平均薪资'] = (df['最低薪资'] + df['最高薪资']) / 2
-    df['平均薪资'] = df['平均薪资'].fillna(0).astype(int)
-    
-    # 城市提取
-    df['城市'] = df['工作地点'].astype(str).apply(
-        lambda x: x.split('-')[0] if '-' in x else x.split('·')[0] if '·' in x else x
-    )
-    
-    # 技能提取
-    TECH_KEYWORDS = ['Hadoop', 'Spark', 'Flink', 'Python', 'Java', 'SQL', 'Kafka', 
-                     'Hive', 'HBase', 'Scala', 'ETL', 'MySQL', 'Redis', 'Elasticsearch',
-                     'Docker', 'Kubernetes', 'Linux', 'Shell', 'ClickHouse',
-                     '数据仓库', '数据湖', '实时计算', '离线计算', 'MapReduce', 'HDFS']
-    
-    def extract_skills(desc):
-        if pd.isna(desc):
-            return []
-        desc_upper = str(desc).upper()
-        return [skill for skill in TECH_KEYWORDS if skill.upper() in desc_upper]
-    
-    df['技能标签'] = df['职位描述'].apply(extract_skills)
-    
-    # 学历标准化
-    def standardize_education(edu):
-        edu_str = str(edu).lower()
-        if '博士' in edu_str:
-            return '博士'
-        elif '硕士' in edu_str or '研究生' in edu_str:
-            return '硕士'
-        elif '本科' in edu_str or '学士' in edu_str:
-            return '本科'
-        elif '大专' in edu_str or '专科' in edu_str:
-            return '大专'
-        else:
-            return '不限'
-    
-    df['学历分类'] = df['学历要求'].apply(standardize_education)
-    
-    # 实习时长分类
-    def classify_duration(duration):
-        duration_str = str(duration)
-        if '3' in duration_str and '月' in duration_str:
-            return '3个月'
-        elif '6' in duration_str and '月' in duration_str:
-            return '6个月'
-        elif '长期' in duration_str or '灵活' in duration_str:
-            return '长期实习'
-        else:
-            return '其他'
-    
-    df['实习时长分类'] = df['实习时长'].apply(classify_duration)
-    
-    # 福利标签提取
-    def extract_welfare(welfare_str):
-        if pd.isna(welfare_str):
-            return []
-        tags = re.split(r'[,，;；、\s]+', str(welfare_str))
-        return [tag.strip() for tag in tags if tag.strip()]
-    
-    df['福利标签'] = df['福利待遇'].apply(extract_welfare)
-    
-    # 删除无效数据
-    df = df[(df['平均薪资'] > 0) & (df['城市'].notna()) & (df['城市'] != '')]
-    
-    return df
+    """加载并清洗数据（优先读取清洗结果快照），返回 (整表, 索引)"""
+    file_path = overview.find_data_file()
+    if file_path is None:
+        return None, None
+    try:
+        return load_dataset(file_path).current()
+    except (FileNotFoundError, pd.errors.ParserError, UnicodeDecodeError):
+        # 只把文件本身读不出来视为“无法读取数据文件”，清洗、快照或索引的错误照常抛出
+        return None, None
+
+@st.cache_resource
+def get_aggregation_cache():
+    """按筛选状态缓存筛选结果与聚合数据（所有会话共享）"""
+    return AggregationCache(max_bytes=AGG_CACHE_BYTES)
 
 # 加载数据
 with st.spinner('🔄 正在加载数据...'):
-    df = load_and_clean_data()
+    df, indexes = load_and_clean_data()
 
-if df is None or df.empty:
+# 如果所有编码和路径都失败
+if df is None:
+    st.error("❌ 无法读取数据文件：Big_data_development_results.csv")
+    st.info("💡 请确保数据文件在项目根目录或上级目录中")
     st.stop()
 
+if df.empty:
+    st.stop()
+
+agg_cache = get_aggregation_cache()
+
 # ============================================================================
 # 侧边栏筛选器
 # ============================================================================
 st.sidebar.title("🔍 数据筛选器")
 st.sidebar.markdown("---")
 
+# 关键词搜索（标题与描述的全文检索，缺少文本列时不显示）
+search_query = ''
+if indexes.text is not None:
+    st.sidebar.subheader("🔎 关键词搜索")
+    search_query = st.sidebar.text_input("搜索职位标题与描述", placeholder="如：数据开发 flink",
+                                         help="多个关键词以空格分隔，需同时命中；最后一个词按前缀匹配，单个汉字匹配所有含该字的词").strip()
+
 # 城市筛选
 st.sidebar.subheader("📍 工作城市")
 all_cities = sorted(df['城市'].unique().tolist())
@@ -199,10 +125,7 @@ selected_edu = st.sidebar.multiselect("选择学历", all_edu, default=all_edu)
 
 # 技能筛选
 st.sidebar.subheader("💻 技能要求")
-all_skills = []
-for skills in df['技能标签']:
-    all_skills.extend(skills)
-unique_skills = sorted(list(set(all_skills)))
+unique_skills = sorted(indexes.skills.tags)
 selected_skills = st.sidebar.multiselect("选择技能（AND逻辑）", unique_skills, default=[])
 
 # 实习时长筛选
@@ -212,43 +135,38 @@ selected_durations = st.sidebar.multiselect("选择时长", all_durations, defau
 
 # 福利筛选
 st.sidebar.subheader("🎁 福利待遇")
-all_welfare = []
-for welfare in df['福利标签']:
-    all_welfare.extend(welfare)
-unique_welfare = sorted(list(set(all_welfare)))[:20]
+unique_welfare = sorted(indexes.welfare.tags)[:20]
 selected_welfare = st.sidebar.multiselect("选择福利", unique_welfare, default=[])
 
 st.sidebar.markdown("---")
 st.sidebar.info("💡 提示：所有筛选条件为 AND 关系")
+lazy_tabs = st.sidebar.checkbox("⚡ 仅计算当前标签页", value=True,
+                                help="关闭后恢复一次性渲染全部标签页")
 
 # ============================================================================
 # 应用筛选
 # ============================================================================
-filtered_df = df.copy()
-
-if selected_cities:
-    filtered_df = filtered_df[filtered_df['城市'].isin(selected_cities)]
+# 同一组筛选条件只计算一次，之后的图表聚合都以该 key 缓存
+criteria = dict(cities=selected_cities, salary_range=salary_range, education=selected_edu,
+                durations=selected_durations, skills=selected_skills, welfare=selected_welfare,
+                keywords=search_query)
+filter_key = state_key(data=df.attrs.get('data_key'), **criteria)
 
-if selected_edu:
-    filtered_df = filtered_df[filtered_df['学历分类'].isin(selected_edu)]
+def cached(name, compute):
+    """当前筛选状态下的聚合结果缓存（取回的对象为共享只读）"""
+    return agg_cache.get_or_compute(filter_key, name, compute)
 
-if selected_durations:
-    filtered_df = filtered_df[filtered_df['实习时长分类'].isin(selected_durations)]
+# 筛选结果只是命中行的位置数组，图表需要哪几列才按位置取哪几列
+positions = cached('rows', lambda: overview.filter(df, indexes, **criteria))
+selection = Selection(df, positions, None, indexes)
 
-filtered_df = filtered_df[
-    (filtered_df['平均薪资'] >= salary_range[0]) &
-    (filtered_df['平均薪资'] <= salary_range[1])
-]
+# 城市/学历/时长/薪资相关的 KPI 与图表都由立方体切片计算
+selection.view = CubeSlice(cached('cube', lambda: overview.slice_view(indexes, selection, **criteria).cells),
+                           overview.MEASURE)
 
-if selected_skills:
-    filtered_df = filtered_df[
-        filtered_df['技能标签'].apply(lambda x: all(skill in x for skill in selected_skills))
-    ]
-
-if selected_welfare:
-    filtered_df = filtered_df[
-        filtered_df['福利标签'].apply(lambda x: any(w in x for w in selected_welfare))
-    ]
+def aggregate(name):
+    """当前筛选状态下名为 name 的图表聚合"""
+    return cached(name, lambda: overview.aggregate(name, selection))
 
 # ============================================================================
 # 主界面
@@ -256,54 +174,47 @@ if selected_welfare:
 st.title("📊 大数据开发实习岗位分析平台")
 st.markdown("### 🎯 帮助学生、求职者、高校就业指导中心、企业HR快速了解市场趋势")
 
-if filtered_df.empty:
+if len(selection) == 0:
     st.warning("⚠️ 当前筛选条件下没有数据，请调整筛选条件")
     st.stop()
 
 # KPI 指标卡
+kpi = aggregate('kpi')
 col1, col2, col3, col4, col5 = st.columns(5)
 with col1:
-    st.metric("📋 岗位总数", f"{len(filtered_df)}")
+    st.metric("📋 岗位总数", f"{kpi['jobs']}")
 with col2:
-    st.metric("💰 平均日薪", f"¥{filtered_df['平均薪资'].mean():.0f}")
+    st.metric("💰 平均日薪", f"¥{kpi['avg_salary']:.0f}")
 with col3:
-    st.metric("🏢 招聘企业", f"{filtered_df['公司名称'].nunique()}")
+    st.metric("🏢 招聘企业", f"{kpi['companies']}")
 with col4:
-    st.metric("🌆 覆盖城市", f"{filtered_df['城市'].nunique()}")
+    st.metric("🌆 覆盖城市", f"{kpi['cities']}")
 with col5:
-    top_city = filtered_df['城市'].mode()[0] if len(filtered_df) > 0 else "无"
-    st.metric("🔥 最热城市", top_city)
+    st.metric("🔥 最热城市", kpi['top_city'])
 
 st.markdown("---")
 
-# Tab 布局
-tab1, tab2, tab3, tab4, tab5 = st.tabs([
-    "📊 综合概览", "💰 薪资分析", "🗺️ 地域分布", "💻 技能需求", "📋 岗位列表"
-])
-
 # Tab 1: 综合概览
-with tab1:
+def render_overview_tab():
     st.subheader("📈 综合数据概览")
     
     col_a, col_b = st.columns(2)
     
     with col_a:
         st.markdown("#### 🎓 学历要求分布")
-        edu_counts = filtered_df['学历分类'].value_counts().reset_index()
-        edu_counts.columns = ['学历', '数量']
+        edu_counts = aggregate('edu_counts')
         fig_edu = px.pie(edu_counts, values='数量', names='学历', hole=0.4,
                          color_discrete_sequence=px.colors.qualitative.Set3)
         fig_edu.update_traces(textposition='inside', textinfo='percent+label')
-        st.plotly_chart(fig_edu, use_container_width=True)
+        plotly_chart(fig_edu)
     
     with col_b:
         st.markdown("#### ⏰ 实习时长分布")
-        duration_counts = filtered_df['实习时长分类'].value_counts().reset_index()
-        duration_counts.columns = ['时长', '数量']
+        duration_counts = aggregate('duration_counts')
         fig_duration = px.bar(duration_counts, x='数量', y='时长', orientation='h',
                              color='数量', color_continuous_scale='Viridis', text='数量')
         fig_duration.update_layout(showlegend=False)
-        st.plotly_chart(fig_duration, use_container_width=True)
+        plotly_chart(fig_duration)
     
     st.markdown("---")
     
@@ -311,159 +222,167 @@ with tab1:
     
     with col_c:
         st.markdown("#### 🏢 发布岗位最多的公司 TOP10")
-        company_counts = filtered_df['公司名称'].value_counts().head(10).reset_index()
-        company_counts.columns = ['公司', '岗位数']
+        company_counts = aggregate('company_counts')
         fig_company = px.bar(company_counts, x='岗位数', y='公司', orientation='h',
                             color='岗位数', color_continuous_scale='Blues', text='岗位数')
         fig_company.update_layout(yaxis={'categoryorder':'total ascending'})
-        st.plotly_chart(fig_company, use_container_width=True)
+        plotly_chart(fig_company)
     
     with col_d:
         st.markdown("#### 🏭 行业分布 TOP10")
-        industry_counts = filtered_df['所处行业'].value_counts().head(10).reset_index()
-        industry_counts.columns = ['行业', '数量']
+        industry_counts = aggregate('industry_counts')
         fig_industry = px.bar(industry_counts, x='数量', y='行业', orientation='h',
                              color='数量', color_continuous_scale='Reds', text='数量')
         fig_industry.update_layout(yaxis={'categoryorder':'total ascending'})
-        st.plotly_chart(fig_industry, use_container_width=True)
+        plotly_chart(fig_industry)
 
 # Tab 2: 薪资分析
-with tab2:
+def render_salary_tab():
     st.subheader("💰 薪资深度分析")
     
     col_s1, col_s2 = st.columns(2)
     
     with col_s1:
         st.markdown("#### 📊 薪资分布直方图")
-        fig_hist = px.histogram(filtered_df, x='平均薪资', nbins=40,
-                               color_discrete_sequence=['#667eea'],
-                               labels={'平均薪资': '日薪（元/天）', 'count': '岗位数量'})
-        fig_hist.add_vline(x=filtered_df['平均薪资'].median(), line_dash="dash",
-                          line_color="red", annotation_text=f"中位数: ¥{filtered_df['平均薪资'].median():.0f}")
-        st.plotly_chart(fig_hist, use_container_width=True)
+        # 分箱计数在服务端由立方体算好
+        fig_hist = histogram_figure(aggregate('salary_histogram'), '#667eea', '日薪（元/天）')
+        salary_median = aggregate('salary_median')
+        fig_hist.add_vline(x=salary_median, line_dash="dash",
+                          line_color="red", annotation_text=f"中位数: ¥{salary_median:.0f}")
+        plotly_chart(fig_hist)
     
     with col_s2:
         st.markdown("#### 📦 薪资箱线图")
-        fig_box = px.box(filtered_df, y='平均薪资', points='all',
-                        color_discrete_sequence=['#764ba2'],
-                        labels={'平均薪资': '日薪（元/天）'})
-        st.plotly_chart(fig_box, use_container_width=True)
+        fig_box = box_figure(aggregate('salary_box'), colors=['#764ba2'])
+        fig_box.update_layout(yaxis_title='日薪（元/天）', showlegend=False)
+        plotly_chart(fig_box)
     
     st.markdown("---")
     
     st.markdown("#### 🎓 不同学历薪资对比")
-    fig_edu_salary = px.box(filtered_df, x='学历分类', y='平均薪资', color='学历分类',
-                            labels={'平均薪资': '日薪（元/天）', '学历分类': '学历要求'})
-    st.plotly_chart(fig_edu_salary, use_container_width=True)
+    fig_edu_salary = box_figure(aggregate('edu_salary_box'))
+    fig_edu_salary.update_layout(xaxis_title='学历要求', yaxis_title='日薪（元/天）', legend_title_text='学历分类')
+    plotly_chart(fig_edu_salary)
     
     st.markdown("#### 📋 薪资统计摘要")
-    salary_stats = filtered_df['平均薪资'].describe().to_frame()
-    salary_stats.columns = ['统计值']
-    salary_stats.index = ['数量', '平均值', '标准差', '最小值', '25%分位', '中位数', '75%分位', '最大值']
-    st.table(salary_stats)
+    st.table(aggregate('salary_stats'))
 
 # Tab 3: 地域分布
-with tab3:
+def render_region_tab():
     st.subheader("🗺️ 地域分布分析")
     
     col_g1, col_g2 = st.columns(2)
     
     with col_g1:
         st.markdown("#### 📍 城市岗位数量 TOP15")
-        city_counts = filtered_df['城市'].value_counts().head(15).reset_index()
-        city_counts.columns = ['城市', '岗位数']
+        city_counts = aggregate('city_counts')
         fig_city = px.bar(city_counts, x='城市', y='岗位数', color='岗位数',
                          color_continuous_scale='Teal', text='岗位数')
-        st.plotly_chart(fig_city, use_container_width=True)
+        plotly_chart(fig_city)
     
     with col_g2:
         st.markdown("#### 💰 城市平均薪资 TOP15")
-        city_salary = filtered_df.groupby('城市')['平均薪资'].mean().sort_values(ascending=False).head(15).reset_index()
-        city_salary.columns = ['城市', '平均薪资']
+        city_salary = aggregate('city_salary')
         fig_city_sal = px.bar(city_salary, x='城市', y='平均薪资', color='平均薪资',
                              color_continuous_scale='Oranges', text='平均薪资')
         fig_city_sal.update_traces(texttemplate='¥%{text:.0f}', textposition='outside')
-        st.plotly_chart(fig_city_sal, use_container_width=True)
+        plotly_chart(fig_city_sal)
     
     st.markdown("---")
     
     st.markdown("#### 🌆 主要城市薪资分布对比")
-    top_cities = filtered_df['城市'].value_counts().head(10).index
-    df_top_cities = filtered_df[filtered_df['城市'].isin(top_cities)]
-    fig_city_box = px.box(df_top_cities, x='城市', y='平均薪资', color='城市',
-                          labels={'平均薪资': '日薪（元/天）'})
-    st.plotly_chart(fig_city_box, use_container_width=True)
+    fig_city_box = box_figure(aggregate('city_salary_box'))
+    fig_city_box.update_layout(xaxis_title='城市', yaxis_title='日薪（元/天）', legend_title_text='城市')
+    plotly_chart(fig_city_box)
 
 # Tab 4: 技能需求
-with tab4:
+def render_skill_tab():
     st.subheader("💻 技能需求分析")
     
-    all_skills_list = []
-    for skills in filtered_df['技能标签']:
-        all_skills_list.extend(skills)
+    skill_counts = aggregate('skill_counts')
     
-    if all_skills_list:
-        skill_counter = Counter(all_skills_list)
-        
+    if not skill_counts.empty:
         col_t1, col_t2 = st.columns(2)
         
         with col_t1:
             st.markdown("#### 📈 技能需求排行榜 TOP20")
-            skill_df = pd.DataFrame(skill_counter.most_common(20), columns=['技能', '需求次数'])
+            skill_df = pd.DataFrame({'技能': skill_counts.index[:20], '需求次数': skill_counts.values[:20]})
             fig_skill = px.bar(skill_df, x='需求次数', y='技能', orientation='h',
                               color='需求次数', color_continuous_scale='Viridis', text='需求次数')
             fig_skill.update_layout(yaxis={'categoryorder':'total ascending'})
-            st.plotly_chart(fig_skill, use_container_width=True)
+            plotly_chart(fig_skill)
         
         with col_t2:
             st.markdown("#### ☁️ 技能词云")
-            fig_wc, ax = plt.subplots(figsize=(10, 8))
-            wordcloud = WordCloud(width=800, height=600, background_color='white',
-                                 colormap='viridis', relative_scaling=0.5,
-                                 min_font_size=12).generate_from_frequencies(skill_counter)
-            ax.imshow(wordcloud, interpolation='bilinear')
-            ax.axis('off')
-            st.pyplot(fig_wc)
+            preview = st.checkbox("低分辨率快速预览", value=False, key="wordcloud_preview",
+                                  help="调整筛选条件时先用小尺寸词云，出图更快")
+            # 以技能频次向量为键缓存 PNG，相同结果不重复生成
+            st.image(render_wordcloud_png(frequency_key(skill_counts), preview=preview),
+                     use_container_width=True)
         
         st.markdown("---")
         
         st.markdown("#### 🔗 常见技能组合 TOP10")
-        skill_combos = filtered_df['技能标签'].apply(
-            lambda x: ', '.join(sorted(x)) if len(x) > 1 else None
-        ).dropna()
-        
-        if not skill_combos.empty:
-            combo_counts = skill_combos.value_counts().head(10).reset_index()
-            combo_counts.columns = ['技能组合', '出现次数']
+        combo_counts = aggregate('skill_combos')
+        if not combo_counts.empty:
             st.table(combo_counts)
     else:
         st.info("当前筛选条件下未提取到技能标签")
 
 # Tab 5: 岗位列表
-with tab5:
+def render_jobs_tab():
     st.subheader("📋 岗位详情列表")
-    st.info(f"📊 当前筛选条件下共有 **{len(filtered_df)}** 个岗位")
-    
-    display_df = filtered_df.copy()
-    display_df['技能'] = display_df['技能标签'].apply(lambda x: ', '.join(x[:5]) if x else '未提取')
-    display_df['福利'] = display_df['福利标签'].apply(lambda x: ', '.join(x[:3]) if x else '未提取')
-    
-    show_cols = ['职位标题', '公司名称', '城市', '平均薪资', '学历分类', 
-                 '实习时长分类', '技能', '福利', '详情页url']
-    
-    # 使用 st.table 显示（更稳定）
-    st.dataframe(display_df[show_cols].head(100), use_container_width=True, hide_index=True)
+    st.info(f"📊 当前筛选条件下共有 **{len(selection)}** 个岗位")
+    
+    col_sort, col_order, col_page = st.columns(3)
+    with col_sort:
+        sort_options = ['默认'] + (['相关度'] if search_query else []) + list(overview.SORT_COLUMNS)
+        sort_label = st.selectbox("排序方式", sort_options, key='jobs_sort')
+    with col_order:
+        ascending = st.radio("顺序", ['降序', '升序'], horizontal=True, key='jobs_order') == '升序'
+    sort_column = overview.SORT_COLUMNS.get(sort_label)
+    
+    # 排序结果按筛选状态缓存，取自整表预排序（相关度取自全文检索打分），不对筛选结果重新排序
+    def sorted_positions():
+        if sort_label == '相关度':
+            ranked = indexes.text.rank(selection.positions, search_query)
+            return ranked[::-1] if ascending else ranked
+        return indexes.sort.order(selection.positions, sort_column, ascending)
+    order = cached(f'order:{sort_label}:{ascending}', sorted_positions)
+    # 标签列只在取出的当前页上拼接
+    table = overview.table(df, order)
+    
+    with col_page:
+        page_count = table.page_count(JOBS_PAGE_SIZE)
+        page_number = st.number_input(f"页码 (共 {page_count} 页)", min_value=1, max_value=page_count,
+                                      value=1, step=1)
+    
+    st.dataframe(table.page(page_number, JOBS_PAGE_SIZE), use_container_width=True, hide_index=True)
     
     st.markdown("---")
     st.markdown("#### 📥 导出数据")
     
-    csv = display_df[show_cols].to_csv(index=False, encoding='utf-8-sig')
-    st.download_button(
-        label="📥 下载筛选后的岗位数据（CSV）",
-        data=csv,
-        file_name=f"大数据开发岗位_{datetime.now().strftime('%Y%m%d')}.csv",
-        mime="text/csv"
-    )
+    # 导出文件只在点击生成后按块写出，同一筛选状态、格式和排序只生成一次
+    export_format = st.selectbox("导出格式", available_formats(), key='jobs_export_format')
+    export_name = f'export:{export_format}:{sort_label}:{ascending}'
+    if st.button("⚙️ 生成导出文件", key='jobs_export_prepare'):
+        st.session_state['jobs_export'] = (filter_key, export_name)
+    
+    if st.session_state.get('jobs_export') == (filter_key, export_name):
+        extension, mime = EXPORT_FORMATS[export_format]
+        st.download_button(
+            label=f"📥 下载筛选后的岗位数据（{export_format}）",
+            data=cached(export_name, lambda: export_bytes(table.chunks(), export_format)),
+            file_name=f"大数据开发岗位_{datetime.now().strftime('%Y%m%d')}{extension}",
+            mime=mime
+        )
+
+# Tab 布局（懒加载模式下只计算当前标签页）
+render_tabs(
+    ["📊 综合概览", "💰 薪资分析", "🗺️ 地域分布", "💻 技能需求", "📋 岗位列表"],
+    [render_overview_tab, render_salary_tab, render_region_tab, render_skill_tab, render_jobs_tab],
+    lazy=lazy_tabs
+)
 
 # 页脚
 st.markdown("---")
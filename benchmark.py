@@ -0,0 +1,331 @@
+"""
+加载 → 清洗 → 筛选 → 聚合 流水线基准测试
+
+以 Big_data_development_results.csv 为样本合成指定行数的数据集，对两个数据集
+（jobs 对应 shixiseng.py，overview 对应 app.py）分别计时各清洗步骤、增量导入、
+索引构建、筛选路径和图表聚合，结果写成 JSON，可与基线比较。
+
+用法：
+    python benchmark.py --sizes 1k,100k --output bench.json
+    python benchmark.py --sizes 1k,100k --baseline bench.json --tolerance 0.25
+    python benchmark.py --sizes 100k --workers 4
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from analytics import Selection, jobs, overview
+from analytics.categories import category_counts, encode_categoricals
+from analytics.cities import CityNormalizer, gazetteer_aliases
+from analytics.cube import OlapCube
+from analytics.export import export_bytes
+from analytics.incremental import build_manifest, content_hashes, refresh
+from analytics.pagination import SortIndex
+from analytics.parallel import clean_parallel
+from analytics.salary import parse_salary_range
+from analytics.tag_index import TagIndex
+from analytics.text_index import TextIndex
+from analytics.welfare import WelfareMatcher
+from chart_payload import downsample, payload_size
+
+SOURCE_PATH = 'Big_data_development_results.csv'
+SIZES = {'1k': 1_000, '100k': 100_000, '1m': 1_000_000, '10m': 10_000_000}
+
+# 同组的列按同一行整体抽样，保持字段之间的对应关系；不同组之间独立抽样
+COLUMN_GROUPS = [
+    ['职位标题', '职位描述', '简历要求'],
+    ['公司名称', '所处行业', '福利待遇'],
+    ['工作地点', '详细地址'],
+    ['薪资范围'],
+    ['学历要求'],
+    ['每周天数'],
+    ['实习时长'],
+    ['截止日期'],
+]
+
+# 单步耗时低于该值时不参与回归判断（计时噪声）
+MIN_REGRESSION_SECONDS = 0.005
+
+
+def parse_size(text):
+    """'100k' / '1m' / '2500' -> 行数"""
+    text = text.strip().lower()
+    if text in SIZES:
+        return SIZES[text]
+    for suffix, factor in (('k', 1_000), ('m', 1_000_000)):
+        if text.endswith(suffix):
+            return int(float(text[:-1]) * factor)
+    return int(text)
+
+
+def synthesize(source, rows, seed=0):
+    """按样本各列组的经验分布抽样出 rows 行，职位 id 与详情页保持唯一"""
+    rng = np.random.default_rng(seed)
+    data = {}
+    for group in COLUMN_GROUPS:
+        picks = rng.integers(0, len(source), size=rows)
+        for column in group:
+            data[column] = source[column].to_numpy()[picks]
+    df = pd.DataFrame(data)
+    ids = pd.Series(np.arange(rows)).map(lambda i: f"syn_{i:010d}")
+    df.insert(0, '职位id', ids)
+    df['详情页url'] = 'https://www.shixiseng.com/intern/' + ids
+    return df[source.columns]
+
+
+def city_normalizer():
+    """每次计时新建归一器，不复用上一次的记忆表"""
+    return CityNormalizer(gazetteer_aliases())
+
+
+def jobs_clean_steps(matcher):
+    """jobs.clean 的各个步骤：{步骤名: 接收原始数据的函数}"""
+    return {
+        'parse_salary_range': lambda raw: parse_salary_range(raw['薪资范围']),
+        'clean_days_per_week': lambda raw: raw['每周天数'].apply(jobs.clean_days_per_week),
+        'clean_duration': lambda raw: raw['实习时长'].apply(jobs.clean_duration).apply(jobs.extract_duration_months),
+        'normalize_city': lambda raw: city_normalizer().normalize_series(raw['工作地点']),
+        'extract_skills': lambda raw: matcher.extract_series(raw['职位描述']),
+        'extract_welfare_tags': lambda raw: raw['福利待遇'].apply(jobs.extract_welfare_tags),
+        'parse_deadline': lambda raw: pd.to_datetime(raw['截止日期'], errors='coerce'),
+    }
+
+
+def overview_clean_steps(matcher):
+    """overview.clean 的各个步骤"""
+    return {
+        'parse_salary_range': lambda raw: parse_salary_range(raw['薪资范围']),
+        'normalize_city': lambda raw: city_normalizer().normalize_series(raw['工作地点']),
+        'extract_skills': lambda raw: matcher.extract_series(raw['职位描述']),
+        'standardize_education': lambda raw: raw['学历要求'].apply(overview.standardize_education),
+        'classify_duration': lambda raw: raw['实习时长'].apply(overview.classify_duration),
+        'extract_welfare': lambda raw: raw['福利待遇'].apply(overview.extract_welfare),
+    }
+
+
+def time_clean_steps(t, raw, steps, df, categorical_columns):
+    """逐步计时清洗，再计时分类编码（在还原为普通列的清洗结果上）"""
+    for step, func in steps.items():
+        t('clean', step, lambda func=func: func(raw))
+    decoded = df.astype({column: object for column in categorical_columns})
+    t('clean', 'encode_categoricals', lambda: encode_categoricals(decoded.copy(), categorical_columns))
+
+
+class Recorder:
+    """重复执行并记录每一步的耗时"""
+
+    def __init__(self, repeat):
+        self.repeat = repeat
+        self.results = []
+
+    def time(self, size, group, step, func, dataset='jobs'):
+        timings, result = [], None
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            result = func()
+            timings.append(time.perf_counter() - start)
+        self.results.append({
+            'dataset': dataset, 'size': size, 'group': group, 'step': step,
+            'median_seconds': statistics.median(timings),
+            'min_seconds': min(timings),
+            'repeat': self.repeat,
+        })
+        print(f"{dataset:<9} {size:>10,} {group:<11} {step:<28} {statistics.median(timings) * 1000:>12.2f} ms",
+              file=sys.stderr)
+        return result
+
+
+def run_size(recorder, source, rows, workdir, workers=1):
+    """对一个数据规模跑完整条流水线"""
+    raw = synthesize(source, rows)
+    csv_path = os.path.join(workdir, f"synthetic_{rows}.csv")
+    raw.to_csv(csv_path, index=False)
+    matcher = jobs.default_skill_matcher()
+    t = lambda group, step, func: recorder.time(rows, group, step, func)  # noqa: E731
+
+    # 加载与清洗
+    raw = t('load', 'read_csv', lambda: pd.read_csv(csv_path))
+    df = t('clean', 'clean', lambda: jobs.clean(raw.copy(), matcher))
+    time_clean_steps(t, raw, jobs_clean_steps(matcher), df, jobs.CATEGORICAL_COLUMNS)
+    if workers > 1:
+        t('clean', f'clean_parallel_{workers}', lambda: clean_parallel(
+            raw.copy(), partial(jobs.clean, skill_matcher=matcher), jobs.CATEGORICAL_COLUMNS, workers))
+
+    # 共享索引
+    t('index', 'skill_index', lambda: TagIndex(df['matched_skills']))
+    t('index', 'welfare_index', lambda: TagIndex(df['welfare_tags']))
+    t('index', 'cube', lambda: OlapCube(df, jobs.CUBE_DIMENSIONS, jobs.MEASURE))
+    t('index', 'sort_index', lambda: SortIndex(df, jobs.SORT_COLUMNS.values()))
+    t('index', 'text_index', lambda: TextIndex(df, jobs.TEXT_FIELDS).build())
+    indexes = t('index', 'build_indexes', lambda: jobs.build_indexes(df))
+    t('index', 'welfare_matcher', lambda: WelfareMatcher(indexes.welfare.tags, jobs.WELFARE_MAPPING))
+
+    # 增量导入：1% 的岗位内容变化，只重新清洗变化的行
+    hashes = t('incremental', 'content_hashes', lambda: content_hashes(raw))
+    manifest = build_manifest(raw.index.to_numpy(), raw[jobs.ID_COLUMN].astype(str).to_numpy(), hashes, df.index)
+    changed = raw.copy()
+    changed.loc[changed.index[::100], '薪资范围'] = '300-400/天'
+    t('incremental', 'refresh_1pct', lambda: refresh(df, manifest, changed, partial(jobs.clean, skill_matcher=matcher),
+                                                    jobs.CATEGORICAL_COLUMNS, jobs.ID_COLUMN))
+
+    # 筛选路径
+    salary = (int(df['avg_salary'].min()), int(df['avg_salary'].max()))
+    top_cities = category_counts(df['城市']).head(3).index.tolist()
+    top_skills = indexes.skills.counts().head(2).index.tolist()
+    top_welfare = indexes.welfare.counts().head(3).index.tolist()
+    duration = df['实习时长'].cat.categories[min(2, len(df['实习时长'].cat.categories) - 1)]
+    paths = {
+        'none': dict(salary_range=salary),
+        'city': dict(cities=top_cities, salary_range=salary),
+        'education_duration': dict(education='本科', duration=duration, salary_range=salary),
+        'salary': dict(salary_range=(150, 300)),
+        'skills': dict(salary_range=salary, skills=top_skills),
+        'welfare': dict(salary_range=salary, welfare=top_welfare),
+        'keywords': dict(salary_range=salary, keywords='数据开发 py'),
+        'combined': dict(cities=top_cities, education='本科', duration=duration, salary_range=(150, 300),
+                         skills=top_skills[:1], welfare=top_welfare),
+    }
+    filtered = {}
+    for name, criteria in paths.items():
+        filtered[name] = t('filter', name, lambda criteria=criteria: jobs.filter(df, indexes, **criteria))
+    t('filter', 'welfare_keywords', lambda: indexes.welfare_matcher.match_any(['转正', '五险一金', '饭补']))
+    dimension_only = dict(cities=top_cities, education='本科', duration=duration, salary_range=(150, 300))
+    t('filter', 'cube_slice', lambda: jobs.slice_view(indexes, None, **dimension_only))
+
+    # 图表聚合（以城市筛选后的结果为例）
+    positions = filtered['city']
+    selection = Selection(df, positions, None, indexes)
+    selection.view = t('aggregate', 'cube_view', lambda: jobs.slice_view(indexes, selection, **paths['city']))
+    for name in jobs.AGGREGATIONS:
+        t('aggregate', name, lambda name=name: jobs.aggregate(name, selection))
+    t('aggregate', 'materialize_rows', lambda: df.take(positions))
+    t('aggregate', 'recommend_legacy', lambda: jobs.recommend(df.take(positions)))
+    t('aggregate', 'recommend_top_k', lambda: indexes.recommender.top(positions, 10, jobs.RECOMMEND_WEIGHTS,
+                                                                      top_skills))
+    order = t('aggregate', 'sort_order', lambda: indexes.sort.order(positions, 'avg_salary', False))
+    table = jobs.table(df, order)
+    t('aggregate', 'table_page', lambda: table.page(1, 50))
+    t('aggregate', 'export_csv', lambda: export_bytes(table.chunks(), 'CSV'))
+
+    # 图表载荷：逐行散点超过上限时的抽样
+    points = lambda: go.Figure(go.Scatter(x=df['城市'].to_numpy(), y=df['avg_salary'].to_numpy(), mode='markers'))  # noqa: E731
+    figure = points()
+    t('render', 'payload_estimate', lambda: payload_size(figure))
+    t('render', 'downsample_scatter', lambda: downsample(points()))
+
+    run_overview(recorder, raw, rows)
+
+
+def run_overview(recorder, raw, rows):
+    """综合看板（overview）数据集的清洗、索引、筛选与聚合"""
+    matcher = overview.default_skill_matcher()
+    t = lambda group, step, func: recorder.time(rows, group, step, func, 'overview')  # noqa: E731
+
+    df = t('clean', 'clean', lambda: overview.clean(raw.copy(), matcher))
+    time_clean_steps(t, raw, overview_clean_steps(matcher), df, overview.CATEGORICAL_COLUMNS)
+
+    indexes = t('index', 'build_indexes', lambda: overview.build_indexes(df))
+
+    top_cities = category_counts(df['城市']).head(3).index.tolist()
+    top_skills = indexes.skills.counts().head(2).index.tolist()
+    top_welfare = indexes.welfare.counts().head(3).index.tolist()
+    paths = {
+        'none': dict(),
+        'city': dict(cities=top_cities),
+        'education_duration': dict(education=['本科'], durations=['3个月', '6个月']),
+        'salary': dict(salary_range=(150, 300)),
+        'skills': dict(skills=top_skills),
+        'welfare': dict(welfare=top_welfare),
+        'keywords': dict(keywords='数据开发 py'),
+        'combined': dict(cities=top_cities, education=['本科'], salary_range=(150, 300),
+                         skills=top_skills[:1], welfare=top_welfare),
+    }
+    filtered = {}
+    for name, criteria in paths.items():
+        filtered[name] = t('filter', name, lambda criteria=criteria: overview.filter(df, indexes, **criteria))
+
+    positions = filtered['city']
+    selection = Selection(df, positions, None, indexes)
+    selection.view = t('aggregate', 'cube_view', lambda: overview.slice_view(indexes, selection, **paths['city']))
+    for name in overview.AGGREGATIONS:
+        t('aggregate', name, lambda name=name: overview.aggregate(name, selection))
+    order = t('aggregate', 'sort_order', lambda: indexes.sort.order(positions, '平均薪资', False))
+    t('aggregate', 'table_page', lambda: overview.table(df, order).page(1, 50))
+
+
+def check_regressions(results, baseline, tolerance):
+    """与基线比较，返回变慢超过容差的步骤"""
+    # 早期的基线没有 dataset 字段，都是 jobs 数据集
+    reference = {(r.get('dataset', 'jobs'), r['size'], r['group'], r['step']): r['median_seconds']
+                 for r in baseline['results']}
+    regressions = []
+    for r in results:
+        base = reference.get((r['dataset'], r['size'], r['group'], r['step']))
+        if base is None or max(base, r['median_seconds']) < MIN_REGRESSION_SECONDS:
+            continue
+        if r['median_seconds'] > base * (1 + tolerance):
+            regressions.append({**r, 'baseline_seconds': base, 'ratio': r['median_seconds'] / base})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="分析流水线基准测试")
+    parser.add_argument('--sizes', default='1k,100k', help="数据规模，逗号分隔，如 1k,100k,1m,10m")
+    parser.add_argument('--repeat', type=int, default=3, help="每一步重复次数，取中位数")
+    parser.add_argument('--source', default=SOURCE_PATH, help="合成数据所依据的样本 CSV")
+    parser.add_argument('--output', help="结果 JSON 路径（默认输出到标准输出）")
+    parser.add_argument('--baseline', help="基线结果 JSON，用于回归判断")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="允许比基线慢的比例")
+    parser.add_argument('--workers', type=int, default=1, help="大于 1 时额外计时多进程并行清洗")
+    args = parser.parse_args(argv)
+
+    source = pd.read_csv(args.source)
+    recorder = Recorder(args.repeat)
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in args.sizes.split(','):
+            run_size(recorder, source, parse_size(size), workdir, args.workers)
+
+    report = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'workers': args.workers,
+        'results': recorder.results,
+    }
+    status = 0
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            report['regressions'] = check_regressions(recorder.results, json.load(f), args.tolerance)
+        report['tolerance'] = args.tolerance
+        for r in report['regressions']:
+            print(f"回归: {r['dataset']} {r['size']:,} {r['group']}/{r['step']} "
+                  f"{r['median_seconds'] * 1000:.2f} ms（基线 {r['baseline_seconds'] * 1000:.2f} ms，"
+                  f"{r['ratio']:.2f}x）", file=sys.stderr)
+        status = 1 if report['regressions'] else 0
+
+    payload = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(payload)
+    else:
+        print(payload)
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""
+图表载荷控制
+
+图表在发送前先估算散点类轨迹（离群点、词云等逐点绘制的轨迹）的载荷：点数 ×
+每点字节数，每点字节数只序列化前 SAMPLE_POINTS 个点得到，不序列化整张图。
+超过上限时把这些轨迹按固定种子等概率抽样到约为上限的大小，保留原有顺序，点数较多时
+改用 WebGL（scattergl）渲染；实际做了什么会以一行说明显示在图表下方。
+直方图与箱线图已由服务端统计量绘制，体量与岗位数无关，不计入载荷。
+
+上限默认 1 MB，可用环境变量 CHART_PAYLOAD_LIMIT（字节）或调用参数覆盖。
+"""
+
+import os
+
+import numpy as np
+import plotly.graph_objects as go
+import streamlit as st
+from plotly.io.json import to_json_plotly
+
+PAYLOAD_LIMIT = int(os.environ.get('CHART_PAYLOAD_LIMIT', 1_000_000))
+
+# 抽样后每条轨迹至少保留的点数
+MIN_POINTS = 200
+
+# 点数超过该值的散点改用 WebGL 渲染
+WEBGL_POINTS = 1_000
+
+# 与点一一对应、抽样时需要同步截取的属性
+POINT_ATTRIBUTES = ['x', 'y', 'text', 'hovertext', 'customdata', 'ids']
+MARKER_ATTRIBUTES = ['size', 'color', 'symbol', 'opacity']
+
+SCATTER_TYPES = ('scatter', 'scattergl')
+
+# 估算每点字节数时序列化的点数
+SAMPLE_POINTS = 100
+
+SEED = 0
+
+
+def _point_count(trace):
+    return max((len(trace[name]) for name in ('x', 'y') if trace[name] is not None), default=0)
+
+
+def _per_point(values, n):
+    """values 是否为与点一一对应的数组（而不是所有点共用的单个值）"""
+    return not (values is None or isinstance(values, str) or np.ndim(values) == 0 or len(values) != n)
+
+
+def _bytes_per_point(values):
+    sample = values[:SAMPLE_POINTS]
+    return len(to_json_plotly(sample).encode('utf-8')) / len(sample)
+
+
+def trace_size(trace):
+    """散点轨迹逐点数据的估算字节数：点数 × 各逐点属性的每点字节数"""
+    n = _point_count(trace)
+    if n == 0:
+        return 0
+    arrays = [trace[name] for name in POINT_ATTRIBUTES] + [trace.marker[name] for name in MARKER_ATTRIBUTES]
+    return int(n * sum(_bytes_per_point(values) for values in arrays if _per_point(values, n)))
+
+
+def payload_size(fig):
+    """图表中散点类轨迹的估算字节数"""
+    return sum(trace_size(trace) for trace in fig.data if trace.type in SCATTER_TYPES)
+
+
+def _sample(values, keep, n):
+    if not _per_point(values, n):
+        return values
+    return np.asarray(values, dtype=object if isinstance(values, (list, tuple)) else None)[keep]
+
+
+def _downsample_trace(trace, k, rng):
+    n = _point_count(trace)
+    keep = np.sort(rng.choice(n, size=k, replace=False))
+    trace.update({name: _sample(trace[name], keep, n) for name in POINT_ATTRIBUTES})
+    trace.marker.update({name: _sample(trace.marker[name], keep, n) for name in MARKER_ATTRIBUTES})
+
+
+def downsample(fig, limit=None):
+    """超过上限时就地抽样散点轨迹，返回 (原始估算字节数, 发送估算字节数, 说明列表)"""
+    limit = PAYLOAD_LIMIT if limit is None else limit
+    size = payload_size(fig)
+    if size <= limit:
+        return size, size, []
+
+    rng = np.random.default_rng(SEED)
+    ratio = limit / size
+    notes = []
+    for i, trace in enumerate(fig.data):
+        if trace.type not in SCATTER_TYPES:
+            continue
+        n = _point_count(trace)
+        k = min(n, max(MIN_POINTS, int(n * ratio)))
+        if k < n:
+            _downsample_trace(trace, k, rng)
+            notes.append(f"{trace.name or f'轨迹 {i + 1}'} 抽样 {n:,} → {k:,} 个点")
+    # 抽样后仍较多的散点改用 WebGL（轨迹类型不能原地修改，需重建）
+    traces = list(fig.data)
+    for i, trace in enumerate(traces):
+        if trace.type == 'scatter' and _point_count(trace) > WEBGL_POINTS:
+            spec = {key: value for key, value in trace.to_plotly_json().items() if key != 'type'}
+            traces[i] = go.Scattergl(spec, skip_invalid=True)
+            notes.append(f"{trace.name or f'轨迹 {i + 1}'} 改用 WebGL 渲染")
+    if any(trace.type == 'scattergl' for trace in traces):
+        fig.data = []
+        fig.add_traces(traces)
+    return size, payload_size(fig) if notes else size, notes
+
+
+def _format_bytes(size):
+    return f"{size / 1e6:.1f} MB" if size >= 1e6 else f"{size / 1e3:.0f} KB"
+
+
+def plotly_chart(fig, limit=None, **kwargs):
+    """替代 st.plotly_chart：超过载荷上限时先抽样，并说明处理结果"""
+    limit = PAYLOAD_LIMIT if limit is None else limit
+    size, sent, notes = downsample(fig, limit)
+    kwargs.setdefault('use_container_width', True)
+    st.plotly_chart(fig, **kwargs)
+    if size > limit:
+        detail = '；'.join(notes) if notes else '没有可抽样的散点轨迹'
+        st.caption(f"⚡ 散点数据约 {_format_bytes(size)}，超过 {_format_bytes(limit)} 上限：{detail}，"
+                   f"实际发送约 {_format_bytes(sent)}")
@@ -0,0 +1,396 @@
+"""
+实习僧岗位爬虫
+
+按关键词抓取搜索列表页，收集详情页链接，并发抓取详情页并解析成与
+Big_data_development_results.csv 相同的列，逐行追加写入 CSV（默认
+crawl_output.csv，不改动版本库中的数据集），两个看板的加载器可直接读取
+（同一路径的新导出按 职位id 增量清洗）。
+
+- 连接池：同时进行的请求不超过 --concurrency 个（urllib 在线程池中执行）
+- 限速：同一主机相邻两次请求至少间隔 1 / --rate 秒
+- 重试：网络错误、超时、429 与 5xx 按指数退避加随机抖动重试，429 优先按 Retry-After 等待
+- 断点续爬：输出 CSV 中已有的职位跳过；列表页进度与失败链接写入检查点 JSON
+
+只使用标准库。页面中以自定义字体渲染的数字按页面文本原样保留。
+
+用法：
+    python crawler.py crawl --keyword 大数据开发 --pages 10 --save-pages fixtures
+    python crawler.py serve fixtures --port 8000
+    python crawler.py crawl --base-url http://127.0.0.1:8000 --output replay.csv
+"""
+
+import argparse
+import asyncio
+import csv
+import http.client
+import json
+import os
+import random
+import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import HTTPError, URLError
+from urllib.parse import quote, urlencode, urljoin, urlsplit
+from urllib.request import Request, urlopen
+
+from analytics.overview import EXPECTED_COLUMNS
+
+SITE_URL = 'https://www.shixiseng.com'
+LIST_PATH = '/interns'
+
+# 默认输出文件（不纳入版本库）；要并入看板的数据集时用 --output 显式指定
+DEFAULT_OUTPUT = 'crawl_output.csv'
+USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/120.0 Safari/537.36')
+
+# 列表页中的详情页链接，职位id 即链接中的 inn_xxx
+DETAIL_LINK = re.compile(r'href="([^"]*/intern/(inn_[0-9A-Za-z]+)[^"]*)"')
+
+# 详情页字段：{列名: (元素 class, 文本节点连接符)}，按抓取时的页面结构配置，页面改版时只需修改这里
+DETAIL_FIELDS = {
+    '职位标题': ('new_job_name', ''),
+    '薪资范围': ('job_money', ''),
+    '公司名称': ('com-name', ''),
+    '工作地点': ('job_position', ''),
+    '所处行业': ('com-class', ''),
+    '学历要求': ('job_academic', ''),
+    '每周天数': ('job_week', ''),
+    '实习时长': ('job_time', ''),
+    '福利待遇': ('job_good_list', '；'),
+    '职位描述': ('job_detail', '\n'),
+    '简历要求': ('resume_lang', ' '),
+    '截止日期': ('job_deadline', ''),
+    '详细地址': ('com_position', ''),
+}
+
+# 可重试的 HTTP 状态码
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+_VOID_TAGS = {'br', 'img', 'input', 'meta', 'link', 'hr', 'source', 'wbr'}
+_BLOCK_TAGS = {'p', 'div', 'li'}
+
+# 换行标记：<br> 与块级元素结束处换行，区别于页面源码中的排版空白
+_LINE_BREAK = object()
+
+
+class _ClassTextParser(HTMLParser):
+    """收集指定 class 元素（每个 class 取第一个）内的文本节点"""
+
+    def __init__(self, classes):
+        super().__init__(convert_charrefs=True)
+        self.wanted = set(classes)
+        self.texts = {}
+        self._open = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _VOID_TAGS:
+            if tag == 'br':
+                self._append(_LINE_BREAK)
+            return
+        if tag in ('script', 'style'):
+            self._skip += 1
+        names = [c for c in (dict(attrs).get('class') or '').split()
+                 if c in self.wanted and c not in self.texts]
+        for name in names:
+            self.texts[name] = []
+        self._open.append((tag, names))
+
+    def handle_endtag(self, tag):
+        if tag in ('script', 'style') and self._skip:
+            self._skip -= 1
+        if tag in _BLOCK_TAGS:
+            self._append(_LINE_BREAK)
+        # 容错：未闭合的子元素随父元素一起弹出
+        for i in range(len(self._open) - 1, -1, -1):
+            if self._open[i][0] == tag:
+                del self._open[i:]
+                break
+
+    def handle_data(self, data):
+        if not self._skip and data.strip():
+            self._append(data.strip())
+
+    def _append(self, node):
+        for _, names in self._open:
+            for name in names:
+                self.texts[name].append(node)
+
+    def text(self, name, sep):
+        """元素文本：sep 为换行时按 <br>/块级元素分行（保留空行），否则用 sep 连接各文本节点"""
+        nodes = self.texts.get(name, [])
+        if sep == '\n':
+            return ''.join('\n' if node is _LINE_BREAK else node for node in nodes).strip()
+        return sep.join(node for node in nodes if node is not _LINE_BREAK)
+
+
+def parse_listing(html):
+    """列表页 -> [(职位id, 详情页链接)]，按出现顺序去重"""
+    seen = {}
+    for href, job_id in DETAIL_LINK.findall(html):
+        seen.setdefault(job_id, href)
+    return list(seen.items())
+
+
+def parse_detail(html, job_id, url, fields=DETAIL_FIELDS):
+    """详情页 -> 一行数据（列与 EXPECTED_COLUMNS 一致），缺失的字段为空字符串"""
+    parser = _ClassTextParser(cls for cls, _ in fields.values())
+    parser.feed(html)
+    parser.close()
+    row = dict.fromkeys(EXPECTED_COLUMNS, '')
+    for column, (cls, sep) in fields.items():
+        row[column] = parser.text(cls, sep)
+    row['职位id'] = job_id
+    row['详情页url'] = url
+    return row
+
+
+def fixture_name(path):
+    """请求路径（含查询串）-> 保存/回放页面的文件名"""
+    return quote(path, safe='') + '.html'
+
+
+def _http_get(url, timeout):
+    request = Request(url, headers={'User-Agent': USER_AGENT, 'Accept-Language': 'zh-CN,zh;q=0.9'})
+    with urlopen(request, timeout=timeout) as response:
+        charset = response.headers.get_content_charset() or 'utf-8'
+        return response.read().decode(charset, errors='replace')
+
+
+class Fetcher:
+    """有界并发 + 按主机限速 + 退避重试的页面抓取"""
+
+    def __init__(self, concurrency=8, rate=2.0, retries=3, timeout=15, backoff=1.0):
+        self.rate = rate
+        self.retries = retries
+        self.timeout = timeout
+        self.backoff = backoff
+        self._pool = ThreadPoolExecutor(max_workers=concurrency)
+        self._slots = asyncio.Semaphore(concurrency)
+        self._host_locks = {}
+        self._host_next = {}
+
+    async def _wait_turn(self, host):
+        lock = self._host_locks.setdefault(host, asyncio.Lock())
+        loop = asyncio.get_running_loop()
+        async with lock:
+            wait = self._host_next.get(host, 0) - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._host_next[host] = loop.time() + 1 / self.rate
+
+    async def get(self, url):
+        host = urlsplit(url).netloc
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.retries + 1):
+            delay = self.backoff * 2 ** attempt * (1 + random.random())
+            try:
+                async with self._slots:
+                    await self._wait_turn(host)
+                    return await loop.run_in_executor(self._pool, _http_get, url, self.timeout)
+            except HTTPError as e:
+                if e.code not in RETRY_STATUS or attempt == self.retries:
+                    raise
+                retry_after = e.headers.get('Retry-After', '') if e.headers else ''
+                if retry_after.isdigit():
+                    delay = float(retry_after)
+            except (URLError, TimeoutError, ConnectionError, http.client.HTTPException):
+                if attempt == self.retries:
+                    raise
+            await asyncio.sleep(delay)
+
+    def close(self):
+        self._pool.shutdown(wait=False)
+
+
+class Checkpoint:
+    """断点续爬状态：已完成的列表页、发现的详情页链接、最终失败的链接"""
+
+    def __init__(self, path):
+        self.path = path
+        self.pages = set()
+        self.details = {}
+        self.failed = {}
+        if path and os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                state = json.load(f)
+            self.pages = set(state.get('pages', []))
+            self.details = state.get('details', {})
+            self.failed = state.get('failed', {})
+
+    def save(self):
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'pages': sorted(self.pages), 'details': self.details, 'failed': self.failed},
+                      f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+def written_ids(output):
+    """输出 CSV 中已有的职位id"""
+    if not os.path.exists(output):
+        return set()
+    with open(output, newline='', encoding='utf-8-sig') as f:
+        return {row.get('职位id') for row in csv.DictReader(f)}
+
+
+class CsvSink:
+    """逐行追加写入 CSV（新文件写 BOM 与表头），每行写完立即落盘"""
+
+    def __init__(self, output):
+        exists = os.path.exists(output) and os.path.getsize(output) > 0
+        self._file = open(output, 'a', newline='', encoding='utf-8-sig' if not exists else 'utf-8')
+        self._writer = csv.DictWriter(self._file, fieldnames=EXPECTED_COLUMNS)
+        if not exists:
+            self._writer.writeheader()
+
+    def write(self, row):
+        self._writer.writerow(row)
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def _save_page(directory, url, html):
+    if directory:
+        parts = urlsplit(url)
+        path = parts.path + (f"?{parts.query}" if parts.query else '')
+        with open(os.path.join(directory, fixture_name(path)), 'w', encoding='utf-8') as f:
+            f.write(html)
+
+
+async def crawl(keyword, pages, output=DEFAULT_OUTPUT, base_url=SITE_URL, checkpoint=None,
+                save_pages=None, log=print, **fetch_options):
+    """抓取 1..pages 页搜索结果及其详情页，追加写入 output，返回 (新写入行数, 失败数)"""
+    state = Checkpoint(checkpoint)
+    fetcher = Fetcher(**fetch_options)
+    if save_pages:
+        os.makedirs(save_pages, exist_ok=True)
+
+    async def listing(page):
+        url = f"{base_url}{LIST_PATH}?{urlencode({'keyword': keyword, 'page': page})}"
+        try:
+            html = await fetcher.get(url)
+        except Exception as e:
+            state.failed[url] = repr(e)
+            log(f"列表页失败: {url} {e!r}")
+            return
+        _save_page(save_pages, url, html)
+        for job_id, href in parse_listing(html):
+            state.details.setdefault(job_id, urljoin(SITE_URL, href))
+        state.pages.add(page)
+        state.failed.pop(url, None)
+        state.save()
+
+    await asyncio.gather(*(listing(p) for p in range(1, pages + 1) if p not in state.pages))
+
+    done = written_ids(output)
+    pending = [(job_id, url) for job_id, url in state.details.items() if job_id not in done]
+    log(f"详情页: 共 {len(state.details)}，已写入 {len(state.details) - len(pending)}，待抓取 {len(pending)}")
+    sink = CsvSink(output)
+    written = 0
+
+    async def detail(job_id, url):
+        nonlocal written
+        # 回放或镜像时把站点链接改写到 base_url，写入 CSV 的仍是站点链接
+        parts = urlsplit(url)
+        fetch_url = urljoin(base_url, parts.path + (f"?{parts.query}" if parts.query else ''))
+        try:
+            html = await fetcher.get(fetch_url)
+        except Exception as e:
+            state.failed[url] = repr(e)
+            log(f"详情页失败: {url} {e!r}")
+            return
+        _save_page(save_pages, fetch_url, html)
+        sink.write(parse_detail(html, job_id, url))
+        state.failed.pop(url, None)
+        written += 1
+
+    try:
+        await asyncio.gather(*(detail(job_id, url) for job_id, url in pending))
+    finally:
+        sink.close()
+        fetcher.close()
+        state.save()
+    return written, len(state.failed)
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    directory = '.'
+
+    def do_GET(self):
+        path = os.path.join(self.directory, fixture_name(self.path))
+        if not os.path.exists(path):
+            self.send_error(404)
+            return
+        with open(path, 'rb') as f:
+            body = f.read()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def fixture_server(directory, host='127.0.0.1', port=0):
+    """回放 directory 中保存页面的本地 HTTP 服务（后台线程），返回 (server, base_url)
+
+    port 为 0 时自动分配端口；用完调用 server.shutdown()。
+    """
+    handler = type('FixtureHandler', (_FixtureHandler,), {'directory': directory})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="实习僧岗位爬虫")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    crawl_parser = commands.add_parser('crawl', help="抓取列表页与详情页，追加写入 CSV")
+    crawl_parser.add_argument('--keyword', default='大数据开发', help="搜索关键词")
+    crawl_parser.add_argument('--pages', type=int, default=10, help="抓取的列表页数")
+    crawl_parser.add_argument('--output', default=DEFAULT_OUTPUT,
+                              help=f"输出 CSV（已有职位跳过，默认 {DEFAULT_OUTPUT}）")
+    crawl_parser.add_argument('--base-url', default=SITE_URL, help="站点地址，可指向本地回放服务")
+    crawl_parser.add_argument('--checkpoint', default='crawler_checkpoint.json', help="检查点 JSON 路径")
+    crawl_parser.add_argument('--save-pages', help="同时把原始页面保存到该目录，供 serve 回放")
+    crawl_parser.add_argument('--concurrency', type=int, default=8, help="最大并发请求数")
+    crawl_parser.add_argument('--rate', type=float, default=2.0, help="每个主机每秒最多请求数")
+    crawl_parser.add_argument('--retries', type=int, default=3, help="失败重试次数")
+    crawl_parser.add_argument('--timeout', type=float, default=15, help="单次请求超时（秒）")
+
+    serve_parser = commands.add_parser('serve', help="回放 --save-pages 保存的页面")
+    serve_parser.add_argument('directory', help="保存页面的目录")
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=8000)
+    args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        server, base_url = fixture_server(args.directory, args.host, args.port)
+        print(f"回放服务: {base_url}（Ctrl+C 退出）", file=sys.stderr)
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.shutdown()
+        return 0
+
+    log = lambda message: print(message, file=sys.stderr)  # noqa: E731
+    written, failed = asyncio.run(crawl(
+        args.keyword, args.pages, args.output, args.base_url.rstrip('/'), args.checkpoint, args.save_pages,
+        log=log, concurrency=args.concurrency, rate=args.rate, retries=args.retries, timeout=args.timeout))
+    log(f"新写入 {written} 行，失败 {failed} 个链接（重新运行可续爬）")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
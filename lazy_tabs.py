@@ -0,0 +1,21 @@
+"""
+按需渲染的标签页
+
+st.tabs 每次重跑都会执行所有标签页的代码，只是把非当前页隐藏起来。
+懒加载模式改用水平单选按钮切换页面，只调用当前页的渲染函数，
+其余页面的聚合和图表在被打开前不会计算。
+"""
+
+import streamlit as st
+
+
+def render_tabs(labels, renderers, lazy=True, key='active_tab'):
+    """渲染一组标签页；renderers 与 labels 一一对应，为无参渲染函数"""
+    if not lazy:
+        for tab, render in zip(st.tabs(labels), renderers):
+            with tab:
+                render()
+        return
+
+    active = st.radio("页面", labels, horizontal=True, key=key, label_visibility="collapsed")
+    renderers[labels.index(active)]()
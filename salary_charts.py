@@ -0,0 +1,38 @@
+"""
+薪资图表
+
+直方图与箱线图都由服务端算好的统计量绘制（CubeSlice.histogram 的分箱计数、
+CubeSlice.box_stats 的四分位数与须线），发送到浏览器的只有几百个数，
+与岗位数无关。
+"""
+
+import plotly.express as px
+import plotly.graph_objects as go
+
+
+def histogram_figure(hist, color, x_title, y_title='岗位数量'):
+    """分箱结果 -> 柱宽等于箱宽的柱状图"""
+    fig = go.Figure(go.Bar(
+        x=(hist['left'] + hist['right']) / 2, y=hist['count'], width=hist['right'] - hist['left'],
+        customdata=hist[['left', 'right']], marker_color=color,
+        hovertemplate='%{customdata[0]:.0f} - %{customdata[1]:.0f}: %{y}<extra></extra>'))
+    fig.update_layout(bargap=0.02, xaxis_title=x_title, yaxis_title=y_title)
+    return fig
+
+
+def box_figure(stats, colors=None, boxmean=False, outliers=True):
+    """box_stats 的结果 -> 每行一个箱体；须线外的取值画成离群点"""
+    colors = colors or px.colors.qualitative.Plotly
+    fig = go.Figure()
+    for i, (name, row) in enumerate(stats.iterrows()):
+        name, color = str(name), colors[i % len(colors)]
+        fig.add_trace(go.Box(
+            x=[name], q1=[row['q1']], median=[row['median']], q3=[row['q3']],
+            lowerfence=[row['lowerfence']], upperfence=[row['upperfence']],
+            mean=[row['mean']], sd=[row['sd']], boxmean=boxmean, boxpoints=False,
+            name=name, marker_color=color, legendgroup=name))
+        if outliers and row['outliers']:
+            fig.add_trace(go.Scatter(
+                x=[name] * len(row['outliers']), y=row['outliers'], mode='markers', name=name,
+                marker=dict(color=color, size=5), legendgroup=name, showlegend=False))
+    return fig
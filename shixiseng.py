@@ -4,14 +4,17 @@
 """
 
 import streamlit as st
-import pandas as pd
 import numpy as np
 import plotly.express as px
-import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import re
-from collections import Counter
 import warnings
+from analytics import LiveDataset, Selection, jobs
+from analytics.agg_cache import AggregationCache, state_key
+from analytics.cube import CubeSlice
+from analytics.export import EXPORT_FORMATS, available_formats, export_bytes
+from chart_payload import plotly_chart
+from lazy_tabs import render_tabs
+from salary_charts import box_figure, histogram_figure
 warnings.filterwarnings('ignore')
 
 # ==================== 页面配置 ====================
@@ -195,137 +198,22 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# ==================== 数据加载与清洗 ====================
+# ==================== 数据加载（清洗、筛选与聚合逻辑见 analytics.jobs） ====================
+
+# 聚合缓存的内存上限
+AGG_CACHE_BYTES = 64 * 1024 * 1024
+
+
+@st.cache_resource
+def load_dataset(file_path):
+    """整表与共享索引（所有会话共享同一份只读数据，不逐会话复制）；源文件有新导出时增量刷新，索引按差量原地更新"""
+    return LiveDataset(jobs, file_path)
+
 
-@st.cache_data
 def load_and_clean_data(file_path):
-    """加载并清洗数据"""
+    """加载并清洗数据（优先读取清洗结果快照），返回 (整表, 索引)"""
     try:
-        df = pd.read_csv(file_path)
-        
-        # 1. 薪资清洗
-        def extract_avg_salary(salary_str):
-            if pd.isna(salary_str):
-                return np.nan
-            numbers = re.findall(r'\d+', str(salary_str))
-            if len(numbers) >= 2:
-                return int((int(numbers[0]) + int(numbers[1])) / 2)
-            elif len(numbers) == 1:
-                return int(numbers[0])
-            return np.nan
-        
-        df['avg_salary'] = df['薪资范围'].apply(extract_avg_salary)
-        
-        # 2. 每周天数清洗
-        def clean_days_per_week(days_str):
-            if pd.isna(days_str):
-                return np.nan
-            numbers = re.findall(r'\d+', str(days_str))
-            if numbers:
-                return f"{numbers[0]}天／周"
-            return days_str
-        
-        df['每周天数'] = df['每周天数'].apply(clean_days_per_week)
-        
-        # 3. 实习时长清洗
-        def clean_duration(duration_str):
-            if pd.isna(duration_str):
-                return np.nan
-            numbers = re.findall(r'\d+', str(duration_str))
-            if numbers:
-                return f"{numbers[0]}个月"
-            return duration_str
-        
-        df['实习时长'] = df['实习时长'].apply(clean_duration)
-        
-        def extract_duration_months(duration_str):
-            if pd.isna(duration_str):
-                return np.nan
-            numbers = re.findall(r'\d+', str(duration_str))
-            if numbers:
-                return int(numbers[0])
-            return np.nan
-        
-        df['duration_months'] = df['实习时长'].apply(extract_duration_months)
-        
-        # 4. 工作地点清洗
-        def extract_city(location_str):
-            if pd.isna(location_str):
-                return "未知"
-            
-            location = str(location_str).strip()
-            city_mapping = {
-                '北京': '北京', '北京市': '北京', '上海': '上海', '上海市': '上海',
-                '深圳': '深圳', '深圳市': '深圳', '广州': '广州', '广州市': '广州',
-                '杭州': '杭州', '杭州市': '杭州', '成都': '成都', '成都市': '成都',
-                '南京': '南京', '南京市': '南京', '武汉': '武汉', '武汉市': '武汉',
-                '西安': '西安', '西安市': '西安', '苏州': '苏州', '苏州市': '苏州',
-                '重庆': '重庆', '重庆市': '重庆', '天津': '天津', '天津市': '天津',
-            }
-            
-            if location in city_mapping:
-                return city_mapping[location]
-            
-            for city_key in city_mapping.keys():
-                if city_key in location:
-                    return city_mapping[city_key]
-            
-            return location
-        
-        df['城市'] = df['工作地点'].apply(extract_city)
-        
-        # 5. 技能标签化
-        TECH_SKILLS = ['Java', 'Python', 'SQL', 'Hadoop', 'Spark', 'Flink', 
-                       'Hive', 'Kafka', 'Scala', 'C++', 'Linux', 'MySQL', 
-                       'Redis', 'HBase', 'Elasticsearch', 'Docker', 'Kubernetes']
-        
-        def extract_skills(description):
-            if pd.isna(description):
-                return []
-            description_upper = str(description).upper()
-            matched = []
-            for skill in TECH_SKILLS:
-                if skill.upper() in description_upper:
-                    matched.append(skill)
-            return matched
-        
-        df['matched_skills'] = df['职位描述'].apply(extract_skills)
-        
-        # 6. 福利标签化
-        def extract_welfare_tags(welfare_str):
-            if pd.isna(welfare_str):
-                return []
-            
-            tags = re.split(r'[,，、；;\s]+', str(welfare_str))
-            welfare_mapping = {
-                '转正': '转正机会', '转正机会': '转正机会', '留用机会': '转正机会',
-                '房补': '房补', '住房补贴': '房补', '餐补': '餐补', '饭补': '餐补',
-                '下午茶': '下午茶', '零食': '下午茶', '周末双休': '周末双休',
-                '双休': '周末双休', '五险一金': '五险一金', '五险': '五险一金',
-                '交通补助': '交通补助', '交通补贴': '交通补助', '节日福利': '节日福利',
-                '年终奖': '年终奖', '奖金': '年终奖', '弹性工作': '弹性工作',
-                '团建': '团建活动', '带薪年假': '带薪年假', '定期体检': '定期体检',
-            }
-            
-            standardized_tags = []
-            for tag in tags:
-                tag = tag.strip()
-                if tag and len(tag) > 0:
-                    mapped_tag = welfare_mapping.get(tag, tag)
-                    if mapped_tag not in standardized_tags:
-                        standardized_tags.append(mapped_tag)
-            return standardized_tags
-        
-        # 检查福利待遇列是否存在
-        if '福利待遇' in df.columns:
-            df['welfare_tags'] = df['福利待遇'].apply(extract_welfare_tags)
-        else:
-            st.warning("⚠️ 数据中没有'福利待遇'列，将创建空的福利标签")
-            df['welfare_tags'] = [[] for _ in range(len(df))]
-        
-        df['截止日期'] = pd.to_datetime(df['截止日期'], errors='coerce')
-        
-        return df
+        return load_dataset(file_path).current()
     
     except FileNotFoundError:
         st.error(f"❌ 文件未找到: {file_path}")
@@ -338,52 +226,10 @@ def load_and_clean_data(file_path):
         st.stop()
 
 
-def filter_data(df, cities, education, duration, salary_range, required_skills, welfare_prefs):
-    """根据用户选择的条件筛选数据"""
-    filtered_df = df.copy()
-    
-    if cities and len(cities) > 0:
-        filtered_df = filtered_df[filtered_df['城市'].isin(cities)]
-    
-    if education != "全部":
-        education_hierarchy = {
-            '不限': ['不限', '大专', '本科', '硕士', '博士'],
-            '大专': ['大专', '本科', '硕士', '博士'],
-            '本科': ['本科', '硕士', '博士'],
-            '硕士': ['硕士', '博士'],
-            '博士': ['博士']
-        }
-        if education in education_hierarchy:
-            filtered_df = filtered_df[filtered_df['学历要求'].isin(education_hierarchy[education])]
-    
-    if duration != "全部":
-        duration_num = int(re.findall(r'\d+', duration)[0])
-        filtered_df = filtered_df[filtered_df['duration_months'] >= duration_num]
-    
-    filtered_df = filtered_df[
-        (filtered_df['avg_salary'] >= salary_range[0]) & 
-        (filtered_df['avg_salary'] <= salary_range[1])
-    ]
-    
-    if required_skills and len(required_skills) > 0:
-        def has_required_skills(skills_list):
-            return all(skill in skills_list for skill in required_skills)
-        filtered_df = filtered_df[filtered_df['matched_skills'].apply(has_required_skills)]
-    
-    if welfare_prefs and len(welfare_prefs) > 0:
-        # 检查 welfare_tags 列是否存在
-        if 'welfare_tags' in filtered_df.columns:
-            def has_any_welfare(welfare_list):
-                # 确保 welfare_list 是列表类型
-                if not isinstance(welfare_list, list):
-                    return False
-                # 并集：只要包含任意一个指定的福利标签即可
-                return any(welfare in welfare_list for welfare in welfare_prefs)
-            filtered_df = filtered_df[filtered_df['welfare_tags'].apply(has_any_welfare)]
-        else:
-            st.warning("⚠️ 数据中缺少福利标签信息，无法按福利筛选")
-    
-    return filtered_df
+@st.cache_resource
+def get_aggregation_cache():
+    """按筛选状态缓存筛选结果与聚合数据（所有会话共享）"""
+    return AggregationCache(max_bytes=AGG_CACHE_BYTES)
 
 
 def main():
@@ -392,19 +238,25 @@ def main():
     st.markdown('<p class="subtitle">🎯 智能筛选 · 数据洞察 · 精准推荐</p>', unsafe_allow_html=True)
     st.markdown("---")
     
-    DATA_PATH = "Big_data_development_results.csv"
-    df = load_and_clean_data(DATA_PATH)
+    df, indexes = load_and_clean_data(jobs.DATA_PATH)
     
     # 侧边栏筛选器
     st.sidebar.header("🔍 筛选条件")
     
+    # 关键词搜索（标题与描述的全文检索，缺少文本列时不显示）
+    search_query = ''
+    if indexes.text is not None:
+        search_query = st.sidebar.text_input("🔎 搜索职位标题与描述", placeholder="如：数据开发 flink",
+                                             help="多个关键词以空格分隔，需同时命中；最后一个词按前缀匹配，单个汉字匹配所有含该字的词").strip()
+    
     all_cities = sorted(df['城市'].unique().tolist())
     selected_cities = st.sidebar.multiselect("选择城市", options=all_cities, default=[])
     
     education_options = ['全部', '不限', '大专', '本科', '硕士', '博士']
     selected_education = st.sidebar.selectbox("学历要求", options=education_options, index=0)
     
-    duration_options = ['全部'] + sorted(df['实习时长'].dropna().unique().tolist())
+    # 分类类别已按月数排序
+    duration_options = ['全部'] + df['实习时长'].cat.categories.tolist()
     selected_duration = st.sidebar.selectbox("最短实习时长", options=duration_options, index=0)
     
     min_salary = int(df['avg_salary'].min())
@@ -412,7 +264,7 @@ def main():
     salary_range = st.sidebar.slider("日薪范围（元/天）", min_value=min_salary, max_value=max_salary, 
                                      value=(min_salary, max_salary), step=10)
     
-    all_skills = sorted(list(set([skill for skills in df['matched_skills'] for skill in skills])))
+    all_skills = sorted(indexes.skills.tags)
     selected_skills = st.sidebar.multiselect("必备技能", options=all_skills, default=[])
     
     # 福利偏好 - 文字输入智能匹配（支持多关键词）
@@ -421,7 +273,7 @@ def main():
     # 检查是否有福利标签数据
     if 'welfare_tags' in df.columns:
         try:
-            all_welfare = sorted(list(set([tag for tags in df['welfare_tags'] if isinstance(tags, list) for tag in tags])))
+            all_welfare = sorted(indexes.welfare.tags)
         except:
             all_welfare = []
         
@@ -474,16 +326,8 @@ def main():
             
             # 智能匹配福利标签（交集）
             if welfare_groups:
-                # 为每组关键词匹配福利标签
-                matched_groups = []
-                for group in welfare_groups:
-                    group_matches = []
-                    for keyword in group:
-                        for welfare in all_welfare:
-                            if keyword.lower() in welfare.lower() or welfare.lower() in keyword.lower():
-                                if welfare not in group_matches:
-                                    group_matches.append(welfare)
-                    matched_groups.append(group_matches)
+                # 为每组关键词匹配福利标签（子串与同义词查表，与福利标签数量无关）
+                matched_groups = [indexes.welfare_matcher.match_any(group) for group in welfare_groups]
                 
                 # 显示每组的匹配结果
                 all_matched = []
@@ -507,11 +351,35 @@ def main():
     else:
         st.sidebar.info("ℹ️ 数据中缺少福利标签列")
     
-    filtered_df = filter_data(df, selected_cities, selected_education, selected_duration, 
-                             salary_range, selected_skills, selected_welfare)
+    st.sidebar.markdown("---")
+    lazy_tabs = st.sidebar.checkbox("⚡ 仅计算当前标签页", value=True,
+                                    help="关闭后恢复一次性渲染全部标签页")
+    
+    # 同一组筛选条件只筛选一次，之后的图表聚合都以该 key 缓存
+    agg_cache = get_aggregation_cache()
+    criteria = dict(cities=selected_cities, education=selected_education, duration=selected_duration,
+                    salary_range=salary_range, skills=selected_skills, welfare=selected_welfare,
+                    keywords=search_query)
+    filter_key = state_key(data=df.attrs.get('data_key'), **criteria)
+    
+    def cached(name, compute):
+        """当前筛选状态下的聚合结果缓存（取回的对象为共享只读）"""
+        return agg_cache.get_or_compute(filter_key, name, compute)
+    
+    # 筛选结果只是命中行的位置数组，图表需要哪几列才按位置取哪几列
+    positions = cached('rows', lambda: jobs.filter(df, indexes, **criteria))
+    selection = Selection(df, positions, None, indexes)
+    
+    # 城市/学历/时长/薪资相关的 KPI 与图表都由立方体切片计算
+    selection.view = CubeSlice(cached('cube', lambda: jobs.slice_view(indexes, selection, **criteria).cells),
+                               jobs.MEASURE)
+    
+    def aggregate(name):
+        """当前筛选状态下名为 name 的图表聚合"""
+        return cached(name, lambda: jobs.aggregate(name, selection))
     
     # 检查筛选后是否有数据
-    if len(filtered_df) == 0:
+    if len(selection) == 0:
         st.header("📈 核心指标")
         col1, col2, col3, col4 = st.columns(4)
         
@@ -557,39 +425,28 @@ def main():
     # KPI 指标卡（有数据时）- 美化版
     st.markdown("### 📈 核心指标")
     st.markdown("")  # 添加间距
+    kpi = aggregate('kpi')
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("岗位总数", f"{len(filtered_df):,}", delta=f"占比 {len(filtered_df)/len(df)*100:.1f}%")
+        st.metric("岗位总数", f"{len(selection):,}", delta=f"占比 {len(selection)/len(df)*100:.1f}%")
     with col2:
-        avg_sal = filtered_df['avg_salary'].mean()
-        st.metric("平均日薪", f"¥{avg_sal:.0f}", delta=f"中位数 ¥{filtered_df['avg_salary'].median():.0f}")
+        st.metric("平均日薪", f"¥{kpi['avg_salary']:.0f}", delta=f"中位数 ¥{kpi['median_salary']:.0f}")
     with col3:
-        st.metric("覆盖城市", f"{filtered_df['城市'].nunique()}", delta=f"总计 {df['城市'].nunique()} 个")
+        st.metric("覆盖城市", f"{kpi['cities']}", delta=f"总计 {kpi['total_cities']} 个")
     with col4:
-        st.metric("招聘企业", f"{filtered_df['公司名称'].nunique()}", delta=f"总计 {df['公司名称'].nunique()} 家")
+        st.metric("招聘企业", f"{kpi['companies']}", delta=f"总计 {kpi['total_companies']} 家")
     
     st.markdown("---")
     
-    # ==================== 创建分页标签 ====================
-    tab1, tab2, tab3, tab4, tab5 = st.tabs([
-        "💰 薪资与城市分析", 
-        "🛠️ 技能与学历分析", 
-        "🏢 企业与岗位推荐",
-        "🏭 行业与趋势分析",
-        "📋 数据详情表"
-    ])
-    
     # ==================== 第1页：薪资与城市分析 ====================
-    with tab1:
+    def render_salary_city_tab():
         st.header("💰 薪资分布分析")
         col1, col2 = st.columns(2)
         
         with col1:
-            fig_box = go.Figure()
-            fig_box.add_trace(go.Box(y=filtered_df['avg_salary'], name='日薪分布', 
-                                     marker_color='#667eea', boxmean='sd',
-                                     line=dict(color='#764ba2', width=2)))
+            fig_box = box_figure(aggregate('salary_box').set_axis(['日薪分布']), colors=['#667eea'], boxmean='sd')
+            fig_box.update_traces(line=dict(color='#764ba2', width=2), selector=dict(type='box'))
             fig_box.update_layout(
                 title=dict(text="薪资箱线图", font=dict(size=18, color='#2c3e50')),
                 yaxis_title="日薪（元/天）", 
@@ -597,26 +454,23 @@ def main():
                 plot_bgcolor='rgba(0,0,0,0)',
                 paper_bgcolor='rgba(0,0,0,0)'
             )
-            st.plotly_chart(fig_box, use_container_width=True)
+            plotly_chart(fig_box)
         
         with col2:
-            fig_hist = px.histogram(filtered_df, x='avg_salary', nbins=30, title="薪资分布直方图",
-                                   labels={'avg_salary': '日薪（元/天）'},
-                                   color_discrete_sequence=['#667eea'])
+            # 分箱计数在服务端由立方体算好
+            fig_hist = histogram_figure(aggregate('salary_histogram'), '#667eea', '日薪（元/天）', 'count')
             fig_hist.update_layout(
                 height=400,
-                title=dict(font=dict(size=18, color='#2c3e50')),
+                title=dict(text="薪资分布直方图", font=dict(size=18, color='#2c3e50')),
                 plot_bgcolor='rgba(0,0,0,0)',
                 paper_bgcolor='rgba(0,0,0,0)'
             )
-            st.plotly_chart(fig_hist, use_container_width=True)
+            plotly_chart(fig_hist)
         
         st.markdown("---")
         
         st.header("🌍 城市岗位热力分析")
-        city_stats = filtered_df.groupby('城市').agg({'职位id': 'count', 'avg_salary': 'mean'}).reset_index()
-        city_stats.columns = ['城市', '岗位数量', '平均薪资']
-        city_stats = city_stats.sort_values('岗位数量', ascending=False).head(20)
+        city_stats = aggregate('city_stats')
         
         col1, col2 = st.columns(2)
         
@@ -630,7 +484,7 @@ def main():
                 plot_bgcolor='rgba(0,0,0,0)',
                 paper_bgcolor='rgba(0,0,0,0)'
             )
-            st.plotly_chart(fig_city_count, use_container_width=True)
+            plotly_chart(fig_city_count)
         
         with col2:
             fig_city_salary = px.bar(city_stats, x='城市', y='平均薪资', title="各城市平均薪资 TOP20",
@@ -642,14 +496,12 @@ def main():
                 plot_bgcolor='rgba(0,0,0,0)',
                 paper_bgcolor='rgba(0,0,0,0)'
             )
-            st.plotly_chart(fig_city_salary, use_container_width=True)
+            plotly_chart(fig_city_salary)
     
     # ==================== 第2页：技能与学历分析 ====================
-    with tab2:
+    def render_skill_education_tab():
         st.header("🛠️ 技能需求分析")
-        all_skills_list = [skill for skills in filtered_df['matched_skills'] for skill in skills]
-        skill_counter = Counter(all_skills_list)
-        skill_df = pd.DataFrame(skill_counter.most_common(20), columns=['技能', '出现次数'])
+        skill_df = aggregate('skill_counts')
         
         col1, col2 = st.columns(2)
         
@@ -657,7 +509,7 @@ def main():
             fig_skills = px.bar(skill_df, x='出现次数', y='技能', orientation='h', title="高频技能 TOP20",
                                color='出现次数', color_continuous_scale='Viridis')
             fig_skills.update_layout(height=500, yaxis={'categoryorder': 'total ascending'})
-            st.plotly_chart(fig_skills, use_container_width=True)
+            plotly_chart(fig_skills)
         
         with col2:
             if len(skill_df) > 0:
@@ -666,70 +518,55 @@ def main():
                                           title="技能词云", color='出现次数', size_max=60)
                 fig_wordcloud.update_traces(textposition='middle center')
                 fig_wordcloud.update_layout(height=500, xaxis={'visible': False}, yaxis={'visible': False})
-                st.plotly_chart(fig_wordcloud, use_container_width=True)
+                plotly_chart(fig_wordcloud)
         
         st.markdown("---")
         
         st.header("🎓 学历要求分布")
-        education_stats = filtered_df['学历要求'].value_counts().reset_index()
-        education_stats.columns = ['学历', '数量']
+        education_stats = aggregate('education_stats')
         
         col1, col2 = st.columns(2)
         
         with col1:
             fig_edu_pie = px.pie(education_stats, values='数量', names='学历', title="学历要求占比", hole=0.4)
             fig_edu_pie.update_layout(height=400)
-            st.plotly_chart(fig_edu_pie, use_container_width=True)
+            plotly_chart(fig_edu_pie)
         
         with col2:
             fig_edu_bar = px.bar(education_stats, x='学历', y='数量', title="学历要求数量分布", color='数量')
             fig_edu_bar.update_layout(height=400)
-            st.plotly_chart(fig_edu_bar, use_container_width=True)
+            plotly_chart(fig_edu_bar)
     
     # ==================== 第3页：企业与岗位推荐 ====================
-    with tab3:
+    def render_company_recommend_tab():
         st.header("🏢 热门招聘企业 TOP10")
-        company_stats = filtered_df['公司名称'].value_counts().head(10).reset_index()
-        company_stats.columns = ['公司', '岗位数量']
+        company_stats = aggregate('company_stats')
         
         fig_company = px.bar(company_stats, x='岗位数量', y='公司', orientation='h', 
                             title="发布岗位最多的公司 TOP10", color='岗位数量')
         fig_company.update_layout(height=400, yaxis={'categoryorder': 'total ascending'})
-        st.plotly_chart(fig_company, use_container_width=True)
+        plotly_chart(fig_company)
         
         st.markdown("---")
         
         st.header("💼 推荐岗位 TOP10")
         st.markdown("**根据薪资、技能匹配度和福利综合推荐**")
         
-        # 计算推荐分数：薪资权重50%，技能数量权重30%，福利数量权重20%
-        recommend_df = filtered_df.copy()
-        recommend_df['技能数量'] = recommend_df['matched_skills'].apply(len)
-        recommend_df['福利数量'] = recommend_df['welfare_tags'].apply(len)
-        
-        # 归一化处理
-        if recommend_df['avg_salary'].max() > 0:
-            recommend_df['薪资得分'] = recommend_df['avg_salary'] / recommend_df['avg_salary'].max() * 50
-        else:
-            recommend_df['薪资得分'] = 0
-            
-        if recommend_df['技能数量'].max() > 0:
-            recommend_df['技能得分'] = recommend_df['技能数量'] / recommend_df['技能数量'].max() * 30
-        else:
-            recommend_df['技能得分'] = 0
-            
-        if recommend_df['福利数量'].max() > 0:
-            recommend_df['福利得分'] = recommend_df['福利数量'] / recommend_df['福利数量'].max() * 20
+        with st.expander("⚙️ 调整推荐权重"):
+            my_skills = st.multiselect("我掌握的技能", options=all_skills, default=[], key='recommend_my_skills',
+                                       help="按岗位要求中命中的个人技能占比加分")
+            weight_cols = st.columns(4)
+            weight_labels = {'salary': '薪资', 'skills': '技能数量', 'welfare': '福利数量', 'match': '技能匹配度'}
+            weights = {name: weight_cols[i].slider(label, 0, 100, jobs.RECOMMEND_WEIGHTS[name], step=5,
+                                                   key=f'recommend_weight_{name}')
+                       for i, (name, label) in enumerate(weight_labels.items())}
+        
+        if weights == jobs.RECOMMEND_WEIGHTS and not my_skills:
+            top_jobs = aggregate('top_jobs')
         else:
-            recommend_df['福利得分'] = 0
-        
-        recommend_df['推荐分数'] = recommend_df['薪资得分'] + recommend_df['技能得分'] + recommend_df['福利得分']
-        
-        # 按推荐分数排序，取前10
-        top_jobs = recommend_df.nlargest(10, '推荐分数')[[
-            '职位标题', '公司名称', 'avg_salary', '城市', '学历要求', '实习时长',
-            'matched_skills', 'welfare_tags', '推荐分数', '详情页url'
-        ]].copy()
+            # 在预先算好的特征矩阵上打分，调整权重无需缓存
+            top_jobs = jobs.recommend(df, weights=weights, recommender=indexes.recommender,
+                                      my_skills=my_skills, positions=selection.positions)
         
         # 显示推荐岗位卡片
         for idx, row in top_jobs.iterrows():
@@ -752,26 +589,21 @@ def main():
                 st.markdown(f"**🔗 [查看详情]({row['详情页url']})**")
     
     # ==================== 第4页：行业与趋势分析 ====================
-    with tab4:
+    def render_industry_trend_tab():
         st.header("📅 岗位发布时间趋势")
-        filtered_df_with_date = filtered_df[filtered_df['截止日期'].notna()].copy()
+        time_stats = aggregate('time_stats')
         
-        if len(filtered_df_with_date) > 0:
-            filtered_df_with_date['月份'] = filtered_df_with_date['截止日期'].dt.to_period('M').astype(str)
-            time_stats = filtered_df_with_date.groupby('月份').size().reset_index(name='岗位数量')
-            time_stats = time_stats.sort_values('月份')
-            
+        if len(time_stats) > 0:
             fig_time = px.line(time_stats, x='月份', y='岗位数量', title="近一年岗位发布趋势", markers=True)
             fig_time.update_layout(height=400)
-            st.plotly_chart(fig_time, use_container_width=True)
+            plotly_chart(fig_time)
         else:
             st.info("暂无有效的时间数据")
         
         st.markdown("---")
         
         st.header("🏭 行业分布分析")
-        industry_stats = filtered_df['所处行业'].value_counts().head(15).reset_index()
-        industry_stats.columns = ['行业', '数量']
+        industry_stats = aggregate('industry_stats')
         
         col1, col2 = st.columns(2)
         
@@ -779,39 +611,45 @@ def main():
             fig_sunburst = px.sunburst(industry_stats, path=['行业'], values='数量', 
                                        title="行业分布旭日图", color='数量')
             fig_sunburst.update_layout(height=500)
-            st.plotly_chart(fig_sunburst, use_container_width=True)
+            plotly_chart(fig_sunburst)
         
         with col2:
             fig_treemap = px.treemap(industry_stats, path=['行业'], values='数量', 
                                     title="行业分布树状图", color='数量')
             fig_treemap.update_layout(height=500)
-            st.plotly_chart(fig_treemap, use_container_width=True)
+            plotly_chart(fig_treemap)
     
     # ==================== 第5页：数据详情表 ====================
-    with tab5:
+    def render_detail_table_tab():
         st.header("📋 岗位详情数据表")
-        st.markdown(f"**共 {len(filtered_df)} 条岗位信息**")
-        
-        # 准备显示数据
-        display_df = filtered_df[['职位标题', '公司名称', 'avg_salary', '城市', '学历要求', 
-                                  '实习时长', 'matched_skills', 'welfare_tags', '详情页url']].copy()
-        display_df.columns = ['职位标题', '公司', '日薪(元)', '城市', '学历', '实习时长', '技能要求', '福利', '详情页']
-        
-        # 处理列表类型的列
-        display_df['技能要求'] = display_df['技能要求'].apply(lambda x: ', '.join(x) if isinstance(x, list) and len(x) > 0 else '未标注')
-        display_df['福利'] = display_df['福利'].apply(lambda x: ', '.join(x) if isinstance(x, list) and len(x) > 0 else '未标注')
-        
-        # 重置索引
-        display_df = display_df.reset_index(drop=True)
+        st.markdown(f"**共 {len(selection)} 条岗位信息**")
         
         # 添加分页功能
         st.markdown("---")
         
-        # 每页显示的行数
-        rows_per_page = st.selectbox("每页显示行数", [10, 25, 50, 100, 200], index=2)
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            # 每页显示的行数
+            rows_per_page = st.selectbox("每页显示行数", [10, 25, 50, 100, 200], index=2)
+        with col2:
+            sort_options = ['默认'] + (['相关度'] if search_query else []) + list(jobs.SORT_COLUMNS)
+            sort_label = st.selectbox("排序方式", sort_options, key='detail_sort')
+        with col3:
+            ascending = st.radio("顺序", ['降序', '升序'], horizontal=True, key='detail_order') == '升序'
+        sort_column = jobs.SORT_COLUMNS.get(sort_label)
+        
+        # 排序结果按筛选状态缓存，取自整表预排序（相关度取自全文检索打分），不对筛选结果重新排序
+        def sorted_positions():
+            if sort_label == '相关度':
+                ranked = indexes.text.rank(selection.positions, search_query)
+                return ranked[::-1] if ascending else ranked
+            return indexes.sort.order(selection.positions, sort_column, ascending)
+        order = cached(f'order:{sort_label}:{ascending}', sorted_positions)
+        # 列表类型的列只在取出的当前页上拼接
+        display_table = jobs.table(df, order)
         
         # 计算总页数
-        total_pages = (len(display_df) - 1) // rows_per_page + 1
+        total_pages = display_table.page_count(rows_per_page)
         
         # 页码选择
         col1, col2, col3 = st.columns([1, 2, 1])
@@ -826,14 +664,14 @@ def main():
         
         # 计算当前页的数据范围
         start_idx = (page_number - 1) * rows_per_page
-        end_idx = min(start_idx + rows_per_page, len(display_df))
+        end_idx = min(start_idx + rows_per_page, len(display_table))
         
         # 显示当前页的数据
-        st.markdown(f"**显示第 {start_idx + 1} - {end_idx} 条，共 {len(display_df)} 条**")
+        st.markdown(f"**显示第 {start_idx + 1} - {end_idx} 条，共 {len(display_table)} 条**")
         
         # 使用st.data_editor显示数据（可编辑表格，更稳定）
         st.data_editor(
-            display_df.iloc[start_idx:end_idx],
+            display_table.page(page_number, rows_per_page),
             use_container_width=True,
             num_rows="fixed",
             disabled=True,
@@ -845,18 +683,39 @@ def main():
         # 导出功能
         col1, col2, col3 = st.columns([1, 1, 2])
         with col1:
-            csv = display_df.to_csv(index=False, encoding='utf-8-sig')
-            st.download_button(
-                label="📥 导出全部数据为CSV",
-                data=csv,
-                file_name="filtered_jobs.csv",
-                mime="text/csv",
-                use_container_width=True
-            )
+            # 导出文件只在点击生成后按块写出，同一筛选状态、格式和排序只生成一次
+            export_format = st.selectbox("导出格式", available_formats(), key='detail_export_format')
+            export_name = f'export:{export_format}:{sort_label}:{ascending}'
+            if st.button("⚙️ 生成导出文件", key='detail_export_prepare', use_container_width=True):
+                st.session_state['detail_export'] = (filter_key, export_name)
+            
+            if st.session_state.get('detail_export') == (filter_key, export_name):
+                extension, mime = EXPORT_FORMATS[export_format]
+                st.download_button(
+                    label=f"📥 导出全部数据为{export_format}",
+                    data=cached(export_name, lambda: export_bytes(display_table.chunks(), export_format)),
+                    file_name=f"filtered_jobs{extension}",
+                    mime=mime,
+                    use_container_width=True
+                )
         
         with col2:
             # 显示统计信息
-            st.metric("数据总行数", len(display_df))
+            st.metric("数据总行数", len(display_table))
+    
+    # ==================== 创建分页标签（懒加载模式下只计算当前页） ====================
+    render_tabs(
+        [
+            "💰 薪资与城市分析", 
+            "🛠️ 技能与学历分析", 
+            "🏢 企业与岗位推荐",
+            "🏭 行业与趋势分析",
+            "📋 数据详情表"
+        ],
+        [render_salary_city_tab, render_skill_education_tab, render_company_recommend_tab,
+         render_industry_trend_tab, render_detail_table_tab],
+        lazy=lazy_tabs
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,61 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 测试直接导入仓库根目录下的模块（analytics、chart_payload 等）
+sys.path.insert(0, ROOT)
+
+DATA_PATH = os.path.join(ROOT, 'Big_data_development_results.csv')
+
+
+@pytest.fixture(autouse=True)
+def snapshot_dir(tmp_path, monkeypatch):
+    """每个测试使用独立的快照目录，不读写仓库中的 .snapshots"""
+    path = tmp_path / 'snapshots'
+    monkeypatch.setenv('SNAPSHOT_DIR', str(path))
+    return path
+
+
+@pytest.fixture(scope='session')
+def raw():
+    """仓库自带的原始数据（只读，使用时先 copy）"""
+    return pd.read_csv(DATA_PATH)
+
+
+@pytest.fixture
+def sample_csv(raw, tmp_path):
+    """取原始数据前 300 行写成独立的 CSV"""
+    path = tmp_path / 'sample.csv'
+    raw.head(300).to_csv(path, index=False)
+    return str(path)
+
+
+def cleaned(module, raw):
+    df = module.clean(raw.copy(), module.default_skill_matcher())
+    return df, module.build_indexes(df)
+
+
+@pytest.fixture(scope='session')
+def jobs_data(raw):
+    """jobs 数据集清洗后的整表与索引（只读）"""
+    from analytics import jobs
+    return cleaned(jobs, raw)
+
+
+@pytest.fixture(scope='session')
+def overview_data(raw):
+    """overview 数据集清洗后的整表与索引（只读）"""
+    from analytics import overview
+    return cleaned(overview, raw)
+
+
+def select(module, df, indexes, **criteria):
+    """与页面相同的方式构建 Selection：行位置 + 同条件下的立方体切片"""
+    from analytics import Selection
+    selection = Selection(df, module.filter(df, indexes, **criteria), None, indexes)
+    selection.view = module.slice_view(indexes, selection, **criteria)
+    return selection
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+
+from analytics.agg_cache import AggregationCache, estimate_size, state_key
+
+BLOCK = np.zeros(100, dtype=np.int64)
+BLOCK_BYTES = BLOCK.nbytes
+
+
+def fill(cache, *names):
+    for name in names:
+        cache.get_or_compute('state', name, lambda: BLOCK.copy())
+
+
+def cached(cache):
+    return [name for _, name in cache._entries]
+
+
+def test_hits_and_misses():
+    cache = AggregationCache()
+    calls = []
+    for _ in range(3):
+        cache.get_or_compute('a', 'kpi', lambda: calls.append(1) or 42)
+    assert calls == [1]
+    assert (cache.hits, cache.misses) == (2, 1)
+    # 同一 state key 下不同名称的结果分别缓存
+    assert cache.get_or_compute('a', 'chart', lambda: 7) == 7
+    assert len(cache) == 2
+
+
+def test_lru_eviction_order():
+    cache = AggregationCache(max_bytes=3 * BLOCK_BYTES)
+    fill(cache, 'a', 'b', 'c')
+    # 命中 a 后 b 成为最久未用的一项
+    fill(cache, 'a', 'd')
+    assert cached(cache) == ['c', 'a', 'd']
+    fill(cache, 'e')
+    assert cached(cache) == ['a', 'd', 'e']
+
+
+def test_byte_budget():
+    cache = AggregationCache(max_bytes=int(2.5 * BLOCK_BYTES))
+    fill(cache, 'a', 'b', 'c')
+    assert cached(cache) == ['b', 'c']
+    assert cache.total_bytes == 2 * BLOCK_BYTES <= cache.max_bytes
+    cache.clear()
+    assert len(cache) == 0 and cache.total_bytes == 0
+
+
+def test_oversized_result_is_not_cached():
+    cache = AggregationCache(max_bytes=2 * BLOCK_BYTES)
+    fill(cache, 'a')
+    big = np.zeros(1000, dtype=np.int64)
+    assert cache.get_or_compute('state', 'big', lambda: big) is big
+    # 超过预算的结果直接返回，不挤掉已有的缓存
+    assert cached(cache) == ['a']
+    assert cache.total_bytes == BLOCK_BYTES
+    calls = []
+    cache.get_or_compute('state', 'big', lambda: calls.append(1) or big)
+    assert calls == [1]
+
+
+def test_state_key_ignores_filter_value_order():
+    key = state_key(cities=['北京', '上海'], skills={'python', 'sql'}, salary_range=(100, 300))
+    assert key == state_key(salary_range=(100, 300), skills=['sql', 'python'], cities=['上海', '北京'])
+    # 区间的上下界有顺序
+    assert key != state_key(cities=['北京', '上海'], skills={'python', 'sql'}, salary_range=(300, 100))
+    assert key != state_key(cities=['北京'], skills={'python', 'sql'}, salary_range=(100, 300))
+    assert state_key(top=np.int64(5)) == state_key(top=5)
+
+
+def test_estimate_size():
+    df = pd.DataFrame({'a': np.arange(10), 'b': list('abcdefghij')})
+    assert estimate_size(df) == df.memory_usage(deep=True).sum()
+    assert estimate_size(BLOCK) == BLOCK_BYTES
+    assert estimate_size({'x': BLOCK, 'y': [BLOCK, BLOCK]}) > 3 * BLOCK_BYTES
@@ -0,0 +1,60 @@
+import pytest
+
+from analytics import jobs, overview
+from conftest import select
+
+# 不可能命中的薪资区间，得到空选择
+EMPTY = dict(salary_range=(-2, -1))
+
+
+@pytest.fixture(params=['jobs', 'overview'])
+def dataset(request, jobs_data, overview_data):
+    return {'jobs': (jobs, *jobs_data), 'overview': (overview, *overview_data)}[request.param]
+
+
+@pytest.mark.parametrize('criteria', [{}, EMPTY], ids=['all', 'empty'])
+def test_every_aggregation_runs(dataset, criteria):
+    module, df, indexes = dataset
+    selection = select(module, df, indexes, **criteria)
+    for name in module.AGGREGATIONS:
+        module.aggregate(name, selection)
+
+
+def test_unknown_aggregation(dataset):
+    module, df, indexes = dataset
+    with pytest.raises(KeyError):
+        module.aggregate('no_such_chart', select(module, df, indexes))
+
+
+def test_overview_kpi_matches_pandas(overview_data):
+    df, indexes = overview_data
+    selection = select(overview, df, indexes, cities=['北京', '上海'])
+    rows = df[df['城市'].isin(['北京', '上海'])]
+    kpi = overview.aggregate('kpi', selection)
+    assert kpi['jobs'] == len(rows)
+    assert kpi['avg_salary'] == pytest.approx(rows['平均薪资'].mean())
+    assert kpi['companies'] == rows['公司名称'].nunique()
+    assert kpi['cities'] == 2
+    assert kpi['top_city'] == rows['城市'].value_counts().index[0]
+
+
+def test_overview_kpi_on_empty_selection(overview_data):
+    kpi = overview.aggregate('kpi', select(overview, *overview_data, **EMPTY))
+    assert kpi['jobs'] == 0 and kpi['companies'] == 0 and kpi['top_city'] == '无'
+
+
+def test_jobs_kpi_matches_pandas(jobs_data):
+    df, indexes = jobs_data
+    selection = select(jobs, df, indexes, education='本科', salary_range=(100, 300))
+    rows = df[df['学历要求'].isin(jobs.EDUCATION_HIERARCHY['本科']) & df['avg_salary'].between(100, 300)]
+    kpi = jobs.aggregate('kpi', selection)
+    assert kpi['avg_salary'] == pytest.approx(rows['avg_salary'].mean())
+    assert kpi['median_salary'] == pytest.approx(rows['avg_salary'].median())
+    assert kpi['companies'] == rows['公司名称'].nunique()
+
+
+def test_skill_counts_match_pandas(jobs_data):
+    df, indexes = jobs_data
+    counts = jobs.aggregate('skill_counts', select(jobs, df, indexes, cities=['北京']))
+    expected = df.loc[df['城市'] == '北京', 'matched_skills'].explode().value_counts()
+    assert dict(zip(counts['技能'], counts['出现次数'])) == expected.loc[counts['技能']].to_dict()
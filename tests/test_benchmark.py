@@ -0,0 +1,37 @@
+import benchmark
+
+
+def test_parse_size():
+    assert benchmark.parse_size('1k') == 1_000
+    assert benchmark.parse_size('2.5k') == 2_500
+    assert benchmark.parse_size(' 1M ') == 1_000_000
+    assert benchmark.parse_size('1234') == 1234
+
+
+def test_synthesize_keeps_columns_and_unique_ids(raw):
+    df = benchmark.synthesize(raw, 500)
+    assert list(df.columns) == list(raw.columns)
+    assert len(df) == 500
+    assert df['职位id'].is_unique and df['详情页url'].is_unique
+    assert set(df['薪资范围']) <= set(raw['薪资范围'])
+
+
+def test_check_regressions_keys_on_dataset():
+    def result(dataset, seconds):
+        return {'dataset': dataset, 'size': 1000, 'group': 'clean', 'step': 'clean', 'median_seconds': seconds}
+    # 旧基线没有 dataset 字段，按 jobs 处理
+    baseline = {'results': [{k: v for k, v in result('jobs', 0.1).items() if k != 'dataset'},
+                            result('overview', 0.1)]}
+    regressions = benchmark.check_regressions([result('jobs', 0.2), result('overview', 0.11)], baseline, 0.25)
+    assert [(r['dataset'], round(r['ratio'], 1)) for r in regressions] == [('jobs', 2.0)]
+    # 低于计时噪声阈值的步骤不参与比较
+    assert benchmark.check_regressions([result('jobs', 0.004)], {'results': [result('jobs', 0.001)]}, 0.25) == []
+
+
+def test_benchmark_runs_end_to_end(raw, tmp_path):
+    recorder = benchmark.Recorder(repeat=1)
+    benchmark.run_size(recorder, raw, 300, str(tmp_path))
+    steps = {(r['dataset'], r['group'], r['step']) for r in recorder.results}
+    assert ('jobs', 'clean', 'normalize_city') in steps
+    assert ('overview', 'clean', 'classify_duration') in steps
+    assert ('overview', 'filter', 'combined') in steps
@@ -0,0 +1,79 @@
+import numpy as np
+import plotly.graph_objects as go
+import pytest
+
+pytest.importorskip('streamlit')
+
+from chart_payload import MIN_POINTS, downsample, payload_size, trace_size  # noqa: E402
+
+
+def scatter(n, seed=0, **kwargs):
+    rng = np.random.default_rng(seed)
+    return go.Scatter(x=np.arange(n), y=rng.random(n) * 300, text=[f'职位{i}' for i in range(n)],
+                      mode='markers', marker=dict(size=rng.integers(5, 20, n)), **kwargs)
+
+
+def actual_size(trace):
+    return len(go.Figure([trace]).to_json().encode('utf-8'))
+
+
+@pytest.mark.parametrize('n', [500, 20_000])
+def test_estimate_close_to_json_size(n):
+    trace = scatter(n)
+    assert trace_size(trace) == pytest.approx(actual_size(trace), rel=0.25)
+
+
+def test_only_scatter_traces_counted():
+    rng = np.random.default_rng(0)
+    fig = go.Figure([go.Histogram(x=rng.random(50_000)), go.Box(y=rng.random(50_000))])
+    assert payload_size(fig) == 0
+    fig.add_trace(scatter(1_000))
+    assert payload_size(fig) == trace_size(fig.data[-1])
+
+
+def test_shared_values_not_counted_per_point():
+    trace = go.Scatter(x=np.arange(1_000), y=np.arange(1_000), text='同一个值', marker=dict(color='red'))
+    plain = go.Scatter(x=np.arange(1_000), y=np.arange(1_000))
+    assert trace_size(trace) == trace_size(plain)
+    assert trace_size(go.Scatter()) == 0
+
+
+def test_under_limit_untouched():
+    fig = go.Figure(scatter(1_000))
+    size, sent, notes = downsample(fig, limit=10 ** 9)
+    assert size == sent and notes == []
+    assert len(fig.data[0].x) == 1_000 and fig.data[0].type == 'scatter'
+
+
+def test_downsample_keeps_points_aligned():
+    fig = go.Figure(scatter(50_000, name='离群点'))
+    size, sent, notes = downsample(fig, limit=200_000)
+    trace = fig.data[0]
+    assert size > 200_000
+    assert sent <= 200_000 * 1.1
+    assert MIN_POINTS <= len(trace.x) < 50_000
+    assert notes[0].startswith('离群点 抽样 50,000 → ')
+    # 抽样后保持原有顺序，逐点属性同步截取
+    assert (np.diff(trace.x) > 0).all()
+    assert list(trace.text) == [f'职位{i}' for i in trace.x]
+    assert len(trace.y) == len(trace.marker.size) == len(trace.x)
+
+
+def test_large_scatter_switches_to_webgl():
+    fig = go.Figure([go.Histogram(x=np.arange(10)), scatter(50_000)])
+    _, _, notes = downsample(fig, limit=500_000)
+    assert [trace.type for trace in fig.data] == ['histogram', 'scattergl']
+    assert any('WebGL' in note for note in notes)
+
+
+def test_min_points_kept():
+    fig = go.Figure(scatter(5_000))
+    downsample(fig, limit=1)
+    assert len(fig.data[0].x) == MIN_POINTS
+
+
+def test_downsample_is_deterministic():
+    first, second = go.Figure(scatter(20_000)), go.Figure(scatter(20_000))
+    downsample(first, limit=100_000)
+    downsample(second, limit=100_000)
+    np.testing.assert_array_equal(first.data[0].x, second.data[0].x)
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics import cities, jobs, overview
+from analytics.cities import CityNormalizer, default_city_normalizer, gazetteer_aliases
+
+
+@pytest.mark.parametrize('location, city', [
+    ('北京', '北京'),
+    ('北京市-海淀区', '北京'),
+    ('北京市朝阳区', '北京'),
+    ('徐州市,连云港市', '徐州'),
+    ('  上海 ', '上海'),
+    ('苏州工业园区', '苏州'),
+    ('延边朝鲜族自治州', '延边'),
+    ('海南藏族自治州', '海南州'),
+    ('锡林郭勒盟', '锡林郭勒'),
+    # 省名与城市同名时取省后面的城市
+    ('吉林省长春市', '长春'),
+    ('吉林省吉林市', '吉林'),
+    # 后面紧跟“区/县”的是区县名，不当作城市
+    ('朝阳区', '朝阳区'),
+    ('Remote-远程', 'Remote'),
+    ('海外', '海外'),
+])
+def test_normalize(location, city):
+    assert default_city_normalizer().normalize(location) == city
+
+
+def test_missing_location():
+    normalizer = default_city_normalizer()
+    assert normalizer.normalize(None) is None
+    assert normalizer.normalize(np.nan) is None
+
+
+def test_every_alias_maps_to_itself():
+    aliases = gazetteer_aliases()
+    normalizer = CityNormalizer(aliases)
+    for alias, short in aliases.items():
+        assert normalizer.normalize(alias) == short, alias
+
+
+def test_normalize_series_matches_per_value():
+    locations = pd.Series(['北京市', None, '上海-浦东', '北京市', '杭州', np.nan, '杭州'], index=range(5, 12))
+    normalizer = default_city_normalizer()
+    result = normalizer.normalize_series(locations)
+    assert result.index.equals(locations.index)
+    expected = [normalizer.normalize(value) for value in locations]
+    assert [None if pd.isna(city) else city for city in result] == expected
+
+
+def test_memo_is_bounded(monkeypatch):
+    monkeypatch.setattr(cities, 'MEMO_SIZE', 3)
+    normalizer = CityNormalizer(gazetteer_aliases())
+    for location in ['北京', '上海', '广州', '深圳', '杭州']:
+        normalizer.normalize(location)
+    assert len(normalizer._memo) <= 3
+    assert normalizer.normalize('北京') == '北京'
+
+
+@pytest.mark.parametrize('module, data', [(jobs, 'jobs_data'), (overview, 'overview_data')])
+def test_city_filter(module, data, request):
+    df, indexes = request.getfixturevalue(data)
+    # 不选城市等于不限
+    for selected in (None, []):
+        np.testing.assert_array_equal(module.filter(df, indexes, cities=selected), np.arange(len(df)))
+    top = df['城市'].value_counts().index[:2].tolist()
+    expected = np.flatnonzero(df['城市'].isin(top).to_numpy())
+    np.testing.assert_array_equal(module.filter(df, indexes, cities=top), expected)
+    assert len(module.filter(df, indexes, cities=['不存在的城市'])) == 0
@@ -0,0 +1,91 @@
+import asyncio
+import csv
+import json
+import os
+from urllib.parse import urlencode
+
+import pytest
+
+import crawler
+from analytics.overview import EXPECTED_COLUMNS
+
+DETAIL = '''<html><body>
+<div class="new_job_name"><span>大数据开发实习生</span></div>
+<span class="job_money">200-300/天</span>
+<a class="com-name">某科技公司</a>
+<span class="job_position">北京</span>
+<span class="job_academic">本科</span>
+<span class="job_week">4天/周</span>
+<span class="job_time">实习6个月</span>
+<div class="job_good_list"><span>餐补</span><span>五险一金</span></div>
+<div class="job_detail"><p>负责 Spark 数据开发</p><p>熟悉 Python<br>熟悉 SQL</p></div>
+</body></html>'''
+
+
+def listing(*job_ids):
+    return ''.join(f'<a href="/intern/{job_id}?pcm=pc_SearchList">{job_id}</a>' for job_id in job_ids * 2)
+
+
+def test_parse_listing_dedupes_in_order():
+    assert crawler.parse_listing(listing('inn_b', 'inn_a')) == [
+        ('inn_b', '/intern/inn_b?pcm=pc_SearchList'), ('inn_a', '/intern/inn_a?pcm=pc_SearchList')]
+
+
+def test_parse_detail():
+    row = crawler.parse_detail(DETAIL, 'inn_a', 'https://www.shixiseng.com/intern/inn_a')
+    assert list(row) == EXPECTED_COLUMNS
+    assert row['职位标题'] == '大数据开发实习生'
+    assert row['薪资范围'] == '200-300/天'
+    assert row['福利待遇'] == '餐补；五险一金'
+    assert row['职位描述'] == '负责 Spark 数据开发\n熟悉 Python\n熟悉 SQL'
+    assert row['职位id'] == 'inn_a'
+    # 页面中没有的字段为空字符串
+    assert row['截止日期'] == ''
+
+
+@pytest.fixture
+def site(tmp_path):
+    """本地回放服务：两页列表、三个详情页，其中 inn_c 的详情页缺失（404）"""
+    pages = tmp_path / 'pages'
+    pages.mkdir()
+    listings = {1: listing('inn_a', 'inn_b'), 2: listing('inn_b', 'inn_c')}
+    for page, html in listings.items():
+        path = f"{crawler.LIST_PATH}?{urlencode({'keyword': '数据', 'page': page})}"
+        (pages / crawler.fixture_name(path)).write_text(html, encoding='utf-8')
+    for job_id in ('inn_a', 'inn_b'):
+        path = f'/intern/{job_id}?pcm=pc_SearchList'
+        (pages / crawler.fixture_name(path)).write_text(DETAIL.replace('北京', job_id), encoding='utf-8')
+    server, base_url = crawler.fixture_server(str(pages))
+    yield base_url
+    server.shutdown()
+
+
+def run(base_url, tmp_path):
+    output, checkpoint = tmp_path / 'out.csv', tmp_path / 'checkpoint.json'
+    result = asyncio.run(crawler.crawl('数据', 2, str(output), base_url, str(checkpoint), log=lambda _: None,
+                                       concurrency=4, rate=1000, retries=0, timeout=5))
+    with open(output, newline='', encoding='utf-8-sig') as f:
+        rows = list(csv.DictReader(f))
+    return result, rows, json.loads(checkpoint.read_text(encoding='utf-8'))
+
+
+def test_crawl_and_resume(site, tmp_path):
+    (written, failed), rows, state = run(site, tmp_path)
+    assert (written, failed) == (2, 1)
+    assert sorted(row['职位id'] for row in rows) == ['inn_a', 'inn_b']
+    assert {row['工作地点'] for row in rows} == {'inn_a', 'inn_b'}
+    # 写入 CSV 的是站点链接，不是回放地址
+    assert all(row['详情页url'].startswith(crawler.SITE_URL) for row in rows)
+    assert state['pages'] == [1, 2]
+    assert list(state['failed']) == [f'{crawler.SITE_URL}/intern/inn_c?pcm=pc_SearchList']
+
+    # 续爬：已写入的职位跳过，只重试失败的链接
+    (written, failed), rows, _ = run(site, tmp_path)
+    assert (written, failed) == (0, 1)
+    assert len(rows) == 2
+
+
+def test_default_output_is_untracked():
+    assert crawler.DEFAULT_OUTPUT == 'crawl_output.csv'
+    with open(os.path.join(os.path.dirname(crawler.__file__), '.gitignore'), encoding='utf-8') as f:
+        assert '/crawl_output.csv' in f.read().split()
@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics import jobs, overview
+from analytics.cube import BOX_COLUMNS, OlapCube, weighted_quantile
+
+
+@pytest.fixture(params=['jobs', 'overview'])
+def dataset(request, jobs_data, overview_data):
+    return {'jobs': (jobs, *jobs_data), 'overview': (overview, *overview_data)}[request.param]
+
+
+def slices(module, df):
+    """(维度条件, 薪资区间, 对应行的度量列)：整表、两个城市、城市 + 薪资区间"""
+    measure = df[module.MEASURE]
+    cities = df['城市'].value_counts().index[:2].tolist()
+    in_cities = df['城市'].isin(cities)
+    return [
+        ({}, None, measure),
+        ({'城市': cities}, None, measure[in_cities]),
+        ({'城市': cities}, (100, 300), measure[in_cities & measure.between(100, 300)]),
+    ]
+
+
+def test_describe_and_quantiles_match_pandas(dataset):
+    module, df, indexes = dataset
+    for filters, salary, values in slices(module, df):
+        view = indexes.cube.slice(filters, salary)
+        values = values.dropna()
+        assert len(view) == len(values)
+        pd.testing.assert_series_equal(view.describe(), values.describe().astype(float), check_names=False)
+        for q in (0, 0.1, 0.25, 0.5, 0.9, 1):
+            assert view.quantile(q) == pytest.approx(values.quantile(q))
+
+
+def test_histogram_matches_numpy(dataset):
+    module, df, indexes = dataset
+    for filters, salary, values in slices(module, df):
+        values = values.dropna().to_numpy(dtype=float)
+        for bins in (1, 7, 40):
+            hist = indexes.cube.slice(filters, salary).histogram(bins)
+            counts, edges = np.histogram(values, bins=bins)
+            np.testing.assert_array_equal(hist['count'], counts)
+            np.testing.assert_allclose(hist['left'], edges[:-1])
+            np.testing.assert_allclose(hist['right'], edges[1:])
+
+
+def expected_box(values):
+    q1, median, q3 = values.quantile([0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    inside = values.between(q1 - 1.5 * iqr, q3 + 1.5 * iqr)
+    return [len(values), q1, median, q3, values[inside].min(), values[inside].max(), values.mean(),
+            values.std() if len(values) > 1 else 0.0, sorted(values[~inside].unique())]
+
+
+def assert_box_row(row, values):
+    expected = expected_box(values)
+    np.testing.assert_allclose(row[BOX_COLUMNS[:-1]].to_numpy(dtype=float), expected[:-1])
+    assert row['outliers'] == expected[-1]
+
+
+def test_box_stats_match_pandas(dataset):
+    module, df, indexes = dataset
+    for filters, salary, values in slices(module, df):
+        box = indexes.cube.slice(filters, salary).box_stats()
+        assert box.index.tolist() == [module.MEASURE]
+        assert_box_row(box.iloc[0], values.dropna())
+
+
+def test_box_stats_by_dimension(dataset):
+    module, df, indexes = dataset
+    dim = module.CUBE_DIMENSIONS[1]
+    box = indexes.cube.slice().box_stats(dim)
+    groups = df.dropna(subset=[module.MEASURE]).groupby(dim, observed=True)[module.MEASURE]
+    assert box.index.name == dim
+    assert sorted(box.index) == sorted(groups.groups)
+    for name, values in groups:
+        assert_box_row(box.loc[name], values)
+
+
+def test_empty_slice(dataset):
+    module, _, indexes = dataset
+    view = indexes.cube.slice(measure_range=(-2, -1))
+    assert len(view) == 0
+    assert np.isnan(view.mean()) and np.isnan(view.median())
+    assert view.describe()['count'] == 0
+    assert view.histogram().empty
+    assert view.box_stats().empty
+    assert view.box_stats(module.CUBE_DIMENSIONS[0]).empty
+    assert view.counts('城市').empty
+
+
+def test_single_value_slice():
+    df = pd.DataFrame({'城市': pd.Categorical(['北京', '北京', '上海']), 'salary': [200, 200, 300]})
+    cube = OlapCube(df, ['城市'], 'salary')
+    # 与 Series.describe 一致：只有一行时 std 为 NaN
+    assert np.isnan(cube.slice({'城市': ['上海']}).describe()['std'])
+    assert cube.slice({'城市': ['上海']}).box_stats().iloc[0]['sd'] == 0
+    view = cube.slice({'城市': ['北京']})
+    assert view.describe()['std'] == 0
+    box = view.box_stats()
+    assert box.iloc[0]['count'] == 2 and box.iloc[0]['sd'] == 0 and box.iloc[0]['outliers'] == []
+    hist = view.histogram(5)
+    assert hist['count'].sum() == 2
+
+
+def test_weighted_quantile_matches_repeat():
+    values, counts = np.array([1.0, 2.0, 5.0, 9.0]), np.array([3, 1, 4, 2])
+    repeated = pd.Series(np.repeat(values, counts))
+    for q in np.linspace(0, 1, 11):
+        assert weighted_quantile(values, counts, q) == pytest.approx(repeated.quantile(q))
+    assert np.isnan(weighted_quantile(values, np.zeros(4, dtype=int), 0.5))
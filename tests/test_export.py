@@ -0,0 +1,84 @@
+import gzip
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics import jobs, overview
+from analytics.export import EXPORT_FORMATS, available_formats, export_bytes
+from analytics.tag_index import python_lists
+
+CHUNK_SIZE = 50
+
+
+def read_back(content, fmt):
+    """把导出内容读回 DataFrame，CSV 按字符串读取"""
+    if fmt == 'Parquet':
+        return pd.read_parquet(io.BytesIO(content))
+    if fmt == 'CSV（gzip 压缩）':
+        content = gzip.decompress(content)
+    assert content.startswith(b'\xef\xbb\xbf')
+    return pd.read_csv(io.BytesIO(content), encoding='utf-8-sig', dtype=str, keep_default_na=False)
+
+
+def expected_rows(module, df, positions):
+    """不经过分页表格，直接在筛选结果上格式化，作为导出的对照"""
+    rows = python_lists(df.iloc[positions][list(module.TABLE_COLUMNS)])
+    for column, formatter in module.TABLE_FORMATTERS.items():
+        rows[column] = rows[column].map(formatter)
+    # 分类列导出的是取值本身
+    for column in rows.select_dtypes('category'):
+        rows[column] = rows[column].astype(rows[column].cat.categories.dtype)
+    return rows.rename(columns=module.TABLE_COLUMNS).reset_index(drop=True)
+
+
+def as_text(df):
+    """CSV 读回后都是字符串，对照也转成 CSV 的写法"""
+    return pd.read_csv(io.StringIO(df.to_csv(index=False)), dtype=str, keep_default_na=False)
+
+
+def test_available_formats():
+    assert available_formats() == list(EXPORT_FORMATS)
+    with pytest.raises(ValueError):
+        export_bytes([], 'XLSX')
+
+
+@pytest.mark.parametrize('fmt', list(EXPORT_FORMATS))
+@pytest.mark.parametrize('module, data, criteria, tags', [
+    (jobs, 'jobs_data', {'salary_range': (150, 400)}, 'matched_skills'),
+    (overview, 'overview_data', {'education': ['本科']}, '技能标签'),
+])
+def test_round_trip_matches_filtered_view(module, data, criteria, tags, fmt, request):
+    df, indexes = request.getfixturevalue(data)
+    column = next(iter(module.SORT_COLUMNS.values()))
+    positions = indexes.sort.order(module.filter(df, indexes, **criteria), column, ascending=False)
+    assert 2 * CHUNK_SIZE < len(positions) < len(df)
+    table = module.table(df, positions)
+
+    result = read_back(export_bytes(table.chunks(CHUNK_SIZE), fmt), fmt)
+    expected = expected_rows(module, df, positions)
+    if fmt == 'Parquet':
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+    else:
+        pd.testing.assert_frame_equal(result, as_text(expected))
+    # 列表列按格式化函数拼接成文本
+    assert all(isinstance(value, str) for value in result[module.TABLE_COLUMNS[tags]])
+
+
+def test_parquet_keeps_list_columns():
+    chunks = [pd.DataFrame({'tags': [['python', 'sql'], []], 'note': [None, None]}),
+              pd.DataFrame({'tags': [['spark']], 'note': ['备注']})]
+    result = pd.read_parquet(io.BytesIO(export_bytes(chunks, 'Parquet')))
+    assert [list(tags) for tags in result['tags']] == [['python', 'sql'], [], ['spark']]
+    # 首块全空的列按字符串写出，后续分块的文本照常保留
+    assert result['note'].tolist()[2] == '备注'
+    assert result['note'].isna().tolist() == [True, True, False]
+
+
+@pytest.mark.parametrize('fmt', ['CSV', 'CSV（gzip 压缩）'])
+def test_csv_header_written_once(fmt):
+    chunks = (pd.DataFrame({'a': np.arange(i, i + 2), 'b': ['x', '逗号,引号"']}) for i in (0, 2, 4))
+    result = read_back(export_bytes(chunks, fmt), fmt)
+    assert result['a'].tolist() == ['0', '1', '2', '3', '4', '5']
+    assert result['b'].tolist() == ['x', '逗号,引号"'] * 3
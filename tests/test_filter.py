@@ -0,0 +1,158 @@
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics import jobs, overview
+from analytics.selection import Indexes
+
+# 英文/数字词的边界，与 text_index 的切词规则一致
+WORD_CHARS = 'a-z0-9+#'
+
+
+def keyword_mask(df, fields, query):
+    """关键词的逐行对照：中文各二元组（或单字）均为子串，英文为整词，最后一个英文词按词首前缀"""
+    text = df[list(fields)].fillna('').astype(str).agg('\n'.join, axis=1).str.lower()
+    mask = np.ones(len(df), dtype=bool)
+    words = query.lower().split()
+    for i, word in enumerate(words):
+        if '一' <= word[0] <= '鿿':
+            for gram in [word[j:j + 2] for j in range(max(1, len(word) - 1))]:
+                mask &= text.str.contains(gram, regex=False).to_numpy()
+        else:
+            end = '' if i == len(words) - 1 else f'(?![{WORD_CHARS}])'
+            mask &= text.str.contains(f'(?<![{WORD_CHARS}]){re.escape(word)}{end}').to_numpy()
+    return mask
+
+
+def has_all(column, tags):
+    return column.map(lambda x: all(tag in x for tag in tags)).to_numpy(dtype=bool)
+
+
+def has_any(column, tags):
+    return column.map(lambda x: any(tag in x for tag in tags)).to_numpy(dtype=bool)
+
+
+def jobs_mask(df, cities=None, education='全部', duration='全部', salary_range=None, skills=None,
+              welfare=None, keywords=None):
+    mask = np.ones(len(df), dtype=bool)
+    if cities:
+        mask &= df['城市'].isin(cities).to_numpy()
+    if education in jobs.EDUCATION_HIERARCHY:
+        mask &= df['学历要求'].isin(jobs.EDUCATION_HIERARCHY[education]).to_numpy()
+    if duration != '全部':
+        mask &= (df['duration_months'] >= int(re.findall(r'\d+', duration)[0])).to_numpy()
+    if salary_range is not None:
+        mask &= df['avg_salary'].between(*salary_range).to_numpy()
+    if skills:
+        mask &= has_all(df['matched_skills'], skills)
+    if welfare:
+        mask &= has_any(df['welfare_tags'], welfare)
+    if keywords:
+        mask &= keyword_mask(df, jobs.TEXT_FIELDS, keywords)
+    return mask
+
+
+def overview_mask(df, cities=None, salary_range=None, education=None, durations=None, skills=None,
+                  welfare=None, keywords=None):
+    mask = np.ones(len(df), dtype=bool)
+    for column, values in [('城市', cities), ('学历分类', education), ('实习时长分类', durations)]:
+        if values:
+            mask &= df[column].isin(values).to_numpy()
+    if salary_range is not None:
+        mask &= df['平均薪资'].between(*salary_range).to_numpy()
+    if skills:
+        mask &= has_all(df['技能标签'], skills)
+    if welfare:
+        mask &= has_any(df['福利标签'], welfare)
+    if keywords:
+        mask &= keyword_mask(df, overview.TEXT_FIELDS, keywords)
+    return mask
+
+
+def jobs_cases(df, indexes):
+    cities = df['城市'].value_counts().index[:2].tolist()
+    skills = indexes.skills.counts().index[:2].tolist()
+    welfare = indexes.welfare.counts().index[1:3].tolist()
+    return [
+        {},
+        {'cities': []},
+        {'cities': cities, 'education': '本科'},
+        {'education': '硕士', 'duration': '6个月'},
+        {'salary_range': (150, 300), 'skills': skills},
+        {'welfare': welfare, 'cities': cities[:1]},
+        {'skills': skills[:1], 'welfare': welfare, 'salary_range': (100, 250)},
+        {'keywords': '数据'},
+        {'keywords': '据 开发', 'cities': cities},
+        {'keywords': 'python sq'},
+        {'keywords': 'flink', 'education': '不限'},
+        # 空结果
+        {'salary_range': (-2, -1)},
+        {'cities': ['不存在的城市'], 'skills': skills},
+        {'skills': ['不存在的技能']},
+        {'keywords': '完全不存在的词'},
+    ]
+
+
+def overview_cases(df, indexes):
+    cities = df['城市'].value_counts().index[:3].tolist()
+    skills = indexes.skills.counts().index[:2].tolist()
+    welfare = indexes.welfare.counts().index[:2].tolist()
+    return [
+        {},
+        {'cities': [], 'education': [], 'durations': []},
+        {'cities': cities, 'education': ['本科', '硕士']},
+        {'durations': ['3个月', '长期实习'], 'salary_range': (100, 300)},
+        {'skills': skills, 'welfare': welfare},
+        {'keywords': '数据 spark', 'cities': cities},
+        {'keywords': '分析'},
+        {'salary_range': (-2, -1)},
+        {'cities': ['不存在的城市']},
+    ]
+
+
+@pytest.mark.parametrize('case', range(15))
+def test_jobs_filter_matches_pandas(jobs_data, case):
+    df, indexes = jobs_data
+    criteria = jobs_cases(df, indexes)[case]
+    expected = np.flatnonzero(jobs_mask(df, **criteria))
+    np.testing.assert_array_equal(jobs.filter(df, indexes, **criteria), expected)
+    if not criteria.get('keywords'):
+        # 没有索引时逐行判断，结果相同
+        np.testing.assert_array_equal(jobs.filter(df, None, **criteria), expected)
+
+
+@pytest.mark.parametrize('case', range(9))
+def test_overview_filter_matches_pandas(overview_data, case):
+    df, indexes = overview_data
+    criteria = overview_cases(df, indexes)[case]
+    np.testing.assert_array_equal(overview.filter(df, indexes, **criteria),
+                                  np.flatnonzero(overview_mask(df, **criteria)))
+
+
+@pytest.mark.parametrize('module, data', [(jobs, 'jobs_data'), (overview, 'overview_data')])
+def test_substring_fallback_without_text_index(module, data, request):
+    df, indexes = request.getfixturevalue(data)
+    plain = Indexes(indexes.skills, indexes.welfare, indexes.cube, indexes.sort)
+    text = df[list(module.TEXT_FIELDS)].fillna('').astype(str).agg('\n'.join, axis=1).str.lower()
+    for query in ('数据 开发', 'Python', '完全不存在的词'):
+        expected = np.ones(len(df), dtype=bool)
+        for word in query.lower().split():
+            expected &= text.str.contains(word, regex=False).to_numpy()
+        np.testing.assert_array_equal(module.filter(df, plain, keywords=query), np.flatnonzero(expected))
+
+
+def test_empty_frame(jobs_data):
+    df, _ = jobs_data
+    empty = df.iloc[:0]
+    assert len(jobs.filter(empty, None, cities=['北京'], skills=['python'])) == 0
+    assert len(jobs.filter(empty, jobs.build_indexes(empty))) == 0
+
+
+def test_filter_returns_positions(jobs_data):
+    df, indexes = jobs_data
+    positions = jobs.filter(df, indexes, education='本科')
+    assert positions.dtype.kind == 'i'
+    assert (np.diff(positions) > 0).all()
+    assert isinstance(df.take(positions), pd.DataFrame)
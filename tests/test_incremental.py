@@ -0,0 +1,155 @@
+import os
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics import LiveDataset, jobs, overview
+from analytics.incremental import REMOVED, build_manifest, content_hashes, refresh
+from analytics.tag_index import python_lists
+from analytics.text_index import TextIndex
+
+pytest.importorskip('pyarrow')
+
+MODULES = [jobs, overview]
+
+
+def exports(raw):
+    """第一次导出 400 行；第二次下架 20 行、修改 10 行薪资、新增 60 行并打乱顺序"""
+    first = raw.iloc[:400].reset_index(drop=True)
+    second = pd.concat([first.iloc[20:], raw.iloc[400:460]], ignore_index=True)
+    second.loc[:9, '薪资范围'] = '300-400/天'
+    return first, second.sample(frac=1, random_state=0).reset_index(drop=True)
+
+
+def clean_function(module):
+    return partial(module.clean, skill_matcher=module.default_skill_matcher())
+
+
+def initial_state(module, raw):
+    clean = clean_function(module)
+    ids, hashes = raw[module.ID_COLUMN].astype(str).to_numpy(), content_hashes(raw)
+    df = clean(raw.copy())
+    return df, build_manifest(raw.index.to_numpy(), ids, hashes, df.index)
+
+
+def canonical(df):
+    """与行标签、行顺序无关的比较形式"""
+    df = df.copy()
+    for column in df.columns:
+        if df[column].map(lambda x: isinstance(x, list)).any():
+            df[column] = df[column].map(tuple)
+    return df.sort_values(['职位id', '职位标题'], kind='stable').reset_index(drop=True)
+
+
+@pytest.mark.parametrize('module', MODULES)
+def test_refresh_matches_full_reclean(module, raw):
+    first, second = exports(raw)
+    stored, manifest = initial_state(module, first)
+    df, new_manifest, delta = refresh(stored, manifest, second.copy(), clean_function(module),
+                                      module.CATEGORICAL_COLUMNS, module.ID_COLUMN)
+
+    expected = clean_function(module)(second.copy())
+    pd.testing.assert_frame_equal(canonical(df), canonical(expected))
+    assert delta.changed == 10
+    assert delta.unchanged == 370
+    assert len(new_manifest[new_manifest['state'] != REMOVED]) == len(second)
+    # 行标签不复用：新增行接在原有标签之后
+    assert delta.added.index.min() > stored.index.max()
+
+
+@pytest.mark.parametrize('module', MODULES)
+def test_refresh_without_changes_cleans_nothing(module, raw):
+    first, _ = exports(raw)
+    stored, manifest = initial_state(module, first)
+
+    def clean(df):
+        raise AssertionError("没有变化的行不应重新清洗")
+    df, _, delta = refresh(stored, manifest, first.sample(frac=1, random_state=1), clean,
+                           module.CATEGORICAL_COLUMNS, module.ID_COLUMN)
+    assert len(delta.added) == 0 and len(delta.removed) == 0 and delta.changed == 0
+    pd.testing.assert_frame_equal(df, stored)
+
+
+def assert_indexes_equal(module, updated, df):
+    rebuilt = module.build_indexes(df)
+    for name in ('skills', 'welfare'):
+        a, b = getattr(updated, name), getattr(rebuilt, name)
+        assert a.counts()[a.counts() > 0].to_dict() == b.counts().to_dict()
+        for tag in b.tags[:5]:
+            np.testing.assert_array_equal(np.asarray(a.any_of([tag])), np.asarray(b.any_of([tag])))
+    key = module.CUBE_DIMENSIONS + [module.MEASURE]
+    pd.testing.assert_frame_equal(updated.cube.cells.sort_values(key).reset_index(drop=True),
+                                  rebuilt.cube.cells.sort_values(key).reset_index(drop=True))
+    positions = np.arange(len(df))
+    for column in module.SORT_COLUMNS.values():
+        for ascending in (True, False):
+            np.testing.assert_array_equal(updated.sort.order(positions, column, ascending),
+                                          rebuilt.sort.order(positions, column, ascending))
+    for query in ('数据', 'python sql', '开发 sp'):
+        for a, b in zip(updated.text.scores(query), rebuilt.text.scores(query)):
+            np.testing.assert_allclose(a, b)
+
+
+@pytest.mark.parametrize('module', MODULES)
+@pytest.mark.parametrize('text_built', [False, True])
+def test_update_indexes_matches_rebuild(module, raw, text_built):
+    first, second = exports(raw)
+    stored, manifest = initial_state(module, first)
+    indexes = module.build_indexes(stored)
+    if not text_built:
+        # 加载时已建好倒排表；换成未构建的索引，覆盖按需构建前的更新路径
+        indexes.text = TextIndex(stored, module.TEXT_FIELDS)
+    df, _, delta = refresh(stored, manifest, second.copy(), clean_function(module),
+                           module.CATEGORICAL_COLUMNS, module.ID_COLUMN)
+    module.update_indexes(indexes, df, delta)
+    assert_indexes_equal(module, indexes, df)
+
+
+def test_jobs_update_rebuilds_recommender(raw):
+    first, second = exports(raw)
+    stored, manifest = initial_state(jobs, first)
+    indexes = jobs.build_indexes(stored)
+    df, _, delta = refresh(stored, manifest, second.copy(), clean_function(jobs),
+                           jobs.CATEGORICAL_COLUMNS, jobs.ID_COLUMN)
+    jobs.update_indexes(indexes, df, delta)
+    np.testing.assert_array_equal(indexes.recommender.features, jobs.build_indexes(df).recommender.features)
+
+
+@pytest.mark.parametrize('module', MODULES)
+def test_live_dataset_applies_delta_to_cached_indexes(module, raw, tmp_path):
+    first, second = exports(raw)
+    path = tmp_path / 'export.csv'
+    first.to_csv(path, index=False)
+    dataset = LiveDataset(module, str(path))
+    df, indexes = dataset.current()
+    assert dataset.last_delta is None
+    assert dataset.current()[1] is indexes
+
+    second.to_csv(path, index=False)
+    os.utime(path, ns=(os.stat(path).st_mtime_ns + 10**9,) * 2)
+    df2, indexes2 = dataset.current()
+    # 差量应用在索引副本上并整体替换，旧的 (整表, 索引) 保持一致
+    assert indexes2 is not indexes
+    assert dataset.last_delta is not None and dataset.last_delta.changed == 10
+    assert len(df2) == len(clean_function(module)(second.copy()))
+    assert_indexes_equal(module, indexes2, df2)
+    assert_indexes_equal(module, indexes, df)
+
+
+def test_renamed_headers_load_and_refresh(raw, tmp_path):
+    # 表头名称不同但列数一致的导出按位置重命名，台账照常记录
+    first, second = exports(raw)
+    path = tmp_path / 'renamed.csv'
+    first.set_axis([f'列{i}' for i in range(first.shape[1])], axis=1).to_csv(path, index=False)
+    dataset = LiveDataset(overview, str(path))
+    df, _ = dataset.current()
+    pd.testing.assert_frame_equal(canonical(df), canonical(clean_function(overview)(first.copy())))
+
+    second.set_axis([f'列{i}' for i in range(second.shape[1])], axis=1).to_csv(path, index=False)
+    os.utime(path, ns=(os.stat(path).st_mtime_ns + 10**9,) * 2)
+    df, indexes = dataset.current()
+    assert dataset.last_delta is not None and dataset.last_delta.changed == 10
+    pd.testing.assert_frame_equal(canonical(python_lists(df)), canonical(clean_function(overview)(second.copy())))
+    assert_indexes_equal(overview, indexes, df)
@@ -0,0 +1,55 @@
+from functools import partial
+
+import numpy as np
+import pytest
+
+from analytics import jobs, overview
+from analytics.ingest import text_columns
+from analytics.loader import load_cleaned
+
+pytest.importorskip('pyarrow')
+
+
+def load(module, path, **kwargs):
+    return load_cleaned(path, partial(module.clean, skill_matcher=module.default_skill_matcher()),
+                        module.CLEAN_VERSION, module.CATEGORICAL_COLUMNS, **kwargs)
+
+
+@pytest.mark.parametrize('module', [jobs, overview])
+def test_streaming_matches_in_memory(module, sample_csv):
+    plain = load(module, sample_csv)
+    streamed = load(module, sample_csv, salt='stream', streaming_threshold=0)
+    assert '职位描述' not in streamed.columns
+    assert len(streamed) == len(plain)
+    assert streamed['职位标题'].tolist() == plain['职位标题'].tolist()
+
+
+@pytest.mark.parametrize('module', [jobs, overview])
+def test_streaming_text_store_feeds_keyword_search(module, sample_csv):
+    plain = load(module, sample_csv)
+    streamed = load(module, sample_csv, salt='stream', streaming_threshold=0)
+    texts = text_columns(streamed, module.TEXT_FIELDS)
+    assert texts['职位描述'].tolist() == plain['职位描述'].tolist()
+
+    indexes = module.build_indexes(streamed)
+    assert indexes.text is not None
+    expected = module.filter(plain, module.build_indexes(plain), keywords='python')
+    assert 0 < len(expected) < len(plain)
+    np.testing.assert_array_equal(module.filter(streamed, indexes, keywords='python'), expected)
+
+
+def test_substring_fallback_reads_text_store(sample_csv):
+    plain = load(jobs, sample_csv)
+    streamed = load(jobs, sample_csv, salt='stream', streaming_threshold=0)
+    np.testing.assert_array_equal(jobs.filter(streamed, None, keywords='python'),
+                                  jobs.filter(plain, None, keywords='python'))
+
+
+@pytest.mark.parametrize('module', [jobs, overview])
+def test_keywords_without_text_raise(module, sample_csv):
+    streamed = load(module, sample_csv, salt='stream', streaming_threshold=0)
+    streamed.attrs.pop('text_store')
+    indexes = module.build_indexes(streamed)
+    assert indexes.text is None
+    with pytest.raises(ValueError):
+        module.filter(streamed, indexes, keywords='python')
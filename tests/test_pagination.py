@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics import jobs, overview
+from analytics.pagination import PagedTable, SortIndex
+
+
+def expected_order(df, positions, column, ascending):
+    """在筛选结果上直接排序，作为预排序抽取的对照"""
+    rows = df.iloc[positions]
+    ordered = rows.sort_values(column, ascending=ascending, kind='stable', na_position='last')
+    return df.index.get_indexer(ordered.index)
+
+
+@pytest.mark.parametrize('module, data', [(jobs, 'jobs_data'), (overview, 'overview_data')])
+@pytest.mark.parametrize('ascending', [True, False])
+def test_order_matches_sort_values(module, data, ascending, request):
+    df, indexes = request.getfixturevalue(data)
+    subset = np.flatnonzero(np.random.default_rng(0).random(len(df)) < 0.3)
+    for positions in (np.arange(len(df)), subset):
+        for column in module.SORT_COLUMNS.values():
+            np.testing.assert_array_equal(indexes.sort.order(positions, column, ascending),
+                                          expected_order(df, positions, column, ascending), err_msg=column)
+        np.testing.assert_array_equal(indexes.sort.order(positions), positions)
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        'salary': [300.0, np.nan, 100.0, 200.0, np.nan, 100.0, 250.0],
+        'city': pd.Categorical(['上海', '北京', None, '上海', '深圳', '北京', None],
+                               categories=['北京', '上海', '深圳']),
+        'title': ['b', 'a', None, 'c', 'a', 'd', 'b'],
+        'tags': [['x'], [], ['y', 'z'], [], ['x'], [], ['z']],
+    }, index=[10, 11, 12, 13, 14, 15, 16])
+
+
+@pytest.mark.parametrize('column', ['salary', 'city', 'title'])
+@pytest.mark.parametrize('ascending', [True, False])
+def test_nan_sorted_last(frame, column, ascending):
+    index = SortIndex(frame, ['salary', 'city', 'title'])
+    order = index.order(np.arange(len(frame)), column, ascending)
+    np.testing.assert_array_equal(order, expected_order(frame, np.arange(len(frame)), column, ascending))
+    missing = frame[column].isna().to_numpy()[order]
+    assert not missing[:len(order) - missing.sum()].any()
+
+
+def test_descending_keeps_ties_in_row_order(frame):
+    index = SortIndex(frame, ['salary'])
+    # 100.0 出现在第 2、5 行，降序时仍按行顺序排列，缺失值在最后
+    np.testing.assert_array_equal(index.order(np.arange(7), 'salary', ascending=False), [0, 6, 3, 2, 5, 1, 4])
+    np.testing.assert_array_equal(index.positions([13, 10, 99]), [3, 0, -1])
+
+
+def test_pages(frame):
+    positions = SortIndex(frame, ['salary']).order(np.arange(len(frame)), 'salary', ascending=False)
+    table = PagedTable(frame, positions, {'salary': '日薪', 'tags': '标签'}, {'tags': ', '.join})
+    assert len(table) == 7
+    assert table.page_count(3) == 3
+    assert table.page_count(7) == 1
+
+    first, last = table.page(1, 3), table.page(3, 3)
+    assert first.columns.tolist() == ['日薪', '标签']
+    assert first['日薪'].tolist() == [300.0, 250.0, 200.0]
+    assert first['标签'].tolist() == ['x', 'z', '']
+    # 最后一页只有剩下的一行，行索引接着前面的序号
+    assert last.index.tolist() == [6]
+    assert last['日薪'].isna().all()
+    # 页码越界时取第一页或最后一页
+    pd.testing.assert_frame_equal(table.page(0, 3), first)
+    pd.testing.assert_frame_equal(table.page(99, 3), last)
+
+    pages = pd.concat([table.page(n, 3) for n in range(1, 4)])
+    pd.testing.assert_frame_equal(pages, pd.concat(table.chunks(chunk_size=2)))
+    assert pages.index.tolist() == list(range(7))
+
+
+def test_empty_table(frame):
+    table = PagedTable(frame, np.zeros(0, dtype=np.int64), {'salary': '日薪'})
+    assert table.page_count(20) == 1
+    assert table.page(1, 20).empty
+    assert list(table.chunks()) == []
+
+
+@pytest.mark.parametrize('module, data', [(jobs, 'jobs_data'), (overview, 'overview_data')])
+def test_page_boundaries(module, data, request):
+    df, indexes = request.getfixturevalue(data)
+    column = next(iter(module.SORT_COLUMNS.values()))
+    positions = indexes.sort.order(np.arange(len(df)), column, ascending=False)
+    table = module.table(df, positions)
+    page_size = 37
+    pages = [table.page(n, page_size) for n in range(1, table.page_count(page_size) + 1)]
+    assert [len(page) for page in pages[:-1]] == [page_size] * (len(pages) - 1)
+    assert len(pages[-1]) == len(df) - page_size * (len(pages) - 1)
+    combined = pd.concat(pages)
+    assert combined.index.tolist() == list(range(len(df)))
+    label = module.TABLE_COLUMNS[column]
+    expected = df.iloc[expected_order(df, np.arange(len(df)), column, False)][column]
+    np.testing.assert_array_equal(combined[label].to_numpy(dtype=float), expected.to_numpy(dtype=float))
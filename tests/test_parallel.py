@@ -0,0 +1,34 @@
+from functools import partial
+
+import pandas as pd
+import pytest
+
+from analytics import jobs, overview
+from analytics.parallel import clean_parallel, resolve_workers
+
+
+def test_resolve_workers(monkeypatch):
+    monkeypatch.delenv('CLEAN_WORKERS', raising=False)
+    assert resolve_workers() == 1
+    monkeypatch.setenv('CLEAN_WORKERS', '3')
+    assert resolve_workers() == 3
+    assert resolve_workers(2) == 2
+    assert resolve_workers(0) >= 1
+
+
+@pytest.mark.parametrize('module', [jobs, overview])
+def test_parallel_clean_matches_single_process(module, raw):
+    clean = partial(module.clean, skill_matcher=module.default_skill_matcher())
+    expected = clean(raw.head(600).copy())
+    result = clean_parallel(raw.head(600).copy(), clean, module.CATEGORICAL_COLUMNS, workers=3,
+                            min_partition_rows=200)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_small_frames_are_not_partitioned(raw):
+    def clean(df):
+        clean.calls += 1
+        return df
+    clean.calls = 0
+    clean_parallel(raw.head(100), clean, {}, workers=4)
+    assert clean.calls == 1
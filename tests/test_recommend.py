@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics import jobs
+
+ZERO = {'salary': 0, 'skills': 0, 'welfare': 0, 'match': 0}
+
+
+def legacy(rows, weights, top_n=10):
+    """不用特征矩阵的逐列打分，作为对照"""
+    return jobs.recommend(rows, top_n=top_n, weights=weights)
+
+
+def fast(df, indexes, positions, weights, top_n=10, my_skills=None):
+    return jobs.recommend(df, top_n=top_n, weights=weights, recommender=indexes.recommender,
+                          my_skills=my_skills, positions=positions)
+
+
+@pytest.mark.parametrize('weights', [jobs.RECOMMEND_WEIGHTS, {'salary': 0, 'skills': 100, 'welfare': 0},
+                                     {'salary': 10, 'skills': 0, 'welfare': 90}])
+def test_matches_legacy_ranking(jobs_data, weights):
+    df, indexes = jobs_data
+    # 旧版在权重为 0 时也会因日薪缺失丢掉该行，对照时只取有日薪的行
+    positions = np.flatnonzero((df['城市'].isin(['北京', '上海']) & df['avg_salary'].notna()).to_numpy())
+    expected = legacy(df.iloc[positions], weights)
+    result = fast(df, indexes, positions, weights)
+    assert result.index.tolist() == expected.index.tolist()
+    np.testing.assert_allclose(result['推荐分数'], expected['推荐分数'])
+
+
+def test_all_weights_zero(jobs_data):
+    df, indexes = jobs_data
+    positions = np.arange(len(df))
+    result = fast(df, indexes, positions, ZERO)
+    # 全部同分时按行顺序取前 k 行，与 nlargest 一致
+    assert (result['推荐分数'] == 0).all()
+    assert result.index.tolist() == legacy(df, ZERO).index.tolist() == df.index[:10].tolist()
+
+
+def test_empty_selection(jobs_data):
+    df, indexes = jobs_data
+    result = fast(df, indexes, np.zeros(0, dtype=np.int64), jobs.RECOMMEND_WEIGHTS, my_skills=['python'])
+    assert result.empty
+    assert result.columns.tolist() == jobs.RECOMMEND_COLUMNS
+
+
+def test_fewer_rows_than_k(jobs_data):
+    df, indexes = jobs_data
+    positions = np.flatnonzero(df['avg_salary'].notna().to_numpy())[:3]
+    result = fast(df, indexes, positions, jobs.RECOMMEND_WEIGHTS)
+    assert sorted(result.index) == df.index[positions].tolist()
+
+
+def test_missing_salary_only_matters_when_weighted(jobs_data):
+    df, indexes = jobs_data
+    missing = np.flatnonzero(df['avg_salary'].isna().to_numpy())
+    if not len(missing):
+        pytest.skip('数据中没有缺失日薪的行')
+    scores = indexes.recommender.scores(np.arange(len(df)), jobs.RECOMMEND_WEIGHTS)
+    assert np.isnan(scores[missing]).all()
+    assert not np.isnan(np.delete(scores, missing)).any()
+    # 日薪权重为 0 时缺失日薪的行照常参与推荐
+    scores = indexes.recommender.scores(np.arange(len(df)), {'skills': 1, 'welfare': 1})
+    assert not np.isnan(scores).any()
+
+
+def test_skill_match_score(jobs_data):
+    df, indexes = jobs_data
+    my_skills = ['python', 'sql', 'spark', 'python']
+    positions = np.arange(len(df))
+    scores = indexes.recommender.scores(positions, {'match': 100}, my_skills)
+    matched = df['matched_skills'].apply(lambda skills: len({'python', 'sql', 'spark'} & set(skills)))
+    np.testing.assert_allclose(scores, matched.to_numpy() / 3 * 100)
+
+    result = fast(df, indexes, positions, dict(ZERO, match=100), top_n=5, my_skills=my_skills)
+    assert result['推荐分数'].tolist() == pd.Series(scores).nlargest(5).tolist()
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics.salary import WORK_DAYS_PER_MONTH, parse_salary_range
+
+
+def parse(*texts):
+    return parse_salary_range(pd.Series(texts, index=range(10, 10 + len(texts))))
+
+
+def test_daily_ranges():
+    result = parse('150-250/天', '300元/天', '200')
+    assert result['min'].tolist() == [150, 300, 200]
+    assert result['max'].tolist() == [250, 300, 200]
+    assert result['avg'].tolist() == [200, 300, 200]
+    assert result.index.tolist() == [10, 11, 12]
+
+
+def test_monthly_and_hourly_units():
+    result = parse('8k-10k/月', '100/时')
+    assert result['min'].tolist() == pytest.approx([8000 / WORK_DAYS_PER_MONTH, 800])
+    assert result['max'].tolist() == pytest.approx([10000 / WORK_DAYS_PER_MONTH, 800])
+
+
+def test_thousands_apply_to_both_ends():
+    result = parse('3-5K/月', '3K-5/月', '3k-5k/月')
+    expected = [3000 / WORK_DAYS_PER_MONTH, 5000 / WORK_DAYS_PER_MONTH]
+    for _, row in result.iterrows():
+        assert [row['min'], row['max']] == pytest.approx(expected)
+
+
+def test_thousands_without_unit_are_monthly():
+    result = parse('8k', '3-5K')
+    assert result['avg'].tolist() == pytest.approx([8000 / WORK_DAYS_PER_MONTH, 4000 / WORK_DAYS_PER_MONTH])
+
+
+def test_unparseable_and_missing():
+    result = parse('面议', None, np.nan)
+    assert result.isna().all().all()
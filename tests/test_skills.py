@@ -0,0 +1,71 @@
+import json
+
+import pandas as pd
+import pytest
+
+from analytics import jobs
+from analytics.skills import DEFAULT_SYNONYMS, SkillMatcher, load_skill_matcher
+
+
+@pytest.fixture(scope='module')
+def matcher():
+    return SkillMatcher(['Java', 'JavaScript', 'SQL', 'MySQL', 'Python', 'Spark', '数据仓库', 'C++'],
+                        DEFAULT_SYNONYMS)
+
+
+@pytest.mark.parametrize('text, skills', [
+    # 英文词边界：JavaScript 不算 Java，MySQL 不算 SQL
+    ('熟悉 JavaScript 与 MySQL', ['JavaScript', 'MySQL']),
+    ('会java，懂sql', ['Java', 'SQL']),
+    ('Java8、Python3', ['Java', 'Python']),
+    ('精通C++和Java开发', ['Java', 'C++']),
+    ('javascripts', []),
+    # 别名折叠到规范名，同一技能只出现一次
+    ('PySpark 与 SparkSQL', ['SQL', 'Python', 'Spark']),
+    ('负责数仓建设和数据仓库建模', ['数据仓库']),
+    ('', []),
+    (None, []),
+])
+def test_extract(matcher, text, skills):
+    assert matcher.extract(text) == skills
+
+
+def test_synonyms_need_canonical_skill():
+    # 规范名不在关键词列表中时别名不生效
+    assert SkillMatcher(['Python'], DEFAULT_SYNONYMS).extract('PySpark SparkSQL') == ['Python']
+    assert SkillMatcher(['Python'], {}).extract('PySpark') == []
+
+
+def test_extract_series(matcher):
+    series = pd.Series(['MySQL', None, 'Java'])
+    assert matcher.extract_series(series).tolist() == [['MySQL'], [], ['Java']]
+
+
+def test_from_config(tmp_path):
+    path = tmp_path / 'skills.json'
+    path.write_text(json.dumps(['Spark', 'Python']), encoding='utf-8')
+    matcher = SkillMatcher.from_config(path)
+    assert matcher.skills == ['Spark', 'Python']
+    # 只给列表时使用默认别名
+    assert matcher.extract('PySpark') == ['Spark', 'Python']
+
+    path.write_text(json.dumps({'skills': ['Spark', 'Go'], 'synonyms': {'Go': ['Golang']}}), encoding='utf-8')
+    matcher = SkillMatcher.from_config(path)
+    assert matcher.extract('Golang 与 PySpark') == ['Go']
+
+
+def test_load_skill_matcher_falls_back_to_defaults(tmp_path):
+    matcher = load_skill_matcher(str(tmp_path / 'missing.json'), jobs.TECH_SKILLS)
+    assert matcher.skills == list(dict.fromkeys(jobs.TECH_SKILLS))
+    assert matcher.signature == SkillMatcher(jobs.TECH_SKILLS, DEFAULT_SYNONYMS).signature
+
+
+def test_signature_follows_config(tmp_path):
+    path = tmp_path / 'skills.json'
+    signatures = []
+    for config in (['Spark', 'Python'], ['Spark', 'Python'], ['Spark', 'Python', 'Go'],
+                   {'skills': ['Spark', 'Python'], 'synonyms': {'Spark': ['PySpark']}}):
+        path.write_text(json.dumps(config), encoding='utf-8')
+        signatures.append(SkillMatcher.from_config(path).signature)
+    assert signatures[0] == signatures[1]
+    assert len(set(signatures[1:])) == 3
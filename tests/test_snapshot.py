@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics import jobs, overview
+from analytics.incremental import build_manifest, content_hashes, refresh
+from analytics.snapshot import load_snapshot, save_snapshot, snapshot_path
+from analytics.tag_index import TagIndex, is_list_dtype, python_lists
+from conftest import cleaned, select
+
+pytest.importorskip('pyarrow')
+
+MODULES = [jobs, overview]
+LIST_COLUMNS = {jobs: ['matched_skills', 'welfare_tags'], overview: ['技能标签', '福利标签']}
+
+
+@pytest.fixture(params=MODULES, ids=['jobs', 'overview'])
+def round_trip(request, raw):
+    module = request.param
+    df, indexes = cleaned(module, raw)
+    save_snapshot(df, 'round-trip')
+    return module, df, indexes, load_snapshot('round-trip')
+
+
+def test_round_trip_keeps_values(round_trip):
+    module, df, _, loaded = round_trip
+    assert all(is_list_dtype(loaded[name].dtype) for name in LIST_COLUMNS[module])
+    pd.testing.assert_frame_equal(python_lists(loaded), df)
+
+
+def test_python_lists_only_touches_list_columns(round_trip):
+    module, _, _, loaded = round_trip
+    rows = python_lists(loaded.iloc[:5])
+    for name in LIST_COLUMNS[module]:
+        assert rows[name].dtype == object
+        assert all(isinstance(tags, list) for tags in rows[name])
+    plain = loaded.drop(columns=LIST_COLUMNS[module])
+    assert python_lists(plain) is plain
+
+
+def test_tag_index_built_from_arrow(round_trip):
+    module, df, _, loaded = round_trip
+    for name in LIST_COLUMNS[module]:
+        expected, result = TagIndex(df[name]), TagIndex(loaded[name])
+        assert result.tags == expected.tags
+        np.testing.assert_array_equal(result.row_counts(), expected.row_counts())
+        pd.testing.assert_series_equal(result.counts(), expected.counts())
+        for tag in expected.tags[:10]:
+            np.testing.assert_array_equal(result.bitmap(tag), expected.bitmap(tag))
+
+
+def assert_same(a, b):
+    if isinstance(b, pd.DataFrame):
+        pd.testing.assert_frame_equal(a, b, check_dtype=False)
+    elif isinstance(b, pd.Series):
+        pd.testing.assert_series_equal(a, b, check_dtype=False)
+    elif isinstance(b, dict):
+        assert a.keys() == b.keys()
+        for key in b:
+            assert_same(a[key], b[key])
+    else:
+        np.testing.assert_equal(a, b)
+
+
+def test_aggregations_and_pages_match(round_trip):
+    module, df, indexes, loaded = round_trip
+    loaded_indexes = module.build_indexes(loaded)
+    for criteria in ({}, {'salary_range': (-2, -1)}):
+        expected = select(module, df, indexes, **criteria)
+        result = select(module, loaded, loaded_indexes, **criteria)
+        for name in module.AGGREGATIONS:
+            assert_same(module.aggregate(name, result), module.aggregate(name, expected))
+        assert python_lists(result.rows).equals(expected.rows)
+    positions = np.arange(len(df))
+    pd.testing.assert_frame_equal(module.table(loaded, positions).page(2, 20),
+                                  module.table(df, positions).page(2, 20))
+
+
+def test_recommendations_from_snapshot(raw):
+    df, indexes = cleaned(jobs, raw)
+    save_snapshot(df, 'recommend')
+    loaded = load_snapshot('recommend')
+    for recommender in (None, jobs.build_indexes(loaded).recommender):
+        result = jobs.recommend(loaded, recommender=recommender)
+        assert all(isinstance(tags, list) for tags in result['matched_skills'])
+        pd.testing.assert_frame_equal(result, jobs.recommend(df, recommender=indexes.recommender))
+
+
+def test_refresh_on_arrow_snapshot(raw):
+    first, second = raw.iloc[:300].reset_index(drop=True), raw.iloc[100:400].reset_index(drop=True)
+    clean = lambda frame: jobs.clean(frame, jobs.default_skill_matcher())  # noqa: E731
+    stored = clean(first.copy())
+    manifest = build_manifest(first.index.to_numpy(), first[jobs.ID_COLUMN].astype(str).to_numpy(),
+                              content_hashes(first), stored.index)
+    save_snapshot(stored, 'stored')
+    df, _, _ = refresh(load_snapshot('stored'), manifest, second, clean,
+                           jobs.CATEGORICAL_COLUMNS, jobs.ID_COLUMN)
+    assert is_list_dtype(df['matched_skills'].dtype)
+    expected = clean(second.copy())
+    assert python_lists(df['matched_skills']).tolist() == expected['matched_skills'].tolist()
+    assert TagIndex(df['matched_skills']).tags == TagIndex(expected['matched_skills']).tags
+
+
+def test_missing_or_corrupt_snapshot(snapshot_dir):
+    assert load_snapshot('missing') is None
+    snapshot_dir.mkdir(parents=True, exist_ok=True)
+    with open(snapshot_path('corrupt'), 'wb') as f:
+        f.write(b'not an arrow file')
+    assert load_snapshot('corrupt') is None
@@ -0,0 +1,99 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from analytics import jobs
+from analytics.text_index import TextIndex, tokenize
+
+
+@pytest.fixture(scope='module')
+def texts(raw):
+    return raw[list(jobs.TEXT_FIELDS)].head(500).reset_index(drop=True)
+
+
+@pytest.fixture(scope='module')
+def index(texts):
+    return TextIndex(texts, jobs.TEXT_FIELDS).build()
+
+
+def row_tokens(texts):
+    """逐行用 tokenize 切词，作为向量化切词的对照"""
+    rows = []
+    for _, row in texts.iterrows():
+        counts = Counter()
+        for column, weight in jobs.TEXT_FIELDS.items():
+            if isinstance(row[column], str):
+                for token in tokenize(row[column]):
+                    counts[token] += weight
+        rows.append(counts)
+    return rows
+
+
+def contains(texts, word):
+    combined = texts.fillna('').apply(lambda row: ' '.join(row).lower(), axis=1)
+    return combined.str.contains(word, regex=False).to_numpy()
+
+
+def test_postings_match_tokenize(texts, index):
+    rows = row_tokens(texts)
+    expected = Counter(token for counts in rows for token in counts)
+    assert set(index._vocab) == set(expected)
+    for token in ('数据', 'python', 'sql', '开发', 'c++'):
+        term = index._vocab[token]
+        assert index._doc_freq[term] == expected[token]
+        docs = index._docs[index._offsets[term]:index._offsets[term + 1]]
+        tfs = index._tfs[index._offsets[term]:index._offsets[term + 1]]
+        assert dict(zip(docs.tolist(), tfs.tolist())) == {i: counts[token] for i, counts in enumerate(rows)
+                                                           if token in counts}
+    np.testing.assert_allclose(index._lengths, [sum(counts.values()) for counts in rows])
+
+
+def test_terms_numbered_lexically(index):
+    assert index._sorted_terms == sorted(index._vocab)
+    assert [index._vocab[t] for t in index._sorted_terms] == list(range(len(index._vocab)))
+
+
+@pytest.mark.parametrize('query, words', [
+    ('据', ['据']),
+    ('数 开发', ['数', '开发']),
+    ('数据 分', ['数据', '分']),
+])
+def test_single_chinese_character_matches_anywhere(texts, index, query, words):
+    expected = np.logical_and.reduce([contains(texts, word) for word in words])
+    for prefix in (True, False):
+        np.testing.assert_array_equal(index.match(query) if prefix else index.scores(query, prefix=False)[0],
+                                      expected)
+
+
+def test_prefix_matches_every_term(texts, index):
+    # 以 p 开头的英文词远多于旧版的 50 个展开上限，全部都应命中
+    prefixed = [t for t in index._vocab if t.startswith('p')]
+    assert len(prefixed) > 50
+    expected = [any(token.startswith('p') for token in counts) for counts in row_tokens(texts)]
+    np.testing.assert_array_equal(index.match('p'), expected)
+
+
+def test_scores_are_positive_only_on_matches(index):
+    mask, scores = index.scores('数据 python')
+    assert mask.any()
+    assert (scores[mask] > 0).all()
+    assert index.match('完全不存在的词zzz').sum() == 0
+
+
+def test_update_matches_rebuild(texts, index):
+    updated = TextIndex(texts.iloc[:400], jobs.TEXT_FIELDS).build()
+    updated.update(texts.index[:30], texts.iloc[400:])
+    rebuilt = TextIndex(texts.iloc[30:], jobs.TEXT_FIELDS).build()
+    assert updated._sorted_terms == rebuilt._sorted_terms
+    for query in ('数据', '据 python', 'sp'):
+        for a, b in zip(updated.scores(query), rebuilt.scores(query)):
+            np.testing.assert_allclose(a, b)
+
+
+def test_chunked_tokenizing_matches(texts, index, monkeypatch):
+    monkeypatch.setattr('analytics.text_index.CHUNK_CHARS', 1000)
+    chunked = TextIndex(texts, jobs.TEXT_FIELDS).build()
+    assert chunked._sorted_terms == index._sorted_terms
+    np.testing.assert_array_equal(chunked._docs, index._docs)
+    np.testing.assert_allclose(chunked._scores, index._scores)
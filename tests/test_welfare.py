@@ -0,0 +1,71 @@
+import pytest
+
+from analytics import jobs
+from analytics.welfare import WelfareMatcher
+
+
+def related(keyword, strings):
+    """逐个比较的双向包含（忽略大小写），作为查表的对照"""
+    keyword = keyword.lower()
+    return {s for s in strings if keyword in s.lower() or s.lower() in keyword}
+
+
+def brute_force(keyword, tags, synonyms):
+    matched = related(keyword, tags)
+    for alias in related(keyword, synonyms):
+        if synonyms[alias].lower() != keyword.lower():
+            matched |= related(synonyms[alias], tags)
+    return matched
+
+
+@pytest.fixture(scope='module')
+def tags(jobs_data):
+    _, indexes = jobs_data
+    return indexes.welfare.tags
+
+
+@pytest.fixture(scope='module')
+def matcher(tags):
+    return WelfareMatcher(tags, jobs.WELFARE_MAPPING)
+
+
+def keywords(tags):
+    words = set(jobs.WELFARE_MAPPING) | {'补', '险', '双', 'Offer', '不存在的福利', '住房补贴多'}
+    for tag in tags[:40]:
+        words |= {tag, tag[:1], tag[-2:], tag + '好'}
+    return sorted(words)
+
+
+def test_matches_brute_force(tags, matcher):
+    for keyword in keywords(tags):
+        result = matcher.match(keyword)
+        assert set(result) == brute_force(keyword, tags, jobs.WELFARE_MAPPING), keyword
+        assert result == sorted(result)
+
+
+def test_without_synonyms_matches_legacy_substring(tags):
+    matcher = WelfareMatcher(tags)
+    for keyword in keywords(tags):
+        assert set(matcher.match(keyword)) == related(keyword, tags), keyword
+
+
+def test_synonym_expansion(tags, matcher):
+    if '餐补' not in tags:
+        pytest.skip('数据中没有“餐补”标签')
+    assert '餐补' in matcher.match('饭补')
+
+
+def test_case_insensitive():
+    matcher = WelfareMatcher(['Offer', '免费班车'])
+    assert matcher.match('offer') == ['Offer']
+    assert matcher.match('OFFER机会') == ['Offer']
+
+
+def test_match_any_keeps_keyword_order():
+    matcher = WelfareMatcher(['房补', '餐补', '下午茶'])
+    assert matcher.match_any(['下午茶', '补']) == ['下午茶', '房补', '餐补']
+    assert matcher.match_any([]) == []
+
+
+def test_empty_tags():
+    assert WelfareMatcher([], jobs.WELFARE_MAPPING).match('餐补') == []
@@ -0,0 +1,32 @@
+"""
+词云图片缓存
+
+词云直接渲染成 PNG 字节，以技能频次向量为缓存键，相同筛选结果不再重复
+生成，也不再创建需要手动关闭的 matplotlib Figure。
+"""
+
+import io
+
+import streamlit as st
+from wordcloud import WordCloud
+
+# 低分辨率预览相对完整尺寸的缩放比例
+PREVIEW_SCALE = 0.5
+
+
+def frequency_key(counts):
+    """把技能计数（Series 或 dict）转为可哈希、顺序稳定的频次向量"""
+    return tuple(sorted((str(word), int(count)) for word, count in dict(counts).items()))
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def render_wordcloud_png(frequencies, width=800, height=600, preview=False):
+    """按频次向量生成词云 PNG；preview=True 时按 PREVIEW_SCALE 缩小尺寸快速出图"""
+    if preview:
+        width, height = int(width * PREVIEW_SCALE), int(height * PREVIEW_SCALE)
+    wordcloud = WordCloud(width=width, height=height, background_color='white',
+                          colormap='viridis', relative_scaling=0.5,
+                          min_font_size=12 if not preview else 6).generate_from_frequencies(dict(frequencies))
+    buffer = io.BytesIO()
+    wordcloud.to_image().save(buffer, format='PNG')
+    return buffer.getvalue()